@@ -0,0 +1,56 @@
+import os
+
+PAGE_SIZE_MIN = int(os.environ.get("GITHUB_PAGE_SIZE_MIN", "10"))
+PAGE_SIZE_MAX = int(os.environ.get("GITHUB_PAGE_SIZE_MAX", "100"))
+PAGE_SIZE_START = int(os.environ.get("GITHUB_PAGE_SIZE_START", "50"))
+# A page should come back within these limits; the page size is steered towards them
+TARGET_PAGE_SECONDS = float(os.environ.get("GITHUB_PAGE_TARGET_SECONDS", "4"))
+TARGET_PAGE_BYTES = int(os.environ.get("GITHUB_PAGE_TARGET_BYTES", str(4 * 1024 * 1024)))
+TARGET_PAGE_COST = int(os.environ.get("GITHUB_PAGE_TARGET_COST", "10"))
+# Grow at most this much per page, a single fast page is not enough evidence for a jump to the maximum
+MAX_GROWTH = 2.0
+
+
+class AdaptivePageSize:
+    """
+    The `first:` argument of a paginated query, adjusted after every page from the observed
+    per-item latency, response size and GraphQL cost so that a page lands near the targets.
+    Resource-limit errors halve it and cap it below the failing size, later growth only
+    bisects towards that cap, so it settles just under the limit instead of oscillating.
+    It always stays within [minimum, maximum].
+    """
+
+    def __init__(self, start=PAGE_SIZE_START, minimum=PAGE_SIZE_MIN, maximum=PAGE_SIZE_MAX,
+                 target_seconds=TARGET_PAGE_SECONDS, target_bytes=TARGET_PAGE_BYTES, target_cost=TARGET_PAGE_COST):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.target_cost = target_cost
+        self.size = self.clamp(start)
+        self.ceiling = self.maximum
+
+    def clamp(self, size):
+        return max(self.minimum, min(self.maximum, int(size)))
+
+    def observe(self, items, seconds, size_bytes, cost=None):
+        if items <= 0:
+            return self.size
+        limits = [self.target_seconds / max(seconds / items, 1e-6), self.target_bytes / max(size_bytes / items, 1)]
+        if cost:
+            limits.append(self.target_cost / (cost / items))
+        target = min(min(limits), self.size * MAX_GROWTH)
+        if target > self.size and self.ceiling < self.maximum:
+            target = min(target, (self.size + self.ceiling + 1) // 2)
+        self.size = self.clamp(min(target, self.ceiling))
+        return self.size
+
+    def shrink(self):
+        """
+        Halve the page size after a resource-limit error. False if it is already at the minimum.
+        """
+        if self.size <= self.minimum:
+            return False
+        self.ceiling = max(self.minimum, self.size - 1)
+        self.size = self.clamp(self.size // 2)
+        return True
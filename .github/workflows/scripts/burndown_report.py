@@ -0,0 +1,117 @@
+import io
+
+from github_api import log
+from report_aggregate import format_number
+from report_export import write_report
+from report_history import load_history, sprint_progress
+
+def render_chart(burndown, width=600, height=200):
+    if not burndown:
+        return ""
+    top = max(max(p["scope"] for p in burndown), 1)
+    step = width / max(len(burndown) - 1, 1)
+
+    def points(key):
+        return " ".join(f"{i * step:.1f},{height - p[key] / top * height:.1f}" for i, p in enumerate(burndown))
+
+    return f"""
+  <svg width='{width}' height='{height}' viewBox='-5 -5 {width + 10} {height + 10}' style='border:1px solid #ccc;'>
+    <polyline fill='none' stroke='#999' stroke-width='2' points='{points("scope")}'/>
+    <polyline fill='none' stroke='#d33' stroke-width='2' points='{points("remaining")}'/>
+  </svg>
+  <div><span style='color:#999;'>&#9632; Scope</span> <span style='color:#d33;'>&#9632; Remaining</span></div>
+"""
+
+def render_burndown_report(progress, now):
+    sprint_name = progress["sprint"]
+    timestamp_display = now.strftime("%Y.%m.%d %H:%M:%S")
+
+    with io.StringIO() as f:
+        f.write(f"""
+<html>
+<head>
+  <meta charset='utf-8'>
+  <title>GitHub Sprint Burndown - {sprint_name} - {timestamp_display}</title>
+  <style>
+    body {{ font-family: sans-serif; }}
+    table {{ border-collapse: collapse; width: auto; }}
+    th, td {{ border: 1px solid #ccc; padding: 6px 16px; text-align: left; }}
+    th {{ background-color: #f2f2f2; }}
+    .numeric {{ text-align: right; }}
+    h2 {{ margin-top: 40px; }}
+  </style>
+</head>
+<body>
+  <h1>Sprint Burndown - {sprint_name} - {timestamp_display}</h1>
+{render_chart(progress["burndown"])}
+  <h2>Burndown and Scope</h2>
+  <table>
+    <thead>
+      <tr>
+        <th>Day</th>
+        <th>Items</th>
+        <th>Scope, md</th>
+        <th>Done, md</th>
+        <th>Remaining, md</th>
+        <th>Added items</th>
+        <th>Added, md</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+        for p in progress["burndown"]:
+            f.write(
+                f"      <tr><td>{p['day']}</td>"
+                f"<td class='numeric'>{p['items']}</td>"
+                f"<td class='numeric'>{format_number(p['scope'])}</td>"
+                f"<td class='numeric'>{format_number(p['done'])}</td>"
+                f"<td class='numeric'>{format_number(p['remaining'])}</td>"
+                f"<td class='numeric'>{p['added_items']}</td>"
+                f"<td class='numeric'>{format_number(p['added_estimate'])}</td></tr>\n"
+            )
+        f.write("""
+    </tbody>
+  </table>
+
+  <h2>Velocity</h2>
+  <table>
+    <thead>
+      <tr>
+        <th>Sprint</th>
+        <th>Last snapshot</th>
+        <th>Scope, md</th>
+        <th>Done, md</th>
+        <th>Done items</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+        for v in progress["velocity"]:
+            f.write(
+                f"      <tr><td>{v['sprint']}</td>"
+                f"<td>{v['last_snapshot']}</td>"
+                f"<td class='numeric'>{format_number(v['scope'])}</td>"
+                f"<td class='numeric'>{format_number(v['done'])}</td>"
+                f"<td class='numeric'>{v['done_items']}</td></tr>\n"
+            )
+        f.write("""
+    </tbody>
+  </table>
+</body>
+</html>
+""")
+        return f.getvalue()
+
+def run_burndown_report(now, history_dir, report="sprint", sprint=None):
+    """
+    Render burndown/velocity from the local history store only - no API calls.
+    """
+    history = load_history(history_dir, report)
+    log(f"Loaded {len(history['url'])} stored rows from {history_dir}/{report}")
+    progress = sprint_progress(history, sprint)
+    if not progress["burndown"]:
+        print(f"No history found for sprint '{progress['sprint']}' in {history_dir}")
+    filename = f"report_burndown_{progress['sprint']}_{now.strftime('%Y%m%d_%H%M%S')}.html"
+    write_report(filename, render_burndown_report(progress, now))
+    print(f"Report written to {filename}")
+    return filename
@@ -0,0 +1,205 @@
+import math
+import time
+
+from adaptive_paging import AdaptivePageSize
+from github_api import (
+    MAX_CONCURRENT_REQUESTS, REQUESTS_PER_SECOND, dry_run_cost, extract_org_and_number, log,
+    rate_limit_status, rest_get, run_query
+)
+from project_items import (
+    ITEMS_QUERY, SCAN_PARTITION, SCHEMA_QUERY, SPRINT_FIELD_NAME, SUBISSUES_QUERY, fetch_project_schema,
+    project_label, status_partitions
+)
+from status_history import ITEMS_PER_HISTORY_QUERY, status_history_query
+import pr_report
+
+# Repositories per aliased open-PR count query
+REPOS_PER_COUNT_QUERY = 50
+EPIC_FILTER = "label:Epic"
+SPRINT_FILTER = f"{SPRINT_FIELD_NAME.lower()}:@current"
+
+
+class CostEstimate:
+    """
+    Expected API usage of a run, collected stage by stage before the run: GraphQL requests
+    priced with dry runs (rateLimit(dryRun: true), nothing is evaluated), REST requests, and
+    the latency of the few real requests the estimate needs for its counts.
+    """
+
+    def __init__(self):
+        self.stages = []
+        self.seconds = []
+        self.costs = {}
+
+    def add(self, label, requests, points=0, rest=0, search=0, note=""):
+        self.stages.append({"label": label, "requests": requests, "points": points, "rest": rest, "search": search,
+                            "note": note})
+
+    def query(self, query, variables=None):
+        stats = {}
+        result = run_query(query, variables, stats=stats)
+        self.seconds.append(stats["seconds"])
+        return result
+
+    def rest(self, url):
+        started = time.monotonic()
+        result = rest_get(url)
+        self.seconds.append(time.monotonic() - started)
+        return result
+
+    def cost(self, query, variables=None):
+        """
+        Points of one request of this query; dry runs of the same query are made once.
+        """
+        key = (query, tuple(sorted((variables or {}).items())))
+        if key not in self.costs:
+            self.costs[key] = dry_run_cost(query, variables)["cost"]
+        return self.costs[key]
+
+    def totals(self):
+        requests = sum(stage["requests"] for stage in self.stages)
+        rest = sum(stage["rest"] for stage in self.stages)
+        search = sum(stage["search"] for stage in self.stages)
+        points = sum(stage["requests"] * stage["points"] for stage in self.stages)
+        latency = sum(self.seconds) / len(self.seconds) if self.seconds else 0.0
+        # Bounded both by the in-flight cap and by the request rate of github_api
+        seconds = max((requests + rest + search) * latency / MAX_CONCURRENT_REQUESTS,
+                      (requests + rest + search) / REQUESTS_PER_SECOND)
+        return {"requests": requests, "rest": rest, "search": search, "points": points, "latency": latency,
+                "seconds": seconds}
+
+
+def count_items(estimate, project_id, filters):
+    """
+    Item counts of several project filters in a single aliased query.
+    """
+    fields = "\n".join(f"c{i}: items(first: 1, query: $q{i}) {{ totalCount }}" for i in range(len(filters)))
+    params = ", ".join(f"$q{i}: String" for i in range(len(filters)))
+    query = f"query($projectId: ID!, {params}) {{ node(id: $projectId) {{ ... on ProjectV2 {{ {fields} }} }} }}"
+    variables = {"projectId": project_id}
+    variables.update({f"q{i}": value for i, value in enumerate(filters)})
+    node = estimate.query(query, variables)["data"]["node"]
+    return [node[f"c{i}"]["totalCount"] for i in range(len(filters))]
+
+
+def count_open_prs(estimate, repos):
+    counts = []
+    for start in range(0, len(repos), REPOS_PER_COUNT_QUERY):
+        chunk = repos[start:start + REPOS_PER_COUNT_QUERY]
+        fields = "\n".join(
+            f'r{i}: repository(owner: "{repo.split("/")[0]}", name: "{repo.split("/")[1]}") '
+            f"{{ pullRequests(states: OPEN) {{ totalCount }} }}"
+            for i, repo in enumerate(chunk)
+        )
+        data = estimate.query(f"query {{ {fields} }}")["data"]
+        counts.extend((data.get(f"r{i}") or {}).get("pullRequests", {}).get("totalCount", 0)
+                      for i in range(len(chunk)))
+    return counts
+
+
+def estimate_project(estimate, project_url, releases, with_epics, with_status_history=False):
+    org, number = extract_org_and_number(project_url)
+    label = project_label(project_url)
+    estimate.add(f"{label}: schema", 1, estimate.cost(SCHEMA_QUERY, {"org": org, "number": number}))
+    schema = fetch_project_schema(org, number)
+
+    page_size = AdaptivePageSize().size
+    partitions = status_partitions(schema) if SCAN_PARTITION == "status" else []
+    filters = [None] + partitions + ([EPIC_FILTER] if with_epics else [])
+    filters += [SPRINT_FILTER] if with_status_history else []
+    counts = count_items(estimate, schema["project_id"], filters)
+    total, partition_counts = counts[0], counts[1:1 + len(partitions)]
+    if len(partitions) >= 2:
+        # Every partition is paged separately, after one count query
+        pages = 1 + sum(max(1, math.ceil(count / page_size)) for count in partition_counts)
+    else:
+        pages = max(1, math.ceil(total / page_size))
+    page_points = estimate.cost(ITEMS_QUERY, {"projectId": schema["project_id"], "after": None,
+                                              "first": page_size, "query": None})
+    estimate.add(f"{label}: item pages", pages, page_points,
+                 note=f"{total} items, first={page_size}, {max(1, len(partitions))} partition(s)")
+
+    if with_status_history:
+        sprint_items = counts[-1]
+        # Upper bound: items whose history is cached and unchanged are not fetched again
+        requests = math.ceil(sprint_items / ITEMS_PER_HISTORY_QUERY)
+        variables = {f"id{i}": schema["project_id"] for i in range(ITEMS_PER_HISTORY_QUERY)}
+        estimate.add(f"{label}: status history", requests,
+                     estimate.cost(status_history_query(ITEMS_PER_HISTORY_QUERY), variables),
+                     note=f"at most; {sprint_items} items in the current sprint")
+
+    if with_epics:
+        epics = counts[1 + len(partitions)]
+        # Only the first level of the trees is known in advance: one expansion per epic. The count
+        # covers every Epic-labelled item, while a release only expands the Features among them whose
+        # milestone contains the release name (a substring match no project filter can express),
+        # and every deeper issue with sub-issues of its own adds one more
+        points = estimate.cost(SUBISSUES_QUERY, {"issueId": schema["project_id"]})
+        estimate.add(f"{label}: epic sub-issues", epics, points,
+                     note=f"upper bound on first-level expansions; {epics} '{EPIC_FILTER}' items, "
+                          f"releases {', '.join(releases)}")
+
+
+def estimate_prs(estimate, org, topic):
+    url = f"https://api.github.com/search/repositories?q=topic:{topic}+org:{org}&per_page=100&page=1"
+    search = estimate.rest(url)
+    repos = [repo["full_name"] for repo in search.get("items", [])]
+    search_pages = max(1, math.ceil(search.get("total_count", len(repos)) / 100))
+    for page in range(2, search_pages + 1):
+        repos.extend(repo["full_name"] for repo in estimate.rest(url.replace("page=1", f"page={page}"))["items"])
+    counts = count_open_prs(estimate, repos) if repos else []
+    # get_pull_requests pages the open PRs of every repository, a repository without PRs still costs one page
+    list_pages = sum(max(1, math.ceil(count / pr_report.PULLS_PER_PAGE)) for count in counts)
+    estimate.add(f"{org}/{topic}: repository search", 0, search=search_pages,
+                 note=f"{len(repos)} repositories")
+    estimate.add(f"{org}/{topic}: PR lists", 0, rest=list_pages,
+                 note=f"up to {pr_report.PULLS_PER_PAGE} PRs per page")
+    # One details request per repository chunk; priced as a full chunk, so an upper bound per request
+    chunk = pr_report.PRS_PER_DETAILS_QUERY
+    variables = {"owner": org, "repo": "estimate"}
+    variables.update({f"n{i}": i + 1 for i in range(chunk)})
+    requests = sum(math.ceil(count / chunk) for count in counts)
+    estimate.add(f"{org}/{topic}: PR details", requests, estimate.cost(pr_report.pr_details_query(chunk), variables),
+                 note=f"{sum(counts)} open PRs, up to {chunk} per request")
+
+
+def run_estimate(command, project_urls, org_topics, releases):
+    """
+    Print what a run of command would cost without running it.
+    """
+    estimate = CostEstimate()
+    if command in ("sprint", "sprint-v1", "release", "all"):
+        for project_url in project_urls:
+            estimate_project(estimate, project_url, releases, with_epics=command in ("release", "all"),
+                             with_status_history=command in ("sprint", "all"))
+    if command in ("prs", "all"):
+        for org, topic in org_topics:
+            estimate_prs(estimate, org, topic)
+    totals = estimate.totals()
+    budget = rate_limit_status()
+    log(f"Rate limits: {budget}")
+
+    print(f"Estimated API usage of '{command}':")
+    for stage in estimate.stages:
+        usage = []
+        if stage["requests"]:
+            usage.append(f"{stage['requests']} GraphQL request(s) x {stage['points']} point(s)")
+        if stage["rest"]:
+            usage.append(f"{stage['rest']} REST request(s)")
+        if stage["search"]:
+            usage.append(f"{stage['search']} REST search request(s)")
+        print(f"  {stage['label']}: {', '.join(usage)}" + (f" ({stage['note']})" if stage["note"] else ""))
+    print(f"Total: {totals['requests']} GraphQL request(s), {totals['points']} point(s), "
+          f"{totals['rest']} REST request(s), {totals['search']} REST search request(s)")
+    print(f"Expected time: ~{totals['seconds']:.0f}s at {MAX_CONCURRENT_REQUESTS} concurrent request(s), "
+          f"{REQUESTS_PER_SECOND:g} request(s)/s, {totals['latency']:.2f}s per request")
+    for name, needed in (("graphql", totals["points"]), ("core", totals["rest"]), ("search", totals["search"])):
+        remaining = budget.get(name, {}).get("remaining")
+        if remaining is None or not needed:
+            continue
+        if needed > remaining:
+            print(f"⚠️ Needs {needed} of {remaining} remaining {name} rate limit points, "
+                  f"the limit resets at {time.strftime('%H:%M:%S', time.localtime(budget[name]['reset']))}")
+        else:
+            print(f"Fits the remaining {name} rate limit: {needed} of {remaining}")
+    return totals
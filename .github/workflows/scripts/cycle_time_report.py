@@ -0,0 +1,146 @@
+import datetime
+import io
+import os
+
+import numpy as np
+
+from pr_history import PrHistory, sync_pr_history
+from report_aggregate import format_number, group_by
+from report_export import export_dataset, write_report
+from report_manifest import dataset_hash, record_output, unchanged_output
+
+# Only PRs closed within this many days are part of the report
+WINDOW_DAYS = 90
+CYCLE_MEASURES = ("hours_to_first_review", "hours_to_merge", "review_rounds")
+
+
+def _times(rows, field):
+    return np.array([(row.get(field) or "").rstrip("Z") or "NaT" for row in rows], dtype="datetime64[s]")
+
+
+def cycle_time_columns(rows):
+    """
+    Columns for group_by: repo and author, plus the cycle measures computed for all PRs at once.
+    Times that do not apply (never reviewed, closed without merge) are NaN.
+    """
+    created = _times(rows, "created_at")
+
+    def hours_until(field):
+        end = _times(rows, field)
+        seconds = (end - created).astype("int64").astype(float)
+        return np.where(np.isnat(end) | np.isnat(created), np.nan, seconds / 3600)
+
+    return {
+        "repo": np.array([row["repo"] for row in rows], dtype=object),
+        "author": np.array([row["author"] for row in rows], dtype=object),
+        "hours_to_first_review": hours_until("first_review_at"),
+        "hours_to_merge": hours_until("merged_at"),
+        "review_rounds": np.array([row["review_rounds"] if row["reviews"] else np.nan for row in rows], dtype=float),
+    }
+
+
+def _mean(row, measure):
+    count = row.get(f"{measure}_count")
+    return row[f"{measure}_sum"] / count if count else None
+
+
+def render_cycle_table(title, summary, key):
+    with io.StringIO() as f:
+        f.write(f"""
+  <h2>{title}</h2>
+  <table class='summary-table'>
+    <thead>
+      <tr>
+        <th>{key.capitalize()}</th>
+        <th>PRs</th>
+        <th>Merged</th>
+        <th>Avg hours to first review</th>
+        <th>Max hours to first review</th>
+        <th>Avg hours to merge</th>
+        <th>Max hours to merge</th>
+        <th>Avg review rounds</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+        for row in sorted(summary, key=lambda r: r[key]):
+            f.write(
+                f"<tr>"
+                f"<td>{row[key]}</td>"
+                f"<td class='numeric'>{row['count']}</td>"
+                f"<td class='numeric'>{row['hours_to_merge_count']}</td>"
+                f"<td class='numeric'>{format_number(_mean(row, 'hours_to_first_review'))}</td>"
+                f"<td class='numeric'>{format_number(row['hours_to_first_review_max'])}</td>"
+                f"<td class='numeric'>{format_number(_mean(row, 'hours_to_merge'))}</td>"
+                f"<td class='numeric'>{format_number(row['hours_to_merge_max'])}</td>"
+                f"<td class='numeric'>{format_number(_mean(row, 'review_rounds'))}</td>"
+                f"</tr>\n"
+            )
+        f.write("""
+    </tbody>
+  </table>
+""")
+        return f.getvalue()
+
+
+def render_cycle_time_report(rows, window_days, now):
+    timestamp_display = now.strftime("%Y.%m.%d %H:%M:%S")
+    columns = cycle_time_columns(rows)
+    with io.StringIO() as f:
+        f.write(f"""
+<html>
+<head>
+  <meta charset='utf-8'>
+  <title>PR Cycle Time - {timestamp_display}</title>
+  <style>
+    body {{ font-family: sans-serif; }}
+    table {{ border-collapse: collapse; width: 100%; }}
+    th, td {{ border: 1px solid #ccc; padding: 4px; text-align: left; }}
+    th {{ background-color: #f2f2f2; cursor: pointer; }}
+    tr:hover {{ background-color: #f1f1f1; }}
+    .numeric {{ text-align: right; }}
+    h2 {{ margin-top: 40px; }}
+    .summary-table {{ width: auto; }}
+    .summary-table td, .summary-table th {{ padding: 6px 16px; }}
+  </style>
+  <script src='https://cdnjs.cloudflare.com/ajax/libs/tablesort/5.2.1/tablesort.min.js'></script>
+</head>
+<body>
+  <h1>PR Cycle Time - {timestamp_display}</h1>
+  <div>{len(rows)} PRs merged or closed in the last {window_days} days</div>
+""")
+        if rows:
+            for title, key in (("By Repository", "repo"), ("By Author", "author")):
+                f.write(render_cycle_table(title, group_by(columns, [key], measures=CYCLE_MEASURES), key))
+        f.write("""
+  <script>
+    document.querySelectorAll('table').forEach(function(table) { new Tablesort(table); });
+  </script>
+</body>
+</html>
+""")
+        return f.getvalue()
+
+
+def run_cycle_time_report(run, options):
+    history = PrHistory(options.pr_history)
+    try:
+        topics = run.for_each(run.org_topics, lambda org_topic: run.repositories(*org_topic))
+        repos = sorted({repo for repos in topics for repo in repos})
+        sync_pr_history(history, repos, options.backfill_days)
+        since = datetime.datetime.utcnow() - datetime.timedelta(days=options.window_days)
+        rows = history.rows(repos, closed_since=since.strftime("%Y-%m-%dT%H:%M:%S"))
+    finally:
+        history.close()
+
+    digest = dataset_hash(rows)
+    previous = unchanged_output(options.manifest, "cycle-time", digest)
+    if previous:
+        print(f"PR cycle time data unchanged since {previous}, report not regenerated")
+        return None
+    filename = f"report_pr_cycle_time_{run.now.strftime('%Y%m%d_%H%M%S')}.html"
+    write_report(filename, render_cycle_time_report(rows, options.window_days, run.now))
+    print(f"Report written to {filename}")
+    export_dataset(rows, os.path.splitext(filename)[0], options.export)
+    record_output(options.manifest, "cycle-time", digest, filename)
+    return filename
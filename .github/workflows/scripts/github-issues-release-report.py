@@ -1,570 +1,6 @@
-import requests
-import re
-import os
-import argparse
-import datetime
+import sys
 
-GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
-PROJECT_URL = "https://github.com/orgs/Netcracker/projects/9"
-RELEASE_NAME = os.environ.get("RELEASE_NAME")
-ESTIMATE_FIELD_NAME = "Estimate, md"
-TIME_SPENT_FIELD_NAME = "Time spent, md"
-
-HEADERS = {
-    "Authorization": f"Bearer {GITHUB_TOKEN}",
-    "Accept": "application/vnd.github+json",
-    "GraphQL-Features": "sub_issues"
-}
-
-API_URL = "https://api.github.com/graphql"
-
-assignee_map = {
-    "alagishev": "Aleksandr Agishev",
-    "b41ex": "Alexey Bochencev",
-    "iurii-golovinskii": "Iurii Golovinskii",
-    "makeev-pavel": "Pavel Makeev",
-    "JayLim2": "Sergei Komarov",
-    "viacheslav-lunev": "Viacheslav Lunev",
-    "karpov-aleksandr": "Aleksandr V. Karpov",
-    "CountRedClaw": "Ilia Borsuk",
-    "AndreiChek": "Andrei Chekalin",
-    "Roman-cod": "Roman Babenko",
-    "raa1618033": "Alexey Rodionov",
-    "tiutiunnyk-ivan": "Ivan Tiutiunnyk",
-    "Maryna-Ko": "Maryna Kovalenko",
-    "ArtemNalesnikovskyi": "Artem Nalesnikovskyi",
-    "iugaidiana": "Diana Iugai",
-    "vOrigins": "Vladyslav Novikov",
-    "tanabebr": "Felipe Tanabe",
-    "zloiadil": "Adil Bektursunov",
-    "nilesh25890": "Nilesh Ashokrao Shinde",
-    "oommenmathewpanicker": "Oommen Mathew Panicker",
-    "nagarajrarchak": "Nagaraj Raghavendra Archak",
-    "sujithn-nc": "Sujith N",
-    "TODO": "TODO",
-    "divy-netcracker": "Divy Tripathy"
-}
-
-parser = argparse.ArgumentParser()
-parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
-args = parser.parse_args()
-VERBOSE = args.verbose
-
-def log(msg):
-    if VERBOSE:
-        print(f"[Debug] {msg}")
-
-def run_query(query, variables=None):
-    response = requests.post(API_URL, headers=HEADERS, json={"query": query, "variables": variables})
-    if response.status_code != 200:
-        raise Exception(f"Query failed: {response.text}")
-    payload = response.json()
-    if payload.get("errors"):
-        msgs = "; ".join(err.get("message", str(err)) for err in payload["errors"])
-        raise Exception(f"GraphQL errors: {msgs}")
-    if "data" not in payload:
-        raise Exception(f"Unexpected GraphQL response (no data): {payload}")
-    return payload
-
-def extract_org_and_number(url):
-    match = re.match(r"https://github.com/orgs/([^/]+)/projects/(\d+)", url)
-    if not match:
-        raise ValueError("Invalid project URL")
-    return match.group(1), int(match.group(2))
-
-def get_project_fields(org, number):
-    query = """
-    query($org: String!, $number: Int!) {
-      organization(login: $org) {
-        projectV2(number: $number) {
-          id
-          fields(first: 50) {
-            nodes {
-              __typename
-              ... on ProjectV2IterationField {
-                id
-                name
-                configuration {
-                  ... on ProjectV2IterationFieldConfiguration {
-                    iterations {
-                      id
-                      title
-                      startDate
-                      duration
-                    }
-                    completedIterations {
-                      id
-                      title
-                      startDate
-                      duration
-                    }
-                  }
-                }
-              }
-              ... on ProjectV2SingleSelectField {
-                id
-                name
-                options {
-                  id
-                  name
-                }
-              }
-              ... on ProjectV2Field {
-                id
-                name
-                dataType
-              }
-            }
-          }
-        }
-      }
-    }
-    """
-    result = run_query(query, {"org": org, "number": number})
-    project = result["data"]["organization"]["projectV2"]
-    project_id = project["id"]
-    fields = project["fields"]["nodes"]
-
-    sprint_field_id = None
-    matched_sprints = {}
-    field_options = {"Status": {}, "Priority": {}}
-    numeric_fields = {}
-
-    for f in fields:
-        if f["__typename"] == "ProjectV2IterationField" and f["name"] == "Sprint":
-            sprint_field_id = f["id"]
-            cfg = f.get("configuration") or {}
-            all_iters = cfg.get("iterations", []) + cfg.get("completedIterations", [])
-            for it in all_iters:
-                if RELEASE_NAME in it["title"]:
-                    matched_sprints[it["id"]] = it["title"]
-        if f["__typename"] == "ProjectV2SingleSelectField" and f["name"] in field_options:
-            for opt in f.get("options", []):
-                field_options[f["name"]][opt["id"]] = opt["name"]
-        if f["__typename"] == "ProjectV2Field" and f.get("dataType") == "NUMBER":
-            if f["name"] == ESTIMATE_FIELD_NAME:
-                numeric_fields["estimate"] = f["id"]
-            elif f["name"] == TIME_SPENT_FIELD_NAME:
-                numeric_fields["time_spent"] = f["id"]
-
-    if not sprint_field_id or not matched_sprints:
-        raise Exception("Matching sprints not found or sprint field missing")
-
-    return project_id, sprint_field_id, matched_sprints, field_options, numeric_fields
-
-def get_issues_for_sprints(project_id, sprint_field_id, sprint_id_to_title, field_options, numeric_fields):
-    query = """
-    query($projectId: ID!, $after: String) {
-      node(id: $projectId) {
-        ... on ProjectV2 {
-          items(first: 50, after: $after) {
-            pageInfo {
-              hasNextPage
-              endCursor
-            }
-            nodes {
-              content {
-                ... on Issue {
-                  title
-                  url
-                  parent {
-                    title
-                    url
-                  }
-                  issueType {
-                    name
-                  }
-                  assignees(first: 10) {
-                    nodes { login }
-                  }
-                }
-              }
-              fieldValues(first: 30) {
-                nodes {
-                  __typename
-                  ... on ProjectV2ItemFieldIterationValue {
-                    iterationId
-                  }
-                  ... on ProjectV2ItemFieldSingleSelectValue {
-                    optionId
-                    field {
-                      ... on ProjectV2SingleSelectField {
-                        name
-                      }
-                    }
-                  }
-                  ... on ProjectV2ItemFieldNumberValue {
-                    number
-                    field {
-                      ... on ProjectV2Field {
-                        id
-                        name
-                      }
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-    }
-    """
-    issues = []
-    after = None
-
-    while True:
-        result = run_query(query, {"projectId": project_id, "after": after})
-        items = result["data"]["node"]["items"]["nodes"]
-
-        for item in items:
-            content = item.get("content")
-            if not content or not content.get("title"):
-                continue
-
-            raw_assignees = [u["login"] for u in content.get("assignees", {}).get("nodes", [])] or ["Unassigned"]
-            assignee = raw_assignees[0]
-            if assignee != "Unassigned":
-                realname = assignee_map.get(assignee)
-                assignee = f"{realname} ({assignee})" if realname else assignee
-
-            parent_node = content.get("parent") or {}
-            parent_name = parent_node.get("title", "")
-            parent_url = parent_node.get("url", "")
-
-            issue_name = content["title"]
-            issue_url = content["url"]
-
-            issue_type = (content.get("issueType") or {}).get("name", "Empty")
-
-            status = "Empty"
-            priority = "Empty"
-            matched_sprint_id = None
-            estimate = ""
-            time_spent = ""
-
-            for fv in item["fieldValues"]["nodes"]:
-                if fv["__typename"] == "ProjectV2ItemFieldIterationValue":
-                    if fv.get("iterationId") in sprint_id_to_title:
-                        matched_sprint_id = fv["iterationId"]
-                if fv["__typename"] == "ProjectV2ItemFieldSingleSelectValue":
-                    field_name = fv.get("field", {}).get("name")
-                    option_id = fv.get("optionId")
-                    if field_name in field_options:
-                        val = field_options[field_name].get(option_id, option_id)
-                        if field_name == "Status":
-                            status = val
-                        elif field_name == "Priority":
-                            priority = val
-                if fv["__typename"] == "ProjectV2ItemFieldNumberValue":
-                    field_id = fv.get("field", {}).get("id")
-                    number_value = fv.get("number")
-                    if field_id == numeric_fields.get("estimate"):
-                        estimate = number_value
-                    elif field_id == numeric_fields.get("time_spent"):
-                        time_spent = number_value
-
-            if matched_sprint_id:
-                issues.append({
-                    "assignee":    assignee,
-                    "issue_name":  issue_name,
-                    "issue_url":   issue_url,
-                    "type":        issue_type,
-                    "priority":    priority,
-                    "status":      status,
-                    "sprint":      sprint_id_to_title[matched_sprint_id],
-                    "parent_name": parent_name,
-                    "parent_url":  parent_url,
-                    "estimate":    estimate,
-                    "time_spent":  time_spent
-                })
-
-        page_info = result["data"]["node"]["items"]["pageInfo"]
-        if not page_info["hasNextPage"]:
-            break
-        after = page_info["endCursor"]
-
-    return issues
-
-def get_epic_subissues(project_id, field_options, numeric_fields):
-    query = """
-    query($projectId: ID!, $after: String) {
-      node(id: $projectId) {
-        ... on ProjectV2 {
-          items(first: 50, after: $after) {
-            pageInfo {
-              hasNextPage
-              endCursor
-            }
-            nodes {
-              content {
-                ... on Issue {
-                  id
-                  title
-                  url
-                  issueType {
-                    name
-                  }
-                  labels(first: 50) {
-                    nodes { name }
-                  }
-                  milestone {
-                    title
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-    }
-    """
-    epics = []
-    after = None
-
-    while True:
-        result = run_query(query, {"projectId": project_id, "after": after})
-        items = result["data"]["node"]["items"]["nodes"]
-
-        for item in items:
-            content = item.get("content")
-            if not content or not content.get("title"):
-                continue
-
-            issue_type = (content.get("issueType") or {}).get("name", "")
-            labels = [l.get("name") for l in content.get("labels", {}).get("nodes", [])]
-            milestone_title = (content.get("milestone") or {}).get("title", "")
-            milestone_matches = RELEASE_NAME in milestone_title if milestone_title else False
-
-            if issue_type == "Feature" and "Epic" in labels and milestone_matches:
-                epics.append({
-                    "id": content["id"],
-                    "title": content["title"],
-                    "url": content["url"]
-                })
-
-        page_info = result["data"]["node"]["items"]["pageInfo"]
-        if not page_info["hasNextPage"]:
-            break
-        after = page_info["endCursor"]
-
-    log(f"Found {len(epics)} epics matching criteria")
-    subissues = []
-    for epic in epics:
-        subissues.extend(get_subissues_for_epic(
-            epic["id"],
-            epic["title"],
-            epic["url"],
-            project_id,
-            field_options,
-            numeric_fields
-        ))
-
-    return subissues
-
-def get_subissues_for_epic(epic_issue_id, parent_name, parent_url, project_id, field_options, numeric_fields):
-    query = """
-    query($issueId: ID!, $after: String) {
-      node(id: $issueId) {
-        ... on Issue {
-          subIssues(first: 50, after: $after) {
-            pageInfo {
-              hasNextPage
-              endCursor
-            }
-            nodes {
-              title
-              url
-              issueType {
-                name
-              }
-              assignees(first: 10) {
-                nodes { login }
-              }
-              projectItems(first: 20) {
-                nodes {
-                  project {
-                    id
-                  }
-                  fieldValues(first: 30) {
-                    nodes {
-                      __typename
-                      ... on ProjectV2ItemFieldSingleSelectValue {
-                        optionId
-                        field {
-                          ... on ProjectV2SingleSelectField {
-                            name
-                          }
-                        }
-                      }
-                      ... on ProjectV2ItemFieldNumberValue {
-                        number
-                        field {
-                          ... on ProjectV2Field {
-                            id
-                            name
-                          }
-                        }
-                      }
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-    }
-    """
-    subissues = []
-    after = None
-
-    while True:
-        result = run_query(query, {"issueId": epic_issue_id, "after": after})
-        node = result["data"]["node"] or {}
-        sub_issue_conn = (node.get("subIssues") or {})
-        items = sub_issue_conn.get("nodes", [])
-
-        for issue in items:
-            if not issue.get("title"):
-                continue
-
-            raw_assignees = [u["login"] for u in issue.get("assignees", {}).get("nodes", [])] or ["Unassigned"]
-            assignee = raw_assignees[0]
-            if assignee != "Unassigned":
-                realname = assignee_map.get(assignee)
-                assignee = f"{realname} ({assignee})" if realname else assignee
-
-            issue_type = (issue.get("issueType") or {}).get("name", "Empty")
-            status = "Empty"
-            priority = "Empty"
-            estimate = ""
-            time_spent = ""
-
-            project_items = issue.get("projectItems", {}).get("nodes", [])
-            project_item = next((pi for pi in project_items if (pi.get("project") or {}).get("id") == project_id), None)
-            if project_item:
-                for fv in (project_item.get("fieldValues") or {}).get("nodes", []):
-                    if fv["__typename"] == "ProjectV2ItemFieldSingleSelectValue":
-                        field_name = fv.get("field", {}).get("name")
-                        option_id = fv.get("optionId")
-                        if field_name in field_options:
-                            val = field_options[field_name].get(option_id, option_id)
-                            if field_name == "Status":
-                                status = val
-                            elif field_name == "Priority":
-                                priority = val
-                    if fv["__typename"] == "ProjectV2ItemFieldNumberValue":
-                        field_id = fv.get("field", {}).get("id")
-                        number_value = fv.get("number")
-                        if field_id == numeric_fields.get("estimate"):
-                            estimate = number_value
-                        elif field_id == numeric_fields.get("time_spent"):
-                            time_spent = number_value
-
-            subissues.append({
-                "assignee":    assignee,
-                "issue_name":  issue["title"],
-                "issue_url":   issue["url"],
-                "type":        issue_type,
-                "priority":    priority,
-                "status":      status,
-                "sprint":      "",
-                "parent_name": parent_name,
-                "parent_url":  parent_url,
-                "estimate":    estimate,
-                "time_spent":  time_spent
-            })
-
-        page_info = sub_issue_conn.get("pageInfo")
-        if not page_info or not page_info.get("hasNextPage"):
-            break
-        after = page_info.get("endCursor")
-
-    return subissues
-
-def merge_issues_by_url(base_issues, extra_issues):
-    existing_urls = {i.get("issue_url") for i in base_issues}
-    for issue in extra_issues:
-        if issue.get("issue_url") not in existing_urls:
-            base_issues.append(issue)
-    return base_issues
-
-def generate_html_report(data, release_name):
-    timestamp_display = datetime.datetime.now().strftime("%Y.%m.%d %H:%M:%S")
-    timestamp_filename = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"report_release_{RELEASE_NAME}_{timestamp_filename}.html"
-
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(f"""
-<html>
-<head>
-  <meta charset='utf-8'>
-  <title>GitHub Release Report - {release_name} - {timestamp_display}</title>
-  <style>
-    body {{ font-family: sans-serif; }}
-    table {{ border-collapse: collapse; width: 100%; }}
-    th, td {{ border: 1px solid #ccc; padding: 4px; text-align: left; }}
-    th {{ background-color: #f2f2f2; cursor: pointer; }}
-    tr:hover {{ background-color: #f1f1f1; }}
-    .numeric {{ text-align: right; }}
-  </style>
-  <script src='https://cdnjs.cloudflare.com/ajax/libs/tablesort/5.2.1/tablesort.min.js'></script>
-</head>
-<body>
-  <h1>Release Report - {release_name} - {timestamp_display}</h1>
-  <table id='reportTable'>
-    <thead>
-      <tr>
-        <th>Assignee</th>
-        <th>Name</th>
-        <th>Issue URL</th>
-        <th>Type</th>
-        <th>Priority</th>
-        <th>Status</th>
-        <th>Estimate, md</th>
-        <th>Time Spent, md</th>
-        <th>Sprint Name</th>
-        <th>Parent Name</th>
-        <th>Parent URL</th>
-      </tr>
-    </thead>
-    <tbody>
-""")
-        for issue in data:
-            issue_link = f"<a href='{issue['issue_url']}' target='_blank'>{issue['issue_url']}</a>"
-            parent_link = f"<a href='{issue['parent_url']}' target='_blank'>{issue['parent_url']}</a>" if issue['parent_url'] else ""
-            f.write(
-                f"<tr>"
-                f"<td>{issue['assignee']}</td>"
-                f"<td>{issue['issue_name']}</td>"
-                f"<td>{issue_link}</td>"
-                f"<td>{issue['type']}</td>"
-                f"<td>{issue['priority']}</td>"
-                f"<td>{issue['status']}</td>"
-                f"<td class='numeric'>{issue['estimate']}</td>"
-                f"<td class='numeric'>{issue['time_spent']}</td>"
-                f"<td>{issue['sprint']}</td>"
-                f"<td>{issue['parent_name']}</td>"
-                f"<td>{parent_link}</td>"
-                f"</tr>\n"
-            )
-        f.write("""
-    </tbody>
-  </table>
-  <script>new Tablesort(document.getElementById('reportTable'));</script>
-</body>
-</html>
-""")
-    print(f"Report written to {filename}")
-
-def main():
-    org, number = extract_org_and_number(PROJECT_URL)
-    project_id, sprint_field_id, matched_sprints, field_options, numeric_fields = get_project_fields(org, number)
-    data = get_issues_for_sprints(project_id, sprint_field_id, matched_sprints, field_options, numeric_fields)
-    epic_subissues = get_epic_subissues(project_id, field_options, numeric_fields)
-    data = merge_issues_by_url(data, epic_subissues)
-    generate_html_report(data, RELEASE_NAME)
+from reports_cli import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(["release"] + sys.argv[1:])
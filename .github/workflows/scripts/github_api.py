@@ -0,0 +1,311 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows: the budget stays per process
+    fcntl = None
+
+from token_pool import TokenPool, load_tokens, mask
+
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+API_URL = "https://api.github.com/graphql"
+REST_URL = "https://api.github.com"
+
+# Authorization is added per request with a token of the pool
+HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "GraphQL-Features": "sub_issues"
+}
+
+# Shared by every worker thread of the process
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("GITHUB_MAX_CONCURRENT_REQUESTS", "4"))
+REQUESTS_PER_SECOND = float(os.environ.get("GITHUB_REQUESTS_PER_SECOND", "10"))
+# Token bucket state shared by all report processes of the host; empty keeps the budget per process
+RATE_STATE_FILE = os.environ.get("GITHUB_RATE_STATE_FILE",
+                                 os.path.join(tempfile.gettempdir(), "github-rate-budget.json"))
+# No request may hang longer than this; optional stages may cap it further (see run_budget.py)
+REQUEST_TIMEOUT = float(os.environ.get("GITHUB_REQUEST_TIMEOUT", "30"))
+
+# GraphQL error types and HTTP statuses GitHub returns when a query asks for too much at once
+RESOURCE_LIMIT_ERRORS = ("MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED")
+RESOURCE_LIMIT_STATUSES = (502, 504)
+# Statuses of a request refused because its token's primary rate limit is used up
+RATE_LIMIT_STATUSES = (403, 429)
+
+VERBOSE = False
+
+class ResourceLimitError(Exception):
+    """
+    The query was too large or too slow for GitHub: retrying with a smaller page may succeed.
+    """
+
+class RateBudget:
+    """
+    Token bucket plus a cap on in-flight requests, shared by all workers of one process,
+    so fetching several projects concurrently stays within GitHub's secondary rate limits.
+    """
+
+    def __init__(self, rate, burst, concurrency):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(concurrency)
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    @contextmanager
+    def request(self):
+        self.acquire()
+        with self.slots:
+            yield
+
+class SharedRateBudget(RateBudget):
+    """
+    RateBudget whose token bucket lives in a state file, so every report process on the host
+    (scheduled workflows, matrix jobs on a self-hosted runner) draws from the same budget.
+    The file is read and updated under an exclusive flock; the in-flight cap stays per process.
+    """
+
+    def __init__(self, path, rate, burst, concurrency):
+        super().__init__(rate, burst, concurrency)
+        self.path = path
+
+    def _take(self):
+        """
+        Take one token from the shared bucket. Returns 0, or the seconds to wait before trying again.
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        with open(fd, "r+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                elapsed = max(0.0, now - state.get("updated", now))
+                tokens = min(self.capacity, state.get("tokens", self.capacity) + elapsed * self.rate)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / self.rate
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": tokens, "updated": now}))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+if RATE_STATE_FILE and fcntl:
+    RATE_BUDGET = SharedRateBudget(RATE_STATE_FILE, REQUESTS_PER_SECOND, max(REQUESTS_PER_SECOND, 1),
+                                   MAX_CONCURRENT_REQUESTS)
+else:
+    RATE_BUDGET = RateBudget(REQUESTS_PER_SECOND, max(REQUESTS_PER_SECOND, 1), MAX_CONCURRENT_REQUESTS)
+TOKEN_POOL = TokenPool(load_tokens())
+
+class QueryMemo:
+    """
+    Single-flight memo of GraphQL responses for one run: concurrent identical requests
+    (same query and variables) share one call, later ones reuse its response.
+    Only successful responses are kept, a failed request is made again next time.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.responses = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key, send):
+        with self.lock:
+            future = self.responses.get(key)
+            owner = future is None
+            if owner:
+                future = self.responses[key] = Future()
+                self.misses += 1
+            elif future.done():
+                self.hits += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+        try:
+            response = send()
+        except Exception as e:
+            with self.lock:
+                del self.responses[key]
+            future.set_exception(e)
+            raise
+        if response.status_code != 200 or b'"errors"' in response.content:
+            with self.lock:
+                del self.responses[key]
+        future.set_result(response)
+        return response
+
+    def metrics(self):
+        with self.lock:
+            return {"hits": self.hits, "coalesced": self.coalesced, "misses": self.misses}
+
+_memo = None
+
+@contextmanager
+def memoized_queries():
+    """
+    Memoize GraphQL requests inside the block, shared by all threads. Long-lived processes
+    (webhook receiver, report server) do not use it, their data must stay fresh.
+    """
+    global _memo
+    _memo = QueryMemo()
+    try:
+        yield _memo
+    finally:
+        _memo = None
+
+_timeouts = threading.local()
+
+def request_timeout():
+    cap = getattr(_timeouts, "cap", None)
+    return REQUEST_TIMEOUT if cap is None else max(0.1, min(REQUEST_TIMEOUT, cap))
+
+@contextmanager
+def timeout_cap(seconds):
+    """
+    Lower the timeout of the requests made by this thread inside the block.
+    """
+    previous = getattr(_timeouts, "cap", None)
+    _timeouts.cap = seconds if previous is None else min(previous, seconds)
+    try:
+        yield
+    finally:
+        _timeouts.cap = previous
+
+def set_verbose(value):
+    global VERBOSE
+    VERBOSE = value
+
+def log(msg):
+    if VERBOSE:
+        print(f"[Debug] {msg}")
+
+def send_request(resource, send):
+    """
+    Make one request with the pool token that has the most headroom on resource.
+    If that token turns out to be rate limited, the request is retried with the next one.
+    """
+    for _ in range(len(TOKEN_POOL.tokens)):
+        token = TOKEN_POOL.acquire(resource)
+        with RATE_BUDGET.request():
+            response = send(dict(HEADERS, Authorization=f"Bearer {token}"))
+        exhausted = TOKEN_POOL.update(token, resource, response.headers)
+        if not (exhausted and response.status_code in RATE_LIMIT_STATUSES):
+            return response
+        log(f"Token {mask(token)} is out of {resource} budget, failing over")
+    return response
+
+def post_graphql(query, variables=None):
+    # Single place where GraphQL requests leave the process
+    def send():
+        return send_request("graphql", lambda headers: requests.post(
+            API_URL, headers=headers, json={"query": query, "variables": variables}, timeout=request_timeout()))
+    memo = _memo
+    if memo is None:
+        return send()
+    return memo.get((query, json.dumps(variables, sort_keys=True, default=str)), send)
+
+def run_query(query, variables=None, stats=None):
+    """
+    Run a GraphQL query and return the payload. If a stats dict is given it receives
+    the response size in bytes and the round trip time in seconds.
+    """
+    started = time.monotonic()
+    response = post_graphql(query, variables)
+    if stats is not None:
+        stats["seconds"] = time.monotonic() - started
+        stats["bytes"] = len(response.content)
+    if response.status_code in RESOURCE_LIMIT_STATUSES:
+        raise ResourceLimitError(f"Query failed with HTTP {response.status_code}")
+    if response.status_code != 200:
+        raise Exception(f"Query failed: {response.text}")
+    payload = response.json()
+    if payload.get("errors"):
+        msgs = "; ".join(err.get("message", str(err)) for err in payload["errors"])
+        if any(err.get("type") in RESOURCE_LIMIT_ERRORS or "timeout" in err.get("message", "").lower()
+               for err in payload["errors"]):
+            raise ResourceLimitError(f"GraphQL errors: {msgs}")
+        raise Exception(f"GraphQL errors: {msgs}")
+    if "data" not in payload:
+        raise Exception(f"Unexpected GraphQL response (no data): {payload}")
+    return payload
+
+def dry_run_cost(query, variables=None):
+    """
+    Rate limit points GitHub would charge for query, computed without running it
+    (rateLimit(dryRun: true)). Returns {"cost", "remaining", "limit", "resetAt"}.
+    """
+    query = re.sub(r"rateLimit\s*\{[^}]*\}", "", query)
+    query = query.replace("{", "{\n  rateLimit(dryRun: true) { cost remaining limit resetAt }", 1)
+    return run_query(query, variables)["data"]["rateLimit"]
+
+def rate_limit_status():
+    """
+    Remaining REST ("core"), REST search and GraphQL budgets summed over the token pool, with the earliest
+    reset; this endpoint does not count against them.
+    """
+    status = {}
+    for token in TOKEN_POOL.tokens:
+        with RATE_BUDGET.request():
+            response = requests.get(f"{REST_URL}/rate_limit", headers=dict(HEADERS, Authorization=f"Bearer {token}"),
+                                    timeout=request_timeout())
+        resources = response.json().get("resources", {})
+        for name in ("core", "search", "graphql"):
+            budget = resources.get(name) or {}
+            if "remaining" not in budget:
+                continue
+            total = status.setdefault(name, {"remaining": 0, "reset": 0})
+            TOKEN_POOL.record(token, name, budget["remaining"], budget.get("reset", 0))
+            total["remaining"] += budget["remaining"]
+            total["reset"] = min(total["reset"] or budget.get("reset", 0), budget.get("reset", 0))
+    return status
+
+def rest_get(url):
+    resource = "search" if "/search/" in url else "core"
+    response = send_request(resource, lambda headers: requests.get(url, headers=headers, timeout=request_timeout()))
+    return response.json()
+
+def extract_org_and_number(url):
+    match = re.match(r"https://github.com/orgs/([^/]+)/projects/(\d+)", url)
+    if not match:
+        raise ValueError("Invalid project URL")
+    return match.group(1), int(match.group(2))
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from github_api import log
+from project_items import fetch_subissues
+
+HIERARCHY_WORKERS = 4
+MAX_DEPTH = 10
+# Sub-issues below the epics enrich the release report, it can be built without them
+SUBISSUES_STAGE = "epic sub-issues"
+
+
+def build_hierarchy(roots, schema, max_workers=HIERARCHY_WORKERS, max_depth=MAX_DEPTH, budget=None):
+    """
+    Walk the sub-issue trees below roots level by level, fetching the children of one level
+    with up to max_workers concurrent requests. Every issue is visited once: an issue reachable
+    from several roots (or through a cycle) keeps its first parent. Issues whose
+    subIssuesSummary reports no children are not queried. With a run budget, expansions
+    stop once its deadline has passed and the remaining issues are kept as leaves.
+
+    Returns {"roots": [id], "nodes": {id: item}, "children": {id: [id]}, "parent": {id: id}}.
+    """
+    hierarchy = {"roots": [], "nodes": {}, "children": {}, "parent": {}}
+    nodes = hierarchy["nodes"]
+    for root in roots:
+        if root["id"] not in nodes:
+            nodes[root["id"]] = root
+            hierarchy["roots"].append(root["id"])
+
+    def expand(node_id):
+        if budget is None:
+            return fetch_subissues(nodes[node_id], schema)
+        return budget.optional(SUBISSUES_STAGE, lambda: fetch_subissues(nodes[node_id], schema), [])
+
+    level = list(hierarchy["roots"])
+    depth = 0
+    requests = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while level and depth < max_depth:
+            results = pool.map(expand, level)
+            requests += len(level)
+            next_level = []
+            for node_id, subissues in zip(level, results):
+                children = hierarchy["children"].setdefault(node_id, [])
+                for sub in subissues:
+                    if sub["id"] in nodes:
+                        continue
+                    nodes[sub["id"]] = sub
+                    children.append(sub["id"])
+                    hierarchy["parent"][sub["id"]] = node_id
+                    if sub.get("sub_issue_total"):
+                        next_level.append(sub["id"])
+            level = next_level
+            depth += 1
+    if level:
+        log(f"Sub-issue hierarchy truncated at depth {max_depth}, {len(level)} issue(s) not expanded")
+    log(f"Sub-issue hierarchy: {len(hierarchy['roots'])} root(s), {len(nodes)} issue(s), "
+        f"depth {depth}, {requests} expansion(s)")
+    return hierarchy
+
+
+def descendants(hierarchy):
+    """
+    All non-root issues in depth-first order, each with its depth below the root.
+    """
+    for node_id, depth in walk(hierarchy):
+        if depth:
+            yield hierarchy["nodes"][node_id], depth
+
+
+def walk(hierarchy):
+    """
+    Pre-order traversal of every tree: (id, depth) pairs.
+    """
+    for root in hierarchy["roots"]:
+        stack = [(root, 0)]
+        while stack:
+            node_id, depth = stack.pop()
+            yield node_id, depth
+            stack.extend((child, depth + 1) for child in reversed(hierarchy["children"].get(node_id, [])))
+
+
+def root_of(hierarchy, node_id):
+    while node_id in hierarchy["parent"]:
+        node_id = hierarchy["parent"][node_id]
+    return node_id
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def rollup_hierarchy(hierarchy):
+    """
+    Subtree totals for every issue in one post-order pass: issue count, estimate,
+    time spent and status counts of the issue and everything below it.
+    """
+    nodes = hierarchy["nodes"]
+    children = hierarchy["children"]
+    rollups = {}
+    for root in hierarchy["roots"]:
+        stack = [(root, False)]
+        while stack:
+            node_id, expanded = stack.pop()
+            if not expanded:
+                stack.append((node_id, True))
+                stack.extend((child, False) for child in children.get(node_id, []))
+                continue
+            node = nodes[node_id]
+            total = {
+                "issues": 1,
+                "estimate": _number(node.get("estimate")),
+                "time_spent": _number(node.get("time_spent")),
+                "status_counts": {node.get("status") or "Empty": 1},
+            }
+            for child in children.get(node_id, []):
+                sub = rollups[child]
+                total["issues"] += sub["issues"]
+                total["estimate"] += sub["estimate"]
+                total["time_spent"] += sub["time_spent"]
+                for status, count in sub["status_counts"].items():
+                    total["status_counts"][status] = total["status_counts"].get(status, 0) + count
+            rollups[node_id] = total
+    return rollups
@@ -0,0 +1,191 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+
+ITEM_STORE_FILE = os.environ.get("REPORT_ITEM_STORE", ".report-cache/items.sqlite")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS projects (
+    project_url TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    schema TEXT NOT NULL,
+    reconciled_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    project_url TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    content_id TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (project_url, item_id)
+);
+CREATE INDEX IF NOT EXISTS items_content ON items (content_id);
+CREATE TABLE IF NOT EXISTS repositories (
+    org TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    reconciled_at TEXT NOT NULL,
+    PRIMARY KEY (org, topic, repo)
+);
+CREATE TABLE IF NOT EXISTS pull_requests (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+"""
+
+# A row is only replaced by one at least as recent: a scan that started before a webhook
+# update must not undo it
+UPSERT_ITEM_SQL = """
+INSERT INTO items VALUES (?, ?, ?, ?)
+ON CONFLICT (project_url, item_id) DO UPDATE SET content_id = excluded.content_id, data = excluded.data
+WHERE COALESCE(json_extract(excluded.data, '$.updated_at'), '')
+    >= COALESCE(json_extract(items.data, '$.updated_at'), '')
+"""
+
+
+def _now():
+    return datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class ItemStore:
+    """
+    Local store of normalized project items and open PRs, the same rows the report
+    stages produce. A full scan replaces a project (reconcile_*), webhook events patch
+    single rows in between. One connection shared by all threads behind a lock.
+    """
+
+    def __init__(self, path=ITEM_STORE_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA_SQL)
+
+    def close(self):
+        self.db.close()
+
+    # --- projects ---
+
+    def reconcile_project(self, project_url, schema, items, started_at=None):
+        """
+        Bring a project in line with a full scan of it that started at started_at. Rows the webhook
+        receiver updated after the scan read them are kept, and so are rows missing from the scan
+        that were updated after it started.
+        """
+        scanned = {item["item_id"] for item in items}
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?)",
+                (project_url, schema["project_id"], json.dumps(schema), _now()),
+            )
+            stored = self.db.execute("SELECT item_id, json_extract(data, '$.updated_at') FROM items "
+                                     "WHERE project_url = ?", (project_url,)).fetchall()
+            self.db.executemany(
+                "DELETE FROM items WHERE project_url = ? AND item_id = ?",
+                [(project_url, item_id) for item_id, updated_at in stored
+                 if item_id not in scanned and (started_at is None or (updated_at or "") < started_at)],
+            )
+            self.db.executemany(
+                UPSERT_ITEM_SQL,
+                [(project_url, item["item_id"], item["id"], json.dumps(item)) for item in items],
+            )
+
+    def schema(self, project_url):
+        with self.lock:
+            row = self.db.execute("SELECT schema FROM projects WHERE project_url = ?", (project_url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def project_url(self, project_id):
+        with self.lock:
+            row = self.db.execute("SELECT project_url FROM projects WHERE project_id = ?", (project_id,)).fetchone()
+        return row[0] if row else None
+
+    def reconciled_at(self, project_url):
+        with self.lock:
+            row = self.db.execute("SELECT reconciled_at FROM projects WHERE project_url = ?",
+                                  (project_url,)).fetchone()
+        return row[0] if row else None
+
+    def items(self, project_url):
+        with self.lock:
+            rows = self.db.execute("SELECT data FROM items WHERE project_url = ? ORDER BY rowid",
+                                   (project_url,)).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def items_by_content(self, content_id):
+        with self.lock:
+            rows = self.db.execute("SELECT project_url, data FROM items WHERE content_id = ?",
+                                   (content_id,)).fetchall()
+        return [(project_url, json.loads(data)) for project_url, data in rows]
+
+    def upsert_item(self, project_url, item):
+        with self.lock, self.db:
+            self.db.execute(UPSERT_ITEM_SQL, (project_url, item["item_id"], item["id"], json.dumps(item)))
+
+    def delete_item(self, item_id):
+        with self.lock, self.db:
+            return self.db.execute("DELETE FROM items WHERE item_id = ?", (item_id,)).rowcount
+
+    def delete_content(self, content_id):
+        with self.lock, self.db:
+            return self.db.execute("DELETE FROM items WHERE content_id = ?", (content_id,)).rowcount
+
+    # --- pull requests ---
+
+    def reconcile_prs(self, org, topic, grouped_prs):
+        with self.lock, self.db:
+            old_repos = [r for r, in self.db.execute(
+                "SELECT repo FROM repositories WHERE org = ? AND topic = ?", (org, topic))]
+            self.db.execute("DELETE FROM repositories WHERE org = ? AND topic = ?", (org, topic))
+            for repo in set(old_repos) | set(grouped_prs):
+                self.db.execute("DELETE FROM pull_requests WHERE repo = ?", (repo,))
+            now = _now()
+            for repo, prs in grouped_prs.items():
+                self.db.execute("INSERT INTO repositories VALUES (?, ?, ?, ?)", (org, topic, repo, now))
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO pull_requests VALUES (?, ?, ?)",
+                    [(repo, pr["number"], json.dumps(pr)) for pr in prs],
+                )
+
+    def has_prs(self, org, topic):
+        with self.lock:
+            row = self.db.execute("SELECT 1 FROM repositories WHERE org = ? AND topic = ? LIMIT 1",
+                                  (org, topic)).fetchone()
+        return row is not None
+
+    def tracks_repository(self, repo):
+        with self.lock:
+            row = self.db.execute("SELECT 1 FROM repositories WHERE repo = ? LIMIT 1", (repo,)).fetchone()
+        return row is not None
+
+    def add_repository(self, org, topic, repo):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO repositories VALUES (?, ?, ?, ?)", (org, topic, repo, _now()))
+
+    def prs(self, org, topic):
+        """
+        Open PRs grouped by repository, the shape returned by the prs() report stage.
+        """
+        with self.lock:
+            repos = [r for r, in self.db.execute(
+                "SELECT repo FROM repositories WHERE org = ? AND topic = ? ORDER BY rowid", (org, topic))]
+            rows = self.db.execute(
+                "SELECT repo, data FROM pull_requests WHERE repo IN (SELECT repo FROM repositories "
+                "WHERE org = ? AND topic = ?) ORDER BY repo, number", (org, topic)).fetchall()
+        grouped = {repo: [] for repo in repos}
+        for repo, data in rows:
+            grouped[repo].append(json.loads(data))
+        return grouped
+
+    def upsert_pr(self, pr):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO pull_requests VALUES (?, ?, ?)",
+                            (pr["repo"], pr["number"], json.dumps(pr)))
+
+    def delete_pr(self, repo, number):
+        with self.lock, self.db:
+            return self.db.execute("DELETE FROM pull_requests WHERE repo = ? AND number = ?",
+                                   (repo, number)).rowcount
@@ -0,0 +1,180 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from github_api import log, run_query
+
+PR_HISTORY_FILE = os.environ.get("REPORT_PR_HISTORY", ".report-cache/pr-history.sqlite")
+# How far back the first sync of a repository goes; later syncs only fetch what changed
+BACKFILL_DAYS = 180
+SYNC_WORKERS = 4
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS pull_requests (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT PRIMARY KEY,
+    updated_at TEXT NOT NULL,
+    synced_at TEXT NOT NULL
+);
+"""
+
+# Merged and closed PRs, most recently updated first, so a sync can stop at its cursor
+CLOSED_PRS_QUERY = """
+query($owner: String!, $name: String!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: [MERGED, CLOSED], first: 50, after: $after, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        number
+        url
+        title
+        state
+        createdAt
+        updatedAt
+        closedAt
+        mergedAt
+        author {
+          login
+        }
+        reviews(first: 50) {
+          nodes {
+            state
+            submittedAt
+            author {
+              login
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def _now():
+    return datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def to_history_row(repo, node):
+    """
+    Stored row of one closed PR: its timestamps plus the first review by someone other than
+    the author and the number of review rounds (change requests, plus the approving review).
+    """
+    author = (node.get("author") or {}).get("login") or "ghost"
+    reviews = [
+        review for review in (node.get("reviews") or {}).get("nodes", [])
+        if review.get("submittedAt") and (review.get("author") or {}).get("login") != author
+    ]
+    states = [review["state"] for review in reviews]
+    return {
+        "repo": repo,
+        "number": node["number"],
+        "url": node["url"],
+        "title": node["title"],
+        "author": author,
+        "state": node["state"],
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "closed_at": node.get("closedAt"),
+        "merged_at": node.get("mergedAt"),
+        "first_review_at": min((review["submittedAt"] for review in reviews), default=None),
+        "reviews": len(reviews),
+        "review_rounds": states.count("CHANGES_REQUESTED") + (1 if "APPROVED" in states else 0),
+    }
+
+
+class PrHistory:
+    """
+    Local history of merged and closed PRs with one sync cursor per repository:
+    the newest updatedAt already stored. One connection shared by all threads behind a lock.
+    """
+
+    def __init__(self, path=PR_HISTORY_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA_SQL)
+
+    def close(self):
+        self.db.close()
+
+    def cursor(self, repo):
+        with self.lock:
+            row = self.db.execute("SELECT updated_at FROM sync_state WHERE repo = ?", (repo,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, repo, rows, cursor):
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO pull_requests VALUES (?, ?, ?, ?)",
+                [(row["repo"], row["number"], row["updated_at"], json.dumps(row)) for row in rows],
+            )
+            if cursor:
+                self.db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)", (repo, cursor, _now()))
+
+    def rows(self, repos=None, closed_since=None):
+        with self.lock:
+            data = [json.loads(row[0])
+                    for row in self.db.execute("SELECT data FROM pull_requests ORDER BY repo, number")]
+        if repos is not None:
+            repos = set(repos)
+            data = [row for row in data if row["repo"] in repos]
+        if closed_since:
+            data = [row for row in data if (row["closed_at"] or "") >= closed_since]
+        return data
+
+
+def fetch_changed_prs(repo, stop_before):
+    """
+    Closed PRs of repo updated at or after stop_before, newest first. Paging stops at the
+    first older PR, so a daily sync costs one page per repository.
+    """
+    owner, name = repo.split("/")
+    rows = []
+    after = None
+    while True:
+        result = run_query(CLOSED_PRS_QUERY, {"owner": owner, "name": name, "after": after})
+        connection = ((result["data"].get("repository") or {}).get("pullRequests")
+                      or {"nodes": [], "pageInfo": {"hasNextPage": False}})
+        for node in connection["nodes"]:
+            if node["updatedAt"] < stop_before:
+                return rows
+            rows.append(to_history_row(repo, node))
+        if not connection["pageInfo"]["hasNextPage"]:
+            return rows
+        after = connection["pageInfo"]["endCursor"]
+
+
+def sync_pr_history(history, repos, backfill_days=BACKFILL_DAYS, workers=SYNC_WORKERS):
+    """
+    Bring the history of every repository up to date, repositories in parallel.
+    A repository synced before resumes from its cursor, a new one is backfilled for backfill_days.
+    Returns the number of PRs fetched.
+    """
+    backfill = (datetime.datetime.utcnow() - datetime.timedelta(days=backfill_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def sync(repo):
+        cursor = history.cursor(repo)
+        rows = fetch_changed_prs(repo, cursor or backfill)
+        history.save(repo, rows, max([row["updated_at"] for row in rows] + [cursor or ""]))
+        log(f"[{repo}] {len(rows)} closed PR(s) changed since {cursor or backfill}")
+        return len(rows)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = sum(pool.map(sync, repos))
+    print(f"PR history: {fetched} changed PR(s) synced from {len(repos)} repositories")
+    return fetched
@@ -0,0 +1,417 @@
+import datetime
+import json
+import os
+from jinja2 import Template
+
+import github_api
+from github_api import ResourceLimitError, log, rest_get, run_query
+from pr_rules import apply_attention_rules, rules_legend
+from report_delta import run_delta_stage
+from report_export import export_dataset, write_report
+from report_manifest import dataset_hash, record_output, unchanged_output
+from user_directory import display_name
+
+# --- Configuration ---
+ORG_NAME = "Netcracker"
+TOPIC_FILTER = "apihub"
+AGE_FIELDS = ("age", "age_days")
+
+# --- GraphQL: linked issues, projects, reviews, CI and mergeability of several PRs in one request ---
+PR_DETAILS_FRAGMENT = '''
+fragment PrDetails on PullRequest {
+  closingIssuesReferences(first: 10) {
+    nodes {
+      title
+      url
+    }
+  }
+  projectsV2(first: 10) {
+    nodes {
+      title
+    }
+  }
+  reviewDecision
+  mergeable
+  reviewRequests(first: 20) {
+    nodes {
+      requestedReviewer {
+        ... on User { login }
+        ... on Team { name }
+        ... on Mannequin { login }
+      }
+    }
+  }
+  latestReviews(first: 20) {
+    nodes {
+      state
+      submittedAt
+    }
+  }
+  commits(last: 1) {
+    nodes {
+      commit {
+        statusCheckRollup {
+          state
+        }
+      }
+    }
+  }
+}
+'''
+# PRs of one repository per details request
+PRS_PER_DETAILS_QUERY = 25
+# Open PRs per page of the REST pulls list (the API maximum)
+PULLS_PER_PAGE = 100
+
+def pr_details_query(count):
+    """
+    Query with one aliased pullRequest field per PR: p0 .. p<count-1>, numbers in $n0 .. $n<count-1>.
+    """
+    params = "".join(f", $n{i}: Int!" for i in range(count))
+    fields = "\n".join(f"    p{i}: pullRequest(number: $n{i}) {{ ...PrDetails }}" for i in range(count))
+    return (f"query($owner: String!, $repo: String!{params}) {{\n"
+            f"  repository(owner: $owner, name: $repo) {{\n{fields}\n  }}\n}}\n" + PR_DETAILS_FRAGMENT)
+
+def parse_pr_details(node):
+    node = node or {}
+    issues = [(issue["url"], issue["title"])
+              for issue in (node.get("closingIssuesReferences") or {}).get("nodes", [])
+              if issue.get("url") and issue.get("title")]
+    projects = [project["title"] for project in (node.get("projectsV2") or {}).get("nodes", []) if project.get("title")]
+    reviewers = []
+    for request in (node.get("reviewRequests") or {}).get("nodes", []):
+        reviewer = request.get("requestedReviewer") or {}
+        if reviewer.get("login") or reviewer.get("name"):
+            reviewers.append(reviewer.get("login") or reviewer.get("name"))
+    approvals = [review["submittedAt"] for review in (node.get("latestReviews") or {}).get("nodes", [])
+                 if review.get("state") == "APPROVED" and review.get("submittedAt")]
+    commits = (node.get("commits") or {}).get("nodes") or [{}]
+    rollup = ((commits[-1] or {}).get("commit") or {}).get("statusCheckRollup") or {}
+    return {
+        "issues": issues,
+        "projects": projects,
+        "review_decision": node.get("reviewDecision") or "",
+        "requested_reviewers": reviewers,
+        # Latest approval still standing; the PR counts as approved since then
+        "approved_at": max(approvals, default=""),
+        "ci_state": rollup.get("state") or "",
+        # UNKNOWN while GitHub is still computing it in the background
+        "mergeable": node.get("mergeable") or "",
+    }
+
+def query_pr_details(repo_full_name, chunk):
+    """
+    One details request for a chunk of PRs. A chunk that hits GitHub's resource limits is
+    split in halves and retried; any other failure fails the report rather than showing
+    the PRs without issues and projects.
+    """
+    owner, repo = repo_full_name.split("/")
+    variables = {"owner": owner, "repo": repo}
+    variables.update({f"n{i}": number for i, number in enumerate(chunk)})
+    if github_api.VERBOSE:
+        print(f"[GraphQL] Requesting details for {repo_full_name} PRs {chunk}")
+    try:
+        data = run_query(pr_details_query(len(chunk)), variables)
+    except ResourceLimitError as e:
+        if len(chunk) == 1:
+            raise
+        log(f"[GraphQL] {repo_full_name}: {e}, splitting {len(chunk)} PRs into two requests")
+        half = len(chunk) // 2
+        return query_pr_details(repo_full_name, chunk[:half]) + query_pr_details(repo_full_name, chunk[half:])
+    if github_api.VERBOSE:
+        print(f"[GraphQL] Response for details of {repo_full_name}: {json.dumps(data, indent=2)[:500]}...")
+    repository = data["data"].get("repository")
+    if repository is None:
+        raise Exception(f"Repository {repo_full_name} not found while reading PR details")
+    return [repository.get(f"p{i}") for i in range(len(chunk))]
+
+def get_pr_details_via_graphql(repo_full_name, pr_numbers):
+    """
+    Details of the given PRs of one repository, PRS_PER_DETAILS_QUERY PRs per request.
+    Returns {number: details}.
+    """
+    details = {}
+    for start in range(0, len(pr_numbers), PRS_PER_DETAILS_QUERY):
+        chunk = pr_numbers[start:start + PRS_PER_DETAILS_QUERY]
+        for number, node in zip(chunk, query_pr_details(repo_full_name, chunk)):
+            details[number] = parse_pr_details(node)
+    return details
+
+# --- Search for repositories with the specified topic using GitHub search API ---
+def get_repositories_with_topic(org, topic):
+    repos = []
+    page = 1
+    while True:
+        url = f"https://api.github.com/search/repositories?q=topic:{topic}+org:{org}&per_page=100&page={page}"
+        if github_api.VERBOSE:
+            print(f"[REST] Searching repositories from: {url}")
+        resp = rest_get(url)
+        if github_api.VERBOSE:
+            print(f"[REST] Response repos page {page}: {json.dumps(resp, indent=2)[:500]}...")
+        if not resp.get("items"):
+            break
+        for repo in resp["items"]:
+            repos.append(repo["full_name"])
+        if len(resp["items"]) < 100:
+            break
+        page += 1
+    if github_api.VERBOSE:
+        print(f"[REST] Total repositories found: {len(repos)}")
+    return repos
+
+# --- Fetch open pull requests along with issues, projects, reviews and CI state ---
+def to_pr_details(repo_full_name, pr, details=None):
+    """
+    Report row of one PR from its REST representation (pulls API or pull_request webhook payload).
+    details comes from get_pr_details_via_graphql; without it the details of this one PR are fetched.
+    """
+    owner, repo = repo_full_name.split("/")
+    pr_number = pr["number"]
+    if details is None:
+        details = get_pr_details_via_graphql(repo_full_name, [pr_number])[pr_number]
+
+    is_draft = pr.get("draft", False)
+    pr_details = {
+        "number": pr_number,
+        "html_url": pr.get("html_url", ""),
+        "title": pr.get("title", ""),
+        "user": pr.get("user", {}).get("login", ""),
+        "created_at": pr.get("created_at", ""),
+        "assignee": pr.get("assignee", {}).get("login", "Empty") if pr.get("assignee") else "Empty",
+        "repo": repo_full_name,
+        "repo_name": repo,
+        "status": "Draft" if is_draft else "Not Draft"
+    }
+    pr_details.update(details)
+    if github_api.VERBOSE:
+        print(f"[PR] Collected details for PR #{pr_number}: {details}")
+    return pr_details
+
+def get_pull_requests(repo_full_name):
+    resp = []
+    page = 1
+    while True:
+        url = f"https://api.github.com/repos/{repo_full_name}/pulls?state=open&per_page={PULLS_PER_PAGE}&page={page}"
+        if github_api.VERBOSE:
+            print(f"[REST] Fetching PRs from: {url}")
+        batch = rest_get(url)
+        if github_api.VERBOSE:
+            print(f"[REST] Response PRs for {repo_full_name}: {json.dumps(batch, indent=2)[:500]}...")
+        resp.extend(batch)
+        if len(batch) < PULLS_PER_PAGE:
+            break
+        page += 1
+    details = get_pr_details_via_graphql(repo_full_name, [pr["number"] for pr in resp])
+    return [to_pr_details(repo_full_name, pr, details[pr["number"]]) for pr in resp]
+
+# --- HTML template ---
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset='utf-8'>
+    <title>GitHub PR Report</title>
+    <script src='https://unpkg.com/list.js@1.5.0/dist/list.min.js'></script>
+    <style>
+        body { font-family: Arial, sans-serif; padding: 20px; }
+        .rules-panel {
+            border: 1px solid #ccc;
+            padding: 10px;
+            margin-bottom: 20px;
+            background-color: #f2f2f2;
+        }
+        .rules-panel strong {
+            display: block;
+            margin-bottom: 8px;
+        }
+        table { width: 100%; border-collapse: collapse; margin-top: 10px; }
+        th, td { border: 1px solid #ccc; padding: 8px; text-align: left; vertical-align: top; }
+        th { cursor: pointer; }
+        .color-0 { background-color: #f9f9f9; }
+        .color-1 { background-color: #e7f4ff; }
+        .color-2 { background-color: #fef9e7; }
+        .color-3 { background-color: #eaf7ea; }
+        .color-4 { background-color: #fceeee; }
+        #statusFilter { margin-left: 5px; margin-right: 15px; padding: 4px; }
+        .attention-icon { color: red; font-weight: bold; display: block; }
+        .attention-text { margin-left: 4px; font-style: italic; }
+    </style>
+</head>
+<body>
+    <h1>GitHub Pull Requests Report</h1>
+
+    <div class="rules-panel">
+        <strong>Rules:</strong>
+        {% for rule in rules %}
+        <div>⚠️ {{ rule.description | e }}{% if rule.reason %} – {{ rule.reason | e }}{% endif %}</div>
+        {% endfor %}
+    </div>
+
+    <button id="toggleButton" onclick='toggleCLPLCI()'>Show PRs from NetcrackerCLPLCI</button>
+
+    <label for="statusFilter">Status:</label>
+    <select id="statusFilter" onchange="applyFilters()">
+        <option value="Not Draft" selected>Not Draft</option>
+        <option value="Draft">Draft</option>
+        <option value="all">All</option>
+    </select>
+
+    <input class='search' placeholder='Filter PRs...'>
+    <table id='pr-table'>
+        <thead>
+            <tr>
+                <th class='sort' data-sort='repo'>📁 Repository</th>
+                <th class='sort' data-sort='title'>📌 PR name</th>
+                <th class='sort' data-sort='author'>👤 PR author</th>
+                <th class='sort' data-sort='status'>📋 Status</th>
+                <th class='sort' data-sort='age'>📅 PR age</th>
+                <th class='sort' data-sort='assignee'>👤 PR assignee</th>
+                <th class='sort' data-sort='review'>👀 Review</th>
+                <th class='sort' data-sort='ci'>🚦 CI</th>
+                <th>🔗 PR issues</th>
+                <th class='sort' data-sort='attention'>❗ Attention Required</th>
+            </tr>
+        </thead>
+        <tbody class='list'>
+            {% set repo_colors = {} %}
+            {% for repo, prs in grouped_prs.items() %}
+                {% if repo not in repo_colors %}
+                    {% set _ = repo_colors.update({repo: 'color-' ~ (loop.index0 % 5)}) %}
+                {% endif %}
+                {% for pr in prs %}
+                <tr class='{{ repo_colors[repo] }}' data-status='{{ pr.status }}'{% if pr.user == "NetcrackerCLPLCI" %} data-clplci="true"{% endif %}>
+                    <td class='repo'>{{ pr.repo }}</td>
+                    <td class='title'><a href='{{ pr.html_url }}' target='_blank'>{{ pr.title }}</a></td>
+                    <td class='author'>{{ pr.user_display }}</td>
+                    <td class='status'>{{ pr.status }}</td>
+                    <td class='age' data-created='{{ pr.created_at }}'>{{ pr.age }}</td>
+                    <td class='assignee'>{{ pr.assignee_display }}</td>
+                    <td class='review'>
+                        {{ (pr.review_decision or '') | replace('_', ' ') | lower }}
+                        {% if pr.requested_reviewers %}
+                            <br>requested: {{ pr.requested_reviewers | join(', ') }}
+                        {% endif %}
+                    </td>
+                    <td class='ci'>
+                        {{ (pr.ci_state or '') | lower }}
+                        {% if pr.mergeable == 'CONFLICTING' %}<br>conflicts{% endif %}
+                    </td>
+                    <td>
+                        {% for issue in pr.issues %}
+                            <a href='{{ issue[0] }}' target='_blank'>{{ issue[1] }}</a>{% if not loop.last %}, {% endif %}
+                        {% endfor %}
+                    </td>
+                    <td class='attention'>
+                        {% if pr.attention_reasons %}
+                            <span class="attention-icon">❗</span>
+                            <div class="attention-text">
+                                {%- for reason in pr.attention_reasons %}
+                                    {{- reason | e }}{% if not loop.last %}<br/>{% endif %}
+                                {%- endfor -%}
+                            </div>
+                        {% endif %}
+                    </td>
+                </tr>
+                {% endfor %}
+            {% endfor %}
+        </tbody>
+    </table>
+    <script>
+        var showCLPLCI = false;
+
+        function toggleCLPLCI() {
+            showCLPLCI = !showCLPLCI;
+            document.getElementById('toggleButton').textContent = showCLPLCI
+                ? 'Hide PRs from NetcrackerCLPLCI'
+                : 'Show PRs from NetcrackerCLPLCI';
+            applyFilters();
+        }
+
+        function applyFilters() {
+            var statusValue = document.getElementById('statusFilter').value;
+            document.querySelectorAll('tbody.list tr').forEach(function(row) {
+                var visible = true;
+                if (!showCLPLCI && row.getAttribute('data-clplci') === 'true') {
+                    visible = false;
+                }
+                if (statusValue !== 'all' && row.getAttribute('data-status') !== statusValue) {
+                    visible = false;
+                }
+                row.style.display = visible ? '' : 'none';
+            });
+        }
+
+        // Ages as of now: a report that is not regenerated (only ages changed) stays current
+        document.querySelectorAll('td.age[data-created]').forEach(function(cell) {
+            var created = Date.parse(cell.getAttribute('data-created'));
+            if (!isNaN(created)) {
+                cell.textContent = Math.floor((Date.now() - created) / 86400000) + ' days';
+            }
+        });
+
+        var options = {
+            valueNames: ['repo', 'title', 'author', 'status', 'age', 'assignee', 'review', 'ci', 'attention']
+        };
+        var prList = new List('pr-table', options);
+
+        applyFilters();
+    </script>
+</body>
+</html>
+"""
+
+# --- Generate report ---
+def render_pr_report(grouped_prs, rules=()):
+    template = Template(HTML_TEMPLATE)
+    return template.render(grouped_prs=grouped_prs, rules=rules)
+
+def collect_pr_report(run, attention_rules, now):
+    # Every org/topic pair is fetched in its own worker and merged into one report
+    grouped_prs = {}
+    for prs in run.for_each(run.org_topics, lambda org_topic: run.prs(*org_topic)):
+        grouped_prs.update(prs)
+
+    # Collect reasons why PRs require attention: all rules over all PRs in one batch
+    all_prs = [pr for prs in grouped_prs.values() for pr in prs]
+    users = run.users({pr["user"] for pr in all_prs} | {pr["assignee"] for pr in all_prs})
+    for pr in all_prs:
+        pr["user_display"] = display_name(users, pr["user"])
+        pr["assignee_display"] = display_name(users, pr["assignee"])
+    apply_attention_rules(all_prs, attention_rules, now, log=log)
+    for pr in all_prs:
+        pr["age"] = str(pr["age_days"]) + " days"
+        if github_api.VERBOSE and pr["attention_reasons"]:
+            print(f"[Attention] PR #{pr['number']} reasons: {pr['attention_reasons']}")
+    return grouped_prs, all_prs
+
+def build_pr_report(run, attention_rules, now):
+    grouped_prs, all_prs = collect_pr_report(run, attention_rules, now)
+    return all_prs, render_pr_report(grouped_prs, rules_legend(attention_rules))
+
+def run_pr_report(run, attention_rules, options):
+    now = datetime.datetime.utcnow()
+    grouped_prs, all_prs = collect_pr_report(run, attention_rules, now)
+    # Ages grow every day; the page recomputes them from created_at when it is opened, so the
+    # report is only regenerated when anything else changes, including attention reasons
+    # triggered by age thresholds
+    # The rules panel is part of the page, so editing a rule's text regenerates it too
+    legend = rules_legend(attention_rules)
+    digest = dataset_hash(all_prs + legend, ignore=AGE_FIELDS)
+    previous = unchanged_output(options.manifest, "prs", digest)
+    if previous:
+        print(f"PR data unchanged since {previous}, report not regenerated")
+        return None
+
+    filename = f"report_prs_{now.strftime('%Y%m%d_%H%M%S')}.html"
+    write_report(filename, render_pr_report(grouped_prs, legend))
+    print(f"✅ Report saved to file: {filename}")
+
+    # Export the same PR list, no extra API calls
+    export_dataset(all_prs, os.path.splitext(filename)[0], options.export)
+    if options.delta_dir:
+        run_delta_stage(options.delta_dir, "prs", "GitHub Pull Requests Report", all_prs,
+                        key_fields=("html_url",),
+                        tracked_fields=("title", "status", "assignee", "issues", "projects", "attention_reasons"),
+                        label_field="title", url_field="html_url")
+    record_output(options.manifest, "prs", digest, filename)
+    return filename
@@ -0,0 +1,136 @@
+import datetime
+import json
+import os
+
+import numpy as np
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pr-attention-rules.json")
+
+
+def _startswith_any(column, prefixes):
+    prefixes = [prefixes] if isinstance(prefixes, str) else prefixes
+    result = np.zeros(len(column), dtype=bool)
+    for prefix in prefixes:
+        result |= np.char.startswith(column, prefix.lower())
+    return result
+
+
+def _contains(column, needle):
+    return np.char.find(column, str(needle).lower()) >= 0
+
+
+# Each operator works on a whole column at once
+OPERATORS = {
+    "eq": lambda col, v: col == v,
+    "ne": lambda col, v: col != v,
+    "gt": lambda col, v: col > v,
+    "ge": lambda col, v: col >= v,
+    "lt": lambda col, v: col < v,
+    "le": lambda col, v: col <= v,
+    "in": lambda col, v: np.isin(col, v),
+    "not_in": lambda col, v: ~np.isin(col, v),
+    "startswith": _startswith_any,
+    "not_startswith": lambda col, v: ~_startswith_any(col, v),
+    "contains": _contains,
+    "not_contains": lambda col, v: ~_contains(col, v),
+}
+
+NUMERIC_FIELDS = ("age_days", "issue_count", "project_count", "requested_reviewer_count", "approved_days")
+TEXT_FIELDS = ("title", "status", "user", "assignee", "repo", "review_decision", "ci_state", "mergeable")
+
+
+def normalize_prs(prs, now=None):
+    """
+    Build the rule columns once for the whole PR list.
+    created_at is parsed in one vectorized pass against a single "now"; text columns are lower-cased.
+    """
+    now = np.datetime64(now or datetime.datetime.utcnow().replace(microsecond=0), "s")
+    created = np.array([(pr.get("created_at") or "").rstrip("Z") or "NaT" for pr in prs], dtype="datetime64[s]")
+    age_seconds = (now - created).astype("int64")
+    approved = np.array([(pr.get("approved_at") or "").rstrip("Z") or "NaT" for pr in prs], dtype="datetime64[s]")
+    columns = {
+        "age_days": np.where(np.isnat(created), -1, age_seconds // 86400),
+        "issue_count": np.array([len(pr.get("issues", [])) for pr in prs], dtype=int),
+        "project_count": np.array([len(pr.get("projects", [])) for pr in prs], dtype=int),
+        "requested_reviewer_count": np.array([len(pr.get("requested_reviewers") or []) for pr in prs], dtype=int),
+        # Whole days since the standing approval; NaN for PRs that are not approved
+        "approved_days": np.where(np.isnat(approved), np.nan, (now - approved).astype("int64") // 86400),
+    }
+    for field in TEXT_FIELDS:
+        columns[field] = np.array([str(pr.get(field) or "").lower() for pr in prs], dtype=str)
+    return columns
+
+
+def compile_rules(rules):
+    """
+    Validate rule definitions once and bind their operators.
+    Raises an Exception naming the broken rule instead of failing per PR.
+    """
+    compiled = []
+    for rule in rules:
+        rule_id = rule.get("id") or rule.get("description")
+        if not isinstance(rule.get("description"), str) or not rule["description"].strip():
+            raise Exception(f"Attention rule '{rule_id}': 'description' must be a non-empty string")
+        conditions = []
+        for cond in rule.get("when", []):
+            field, op = cond.get("field"), cond.get("op")
+            if field not in NUMERIC_FIELDS + TEXT_FIELDS:
+                raise Exception(f"Attention rule '{rule_id}': unknown field '{field}'")
+            if op not in OPERATORS:
+                raise Exception(f"Attention rule '{rule_id}': unknown operator '{op}'")
+            value = cond.get("value")
+            if field in TEXT_FIELDS and isinstance(value, str):
+                value = value.lower()
+            elif field in TEXT_FIELDS and isinstance(value, list):
+                value = [str(v).lower() for v in value]
+            conditions.append((field, OPERATORS[op], value))
+        if not conditions:
+            raise Exception(f"Attention rule '{rule_id}' has no conditions")
+        compiled.append({"id": rule_id, "description": rule["description"], "reason": rule.get("reason", ""),
+                         "conditions": conditions})
+    return compiled
+
+
+def rules_legend(compiled_rules):
+    """
+    What the report says about its rules: description (the attention reason shown on a PR) and
+    the optional explanation of each rule, in file order.
+    """
+    return [{"id": rule["id"], "description": rule["description"], "reason": rule["reason"]}
+            for rule in compiled_rules]
+
+
+def load_rules(path=DEFAULT_RULES_FILE):
+    with open(path, encoding="utf-8") as f:
+        return compile_rules(json.load(f))
+
+
+def evaluate_rules(compiled_rules, columns):
+    """
+    Evaluate all rules over the columns. Returns a boolean matrix [rule, pr].
+    """
+    size = len(columns["age_days"])
+    matrix = np.zeros((len(compiled_rules), size), dtype=bool)
+    for i, rule in enumerate(compiled_rules):
+        mask = np.ones(size, dtype=bool)
+        for field, op, value in rule["conditions"]:
+            mask &= op(columns[field], value)
+        matrix[i] = mask
+    return matrix
+
+
+def apply_attention_rules(prs, compiled_rules, now=None, log=None):
+    """
+    Set pr["attention_reasons"] and pr["age_days"] for every PR using one batch evaluation.
+    """
+    if not prs:
+        return prs
+    columns = normalize_prs(prs, now)
+    matrix = evaluate_rules(compiled_rules, columns)
+    if log:
+        for rule, hits in zip(compiled_rules, matrix.sum(axis=1)):
+            log(f"[Rule] '{rule['id']}' matched {hits} of {len(prs)} PRs")
+    for j, pr in enumerate(prs):
+        pr["age_days"] = int(columns["age_days"][j])
+        pr["attention_reasons"] = [rule["description"] for rule, hit in zip(compiled_rules, matrix[:, j]) if hit]
+    return prs
@@ -0,0 +1,476 @@
+import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from adaptive_paging import AdaptivePageSize
+from github_api import ResourceLimitError, extract_org_and_number, run_query, log
+
+PROJECT_URL = "https://github.com/orgs/Netcracker/projects/9"
+SPRINT_FIELD_NAME = "Sprint"
+ESTIMATE_FIELD_NAME = "Estimate, md"
+TIME_SPENT_FIELD_NAME = "Time spent, md"
+# "status": scan one server-side filter partition per status concurrently, "none": one sequential scan
+SCAN_PARTITION = os.environ.get("GITHUB_SCAN_PARTITION", "status")
+SCAN_WORKERS = int(os.environ.get("GITHUB_SCAN_WORKERS", "4"))
+
+SCHEMA_QUERY = """
+query($org: String!, $number: Int!) {
+  organization(login: $org) {
+    projectV2(number: $number) {
+      id
+      fields(first: 50) {
+        nodes {
+          __typename
+          ... on ProjectV2IterationField {
+            id
+            name
+            configuration {
+              ... on ProjectV2IterationFieldConfiguration {
+                iterations {
+                  id
+                  title
+                  startDate
+                  duration
+                }
+                completedIterations {
+                  id
+                  title
+                  startDate
+                  duration
+                }
+              }
+            }
+          }
+          ... on ProjectV2SingleSelectField {
+            id
+            name
+            options {
+              id
+              name
+            }
+          }
+          ... on ProjectV2Field {
+            id
+            name
+            dataType
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+FIELD_VALUES_FRAGMENT = """
+fieldValues(first: 30) {
+  nodes {
+    __typename
+    ... on ProjectV2ItemFieldIterationValue {
+      iterationId
+    }
+    ... on ProjectV2ItemFieldSingleSelectValue {
+      optionId
+      field {
+        ... on ProjectV2SingleSelectField {
+          name
+        }
+      }
+    }
+    ... on ProjectV2ItemFieldNumberValue {
+      number
+      field {
+        ... on ProjectV2Field {
+          id
+          name
+        }
+      }
+    }
+  }
+}
+"""
+
+ITEM_FRAGMENT = """
+id
+updatedAt
+content {
+  ... on Issue {
+    id
+    title
+    url
+    parent {
+      title
+      url
+    }
+    issueType {
+      name
+    }
+    assignees(first: 10) {
+      nodes { login }
+    }
+    labels(first: 50) {
+      nodes { name }
+    }
+    milestone {
+      title
+    }
+  }
+}
+%s
+""" % FIELD_VALUES_FRAGMENT
+
+# One scan of the project serves the sprint report, every release report and epic discovery.
+# The page size is a variable so the pager can adapt it (see adaptive_paging.py),
+# $query is an optional project filter ("status:Done") used to partition the scan.
+ITEMS_QUERY = """
+query($projectId: ID!, $after: String, $first: Int!, $query: String) {
+  rateLimit {
+    cost
+  }
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: $first, after: $after, query: $query) {
+        totalCount
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          %s
+        }
+      }
+    }
+  }
+}
+""" % ITEM_FRAGMENT
+
+ITEM_COUNT_QUERY = """
+query($projectId: ID!) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: 1) {
+        totalCount
+      }
+    }
+  }
+}
+"""
+
+# A single item, used to refresh the local item store after a webhook event
+ITEM_QUERY = """
+query($itemId: ID!) {
+  node(id: $itemId) {
+    ... on ProjectV2Item {
+      project {
+        id
+      }
+      %s
+    }
+  }
+}
+""" % ITEM_FRAGMENT
+
+SUBISSUES_QUERY = """
+query($issueId: ID!, $after: String) {
+  node(id: $issueId) {
+    ... on Issue {
+      subIssues(first: 50, after: $after) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          id
+          title
+          url
+          issueType {
+            name
+          }
+          assignees(first: 10) {
+            nodes { login }
+          }
+          subIssuesSummary {
+            total
+          }
+          projectItems(first: 20) {
+            nodes {
+              project {
+                id
+              }
+              %s
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % FIELD_VALUES_FRAGMENT
+
+def project_label(project_url):
+    org, number = extract_org_and_number(project_url)
+    return f"{org}/{number}"
+
+def fetch_project_schema(org, number):
+    """
+    Read the project fields once: sprint iterations, single-select options and numeric field ids.
+    """
+    result = run_query(SCHEMA_QUERY, {"org": org, "number": number})
+    project = result["data"]["organization"]["projectV2"]
+
+    schema = {
+        "project_id": project["id"],
+        "sprint_field_id": None,
+        "iterations": [],
+        "field_options": {"Status": {}, "Priority": {}},
+        "numeric_fields": {},
+    }
+    for f in project["fields"]["nodes"]:
+        if f["__typename"] == "ProjectV2IterationField" and f["name"] == SPRINT_FIELD_NAME:
+            schema["sprint_field_id"] = f["id"]
+            cfg = f.get("configuration") or {}
+            schema["iterations"] = cfg.get("iterations", []) + cfg.get("completedIterations", [])
+        if f["__typename"] == "ProjectV2SingleSelectField" and f["name"] in schema["field_options"]:
+            for opt in f.get("options", []):
+                schema["field_options"][f["name"]][opt["id"]] = opt["name"]
+        if f["__typename"] == "ProjectV2Field" and f.get("dataType") == "NUMBER":
+            if f["name"] == ESTIMATE_FIELD_NAME:
+                schema["numeric_fields"]["estimate"] = f["id"]
+            elif f["name"] == TIME_SPENT_FIELD_NAME:
+                schema["numeric_fields"]["time_spent"] = f["id"]
+    return schema
+
+def find_current_sprint(schema, today=None):
+    now = today or datetime.datetime.utcnow().date()
+    for it in schema["iterations"]:
+        start_date = datetime.datetime.strptime(it["startDate"], "%Y-%m-%d").date()
+        end_date = start_date + datetime.timedelta(days=it["duration"])
+        if start_date <= now < end_date:
+            return it["id"], it["title"]
+    raise Exception("Current sprint not found or sprint field missing")
+
+def match_release_sprints(schema, release_name):
+    if not schema["sprint_field_id"]:
+        return {}
+    return {it["id"]: it["title"] for it in schema["iterations"] if release_name in it["title"]}
+
+def find_release_sprints(schema, release_name):
+    matched_sprints = match_release_sprints(schema, release_name)
+    if not matched_sprints:
+        raise Exception("Matching sprints not found or sprint field missing")
+    return matched_sprints
+
+def parse_field_values(nodes, schema):
+    """
+    Status, priority, sprint iterations, estimate and time spent of one project item.
+    """
+    values = {"status": "Empty", "priority": "Empty", "iteration_ids": [], "estimate": "", "time_spent": ""}
+    field_options = schema["field_options"]
+    numeric_fields = schema["numeric_fields"]
+    for fv in nodes:
+        if fv["__typename"] == "ProjectV2ItemFieldIterationValue" and fv.get("iterationId"):
+            values["iteration_ids"].append(fv["iterationId"])
+        if fv["__typename"] == "ProjectV2ItemFieldSingleSelectValue":
+            field_name = fv.get("field", {}).get("name")
+            option_id = fv.get("optionId")
+            if field_name in field_options:
+                value = field_options[field_name].get(option_id, option_id)
+                if field_name == "Status":
+                    values["status"] = value
+                elif field_name == "Priority":
+                    values["priority"] = value
+        if fv["__typename"] == "ProjectV2ItemFieldNumberValue":
+            field_id = fv.get("field", {}).get("id")
+            number_value = fv.get("number")
+            if field_id == numeric_fields.get("estimate"):
+                values["estimate"] = number_value
+            elif field_id == numeric_fields.get("time_spent"):
+                values["time_spent"] = number_value
+    return values
+
+def normalize_item(item, schema):
+    """
+    Flatten one project item into the normalized dict shared by all project reports.
+    Returns None for drafts, pull requests and other non-issue content.
+    """
+    content = item.get("content")
+    if not content or content.get("title") is None:
+        return None
+    parent_node = content.get("parent") or {}
+    normalized = {
+        "item_id": item.get("id"),
+        "updated_at": item.get("updatedAt"),
+        "id": content.get("id"),
+        "title": content["title"],
+        "url": content["url"],
+        "type": (content.get("issueType") or {}).get("name"),
+        "assignees": [u["login"] for u in (content.get("assignees") or {}).get("nodes", [])],
+        "parent_name": parent_node.get("title", ""),
+        "parent_url": parent_node.get("url", ""),
+        "labels": [label.get("name") for label in (content.get("labels") or {}).get("nodes", [])],
+        "milestone": (content.get("milestone") or {}).get("title", ""),
+    }
+    normalized.update(parse_field_values((item.get("fieldValues") or {}).get("nodes", []), schema))
+    return normalized
+
+def scan_items(schema, query_filter=None, page_size=None, checkpoints=None):
+    """
+    Page through the project items matching query_filter (all items if None).
+    Returns (item_id, normalized item or None for non-issue content) pairs.
+    The page size adapts to the observed latency, payload size and cost of each page;
+    a page that hits GitHub's resource limits is retried at half the size.
+    With checkpoints every page is saved as it arrives, and a resumed run continues
+    after the last saved page.
+    """
+    page_size = page_size or AdaptivePageSize()
+    label = query_filter or "all items"
+    checkpoint = checkpoints.for_scan("items", schema, query_filter) if checkpoints else None
+    state = checkpoint.load() if checkpoint else None
+    if state:
+        scanned, after, page = state["scanned"], state["after"], state["page"]
+        log(f"[{label}] Resuming after page {page} ({len(scanned)} items)")
+        if state["done"]:
+            return scanned
+    else:
+        scanned, after, page = [], None, 0
+        if checkpoint:
+            checkpoint.start()
+    while True:
+        stats = {}
+        try:
+            result = run_query(ITEMS_QUERY, {"projectId": schema["project_id"], "after": after,
+                                             "first": page_size.size, "query": query_filter}, stats=stats)
+        except ResourceLimitError as e:
+            if not page_size.shrink():
+                raise
+            log(f"[{label}] {e}; retrying page {page + 1} with first={page_size.size}")
+            continue
+        connection = result["data"]["node"]["items"]
+        page += 1
+        page_items = [(item["id"], normalize_item(item, schema)) for item in connection["nodes"]]
+        scanned.extend(page_items)
+        if checkpoint:
+            checkpoint.append(page, connection["pageInfo"]["endCursor"], page_items,
+                              done=not connection["pageInfo"]["hasNextPage"])
+        cost = (result["data"].get("rateLimit") or {}).get("cost")
+        next_size = page_size.observe(len(connection["nodes"]), stats["seconds"], stats["bytes"], cost)
+        log(f"[{label}] Page {page}: {len(connection['nodes'])} items, {stats['bytes']} bytes, "
+            f"{stats['seconds']:.2f}s, cost {cost}; next first={next_size}")
+        if not connection["pageInfo"]["hasNextPage"]:
+            break
+        after = connection["pageInfo"]["endCursor"]
+    log(f"[{label}] Scanned {len(scanned)} project items in {page} page(s)")
+    return scanned
+
+def _filter_value(value):
+    return '"' + value.replace('"', '\\"') + '"'
+
+def status_partitions(schema):
+    """
+    Disjoint item filters that together cover the whole project: one per status option
+    plus one for everything else (no status, or an option added after the schema was read).
+    """
+    statuses = [_filter_value(name) for name in schema["field_options"]["Status"].values()]
+    if not statuses:
+        return []
+    return [f"status:{status}" for status in statuses] + ["-status:" + ",".join(statuses)]
+
+def scan_partitioned(schema, workers=SCAN_WORKERS, checkpoints=None):
+    """
+    Scan the status partitions concurrently and merge them, de-duplicated by item id
+    (an item that changes status mid-scan can show up in two partitions).
+    Returns None when the partitions do not add up to the project's item count,
+    e.g. because an item moved between partitions mid-scan.
+    """
+    partitions = status_partitions(schema)
+    if len(partitions) < 2:
+        return None
+    total = run_query(ITEM_COUNT_QUERY, {"projectId": schema["project_id"]})["data"]["node"]["items"]["totalCount"]
+    with ThreadPoolExecutor(max_workers=min(workers, len(partitions))) as pool:
+        shards = list(pool.map(lambda query_filter: scan_items(schema, query_filter, checkpoints=checkpoints),
+                               partitions))
+    seen = set()
+    scanned = []
+    for shard in shards:
+        for item_id, item in shard:
+            if item_id not in seen:
+                seen.add(item_id)
+                scanned.append((item_id, item))
+    if len(seen) != total:
+        print(f"⚠️ Partitioned scan found {len(seen)} of {total} project items, falling back to a full scan")
+        return None
+    log(f"Partitioned scan: {len(partitions)} partitions, {total} items")
+    return scanned
+
+def fetch_project_items(schema, partition=SCAN_PARTITION, checkpoints=None):
+    """
+    All project items, normalized; drafts, pull requests and other non-issue content are skipped.
+    """
+    scanned = scan_partitioned(schema, checkpoints=checkpoints) if partition == "status" else None
+    if scanned is None:
+        scanned = scan_items(schema, checkpoints=checkpoints)
+    items = [item for _, item in scanned if item]
+    log(f"Fetched {len(items)} project items")
+    return items
+
+def fetch_project_item(item_id, schema):
+    """
+    One project item, normalized; None if it is gone or not an issue.
+    """
+    result = run_query(ITEM_QUERY, {"itemId": item_id})
+    item = result["data"]["node"]
+    if not item or (item.get("project") or {}).get("id") != schema["project_id"]:
+        return None
+    return normalize_item(item, schema)
+
+def find_release_epics(items, release_name):
+    epics = [
+        item
+        for item in items
+        if item["type"] == "Feature" and "Epic" in item["labels"]
+        and item["milestone"] and release_name in item["milestone"]
+    ]
+    log(f"Found {len(epics)} epics matching criteria")
+    return epics
+
+def fetch_subissues(parent, schema):
+    """
+    Direct sub-issues of an issue, normalized like project items; project fields come from
+    the sub-issue's item in this project. sub_issue_total tells whether it has children itself.
+    """
+    subissues = []
+    after = None
+    while True:
+        result = run_query(SUBISSUES_QUERY, {"issueId": parent["id"], "after": after})
+        node = result["data"]["node"] or {}
+        sub_issue_conn = (node.get("subIssues") or {})
+
+        for issue in sub_issue_conn.get("nodes", []):
+            if not issue.get("title"):
+                continue
+            project_items = issue.get("projectItems", {}).get("nodes", [])
+            project_item = next(
+                (pi for pi in project_items if (pi.get("project") or {}).get("id") == schema["project_id"]),
+                None
+            )
+            normalized = {
+                "item_id": None,
+                "id": issue.get("id"),
+                "title": issue["title"],
+                "url": issue["url"],
+                "type": (issue.get("issueType") or {}).get("name"),
+                "assignees": [u["login"] for u in (issue.get("assignees") or {}).get("nodes", [])],
+                "parent_name": parent["title"],
+                "parent_url": parent["url"],
+                "labels": [],
+                "milestone": "",
+                "sub_issue_total": (issue.get("subIssuesSummary") or {}).get("total", 0),
+            }
+            field_nodes = ((project_item or {}).get("fieldValues") or {}).get("nodes", [])
+            normalized.update(parse_field_values(field_nodes, schema))
+            subissues.append(normalized)
+
+        page_info = sub_issue_conn.get("pageInfo")
+        if not page_info or not page_info.get("hasNextPage"):
+            break
+        after = page_info.get("endCursor")
+    return subissues
@@ -0,0 +1,384 @@
+import io
+import os
+import re
+
+from issue_hierarchy import SUBISSUES_STAGE, descendants, rollup_hierarchy, root_of, walk
+from project_items import match_release_sprints, project_label
+from report_aggregate import to_columns, group_by, render_summary_table, format_number
+from report_delta import run_delta_stage
+from report_export import export_dataset, write_report
+from report_manifest import dataset_hash, record_output, unchanged_output
+from user_directory import display_name, determine_team
+
+def to_release_row(item, sprint=""):
+    return {
+        "assignee":    (item["assignees"] or ["Unassigned"])[0],
+        "issue_name":  item["title"],
+        "issue_url":   item["url"],
+        "type":        item["type"] or "Empty",
+        "priority":    item["priority"],
+        "status":      item["status"],
+        "sprint":      sprint,
+        "parent_name": item["parent_name"],
+        "parent_url":  item["parent_url"],
+        "epic_name":   item["parent_name"],
+        "estimate":    item["estimate"],
+        "time_spent":  item["time_spent"]
+    }
+
+def build_release_rows(items, sprint_id_to_title):
+    """
+    Issues planned into any sprint of the release.
+    """
+    issues = []
+    for item in items:
+        if not item["title"]:
+            continue
+        matched = [sid for sid in item["iteration_ids"] if sid in sprint_id_to_title]
+        if matched:
+            issues.append(to_release_row(item, sprint_id_to_title[matched[-1]]))
+    return issues
+
+def merge_issues_by_url(base_issues, extra_issues):
+    existing_urls = {i.get("issue_url") for i in base_issues}
+    for issue in extra_issues:
+        if issue.get("issue_url") not in existing_urls:
+            base_issues.append(issue)
+    return base_issues
+
+ROLLUPS = [
+    ("Epic Summary", ["epic_name"]),
+    ("Sprint Summary", ["sprint"]),
+    ("Team Summary", ["team"]),
+    ("Assignee Summary", ["assignee"]),
+    ("Status Summary", ["status"]),
+    ("Type / Priority Summary", ["type", "priority"]),
+]
+
+def hierarchy_rows(hierarchy):
+    """
+    One row per epic and per sub-issue that has sub-issues itself, in tree order,
+    with the rolled-up totals of its subtree.
+    """
+    rollups = rollup_hierarchy(hierarchy)
+    rows = []
+    for node_id, depth in walk(hierarchy):
+        if depth and not hierarchy["children"].get(node_id):
+            continue
+        node = hierarchy["nodes"][node_id]
+        rows.append(dict(rollups[node_id], issue_name=node["title"], issue_url=node["url"], depth=depth))
+    return rows
+
+def shard_hierarchy(hierarchy, rows):
+    """
+    The trees of hierarchy (rows of hierarchy_rows) whose epic owns at least one of rows,
+    with their release-wide totals.
+    """
+    epic_names = {row["epic_name"] for row in rows}
+    urls = {row["issue_url"] for row in rows}
+    shard_trees = []
+    keep = False
+    for tree_row in hierarchy:
+        if tree_row["depth"] == 0:
+            keep = tree_row["issue_name"] in epic_names or tree_row["issue_url"] in urls
+        if keep:
+            shard_trees.append(tree_row)
+    return shard_trees
+
+def render_hierarchy_table(rows):
+    with io.StringIO() as f:
+        f.write("""
+  <h2>Epic Hierarchy</h2>
+  <table class='summary-table'>
+    <thead>
+      <tr>
+        <th>Issue</th>
+        <th>Issues</th>
+        <th>Estimate, md</th>
+        <th>Time Spent, md</th>
+        <th>Status</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+        for row in rows:
+            indent = row["depth"] * 24
+            statuses = ", ".join(f"{status}: {count}" for status, count in sorted(row["status_counts"].items()))
+            f.write(
+                f"<tr>"
+                f"<td style='padding-left: {indent + 16}px'><a href='{row['issue_url']}' target='_blank'>"
+                f"{row['issue_name']}</a></td>"
+                f"<td class='numeric'>{row['issues']}</td>"
+                f"<td class='numeric'>{format_number(row['estimate'])}</td>"
+                f"<td class='numeric'>{format_number(row['time_spent'])}</td>"
+                f"<td>{statuses}</td>"
+                f"</tr>\n"
+            )
+        f.write("""
+    </tbody>
+  </table>
+""")
+        return f.getvalue()
+
+def render_release_report(data, release_name, now, hierarchy=(), partial_banner=""):
+    timestamp_display = now.strftime("%Y.%m.%d %H:%M:%S")
+    show_project = len({issue.get("project") for issue in data}) > 1
+    project_header = "\n        <th>Project</th>" if show_project else ""
+
+    with io.StringIO() as f:
+        f.write(f"""
+<html>
+<head>
+  <meta charset='utf-8'>
+  <title>GitHub Release Report - {release_name} - {timestamp_display}</title>
+  <style>
+    body {{ font-family: sans-serif; }}
+    table {{ border-collapse: collapse; width: 100%; }}
+    th, td {{ border: 1px solid #ccc; padding: 4px; text-align: left; }}
+    th {{ background-color: #f2f2f2; cursor: pointer; }}
+    tr:hover {{ background-color: #f1f1f1; }}
+    .numeric {{ text-align: right; }}
+    h2 {{ margin-top: 40px; }}
+    .summary-table {{ width: auto; }}
+    .summary-table td, .summary-table th {{ padding: 6px 16px; }}
+  </style>
+  <script src='https://cdnjs.cloudflare.com/ajax/libs/tablesort/5.2.1/tablesort.min.js'></script>
+</head>
+<body>
+  <h1>Release Report - {release_name} - {timestamp_display}</h1>{partial_banner}
+  <table id='reportTable'>
+    <thead>
+      <tr>
+        <th>Assignee</th>
+        <th>Name</th>
+        <th>Issue URL</th>
+        <th>Type</th>
+        <th>Priority</th>
+        <th>Status</th>
+        <th>Estimate, md</th>
+        <th>Time Spent, md</th>
+        <th>Sprint Name</th>
+        <th>Parent Name</th>
+        <th>Parent URL</th>{project_header}
+      </tr>
+    </thead>
+    <tbody>
+""")
+        for issue in data:
+            issue_link = f"<a href='{issue['issue_url']}' target='_blank'>{issue['issue_url']}</a>"
+            parent_link = f"<a href='{issue['parent_url']}' target='_blank'>{issue['parent_url']}</a>" if issue['parent_url'] else ""
+            f.write(
+                f"<tr>"
+                f"<td>{issue['assignee']}</td>"
+                f"<td>{issue['issue_name']}</td>"
+                f"<td>{issue_link}</td>"
+                f"<td>{issue['type']}</td>"
+                f"<td>{issue['priority']}</td>"
+                f"<td>{issue['status']}</td>"
+                f"<td class='numeric'>{issue['estimate']}</td>"
+                f"<td class='numeric'>{issue['time_spent']}</td>"
+                f"<td>{issue['sprint']}</td>"
+                f"<td>{issue['parent_name']}</td>"
+                f"<td>{parent_link}</td>"
+                + (f"<td>{issue['project']}</td>" if show_project else "")
+                + "</tr>\n"
+            )
+        f.write("""
+    </tbody>
+  </table>
+""")
+        columns = to_columns(data)
+        for title, keys in ROLLUPS:
+            f.write(render_summary_table(title, group_by(columns, keys), keys))
+        if hierarchy:
+            f.write(render_hierarchy_table(hierarchy))
+        f.write("""
+  <script>
+    document.querySelectorAll('table').forEach(function(table) { new Tablesort(table); });
+  </script>
+</body>
+</html>
+""")
+        return f.getvalue()
+
+# --shard-by: row field -> column title of the landing page
+SHARD_FIELDS = {"team": "Team", "assignee": "Assignee"}
+
+def shard_rows(data, field):
+    """
+    Rows grouped by the shard field, groups in name order: [(value, file suffix, rows)].
+    """
+    groups = {}
+    for issue in data:
+        groups.setdefault(issue.get(field) or "Empty", []).append(issue)
+    shards = []
+    used = set()
+    # Next number to try per slug, so values with the same slug get slug-2, slug-3, ...
+    counters = {}
+    for value in sorted(groups):
+        slug = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "empty"
+        suffix = slug
+        while suffix in used:
+            counters[slug] = counters.get(slug, 1) + 1
+            suffix = f"{slug}-{counters[slug]}"
+        used.add(suffix)
+        shards.append((value, suffix, groups[value]))
+    return shards
+
+def render_release_landing(data, release_name, now, field, shard_links, hierarchy=(), partial_banner=""):
+    """
+    Entry page of a sharded release report: totals per shard and the summaries only.
+    A shard is loaded into the frame below the table when its link is clicked.
+    """
+    timestamp_display = now.strftime("%Y.%m.%d %H:%M:%S")
+    with io.StringIO() as f:
+        f.write(f"""
+<html>
+<head>
+  <meta charset='utf-8'>
+  <title>GitHub Release Report - {release_name} - {timestamp_display}</title>
+  <style>
+    body {{ font-family: sans-serif; }}
+    table {{ border-collapse: collapse; width: 100%; }}
+    th, td {{ border: 1px solid #ccc; padding: 4px; text-align: left; }}
+    th {{ background-color: #f2f2f2; cursor: pointer; }}
+    tr:hover {{ background-color: #f1f1f1; }}
+    .numeric {{ text-align: right; }}
+    h2 {{ margin-top: 40px; }}
+    .summary-table {{ width: auto; }}
+    .summary-table td, .summary-table th {{ padding: 6px 16px; }}
+    iframe {{ width: 100%; height: 80vh; border: 1px solid #ccc; margin-top: 20px; }}
+  </style>
+  <script src='https://cdnjs.cloudflare.com/ajax/libs/tablesort/5.2.1/tablesort.min.js'></script>
+</head>
+<body>
+  <h1>Release Report - {release_name} - {timestamp_display}</h1>{partial_banner}
+  <h2>{SHARD_FIELDS[field]} Reports</h2>
+  <table class='summary-table'>
+    <thead>
+      <tr>
+        <th>{SHARD_FIELDS[field]}</th>
+        <th>Issues</th>
+        <th>Estimate, md</th>
+        <th>Time Spent, md</th>
+        <th>Status</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+        columns = to_columns(data)
+        totals = {row[field] or "Empty": row for row in group_by(columns, [field])}
+        statuses = {}
+        for row in sorted(group_by(columns, [field, "status"]), key=lambda r: r["status"]):
+            statuses.setdefault(row[field] or "Empty", []).append(f"{row['status'] or 'Empty'}: {row['count']}")
+        for value, link in shard_links:
+            total = totals[value]
+            f.write(
+                f"<tr>"
+                f"<td><a href='{link}' target='shard'>{value}</a></td>"
+                f"<td class='numeric'>{total['count']}</td>"
+                f"<td class='numeric'>{format_number(total.get('estimate_sum'))}</td>"
+                f"<td class='numeric'>{format_number(total.get('time_spent_sum'))}</td>"
+                f"<td>{', '.join(statuses[value])}</td>"
+                f"</tr>\n"
+            )
+        f.write("""
+    </tbody>
+  </table>
+  <iframe name='shard' title='Selected report'></iframe>
+""")
+        for title, keys in ROLLUPS:
+            f.write(render_summary_table(title, group_by(columns, keys), keys))
+        if hierarchy:
+            f.write(render_hierarchy_table(hierarchy))
+        f.write("""
+  <script>
+    document.querySelectorAll('table').forEach(function(table) { new Tablesort(table); });
+  </script>
+</body>
+</html>
+""")
+        return f.getvalue()
+
+def write_sharded_release_report(filename, data, release_name, now, field, hierarchy=(), partial_banner=""):
+    """
+    Write one full report per shard next to filename (<name>__<shard>.html) and the landing page
+    to filename itself. Returns the written shard files.
+    """
+    base = os.path.splitext(filename)[0]
+    shard_links = []
+    written = []
+    for value, suffix, rows in shard_rows(data, field):
+        shard_file = f"{base}__{suffix}.html"
+        write_report(shard_file, render_release_report(rows, f"{release_name} - {value}", now,
+                                                       shard_hierarchy(hierarchy, rows), partial_banner))
+        shard_links.append((value, os.path.basename(shard_file)))
+        written.append(shard_file)
+    write_report(filename, render_release_landing(data, release_name, now, field, shard_links,
+                                                  hierarchy, partial_banner))
+    return written
+
+def collect_release_rows(run, project_url, release_name):
+    matched_sprints = match_release_sprints(run.schema(project_url), release_name)
+    if not matched_sprints:
+        return [], [], False
+    data = build_release_rows(run.items(project_url), matched_sprints)
+    # Sub-issues of the release epics at any depth, each attributed to its epic
+    hierarchy = run.hierarchy(project_url, release_name)
+    data = merge_issues_by_url(data, [to_release_row(item) for item, _ in descendants(hierarchy)])
+    epic_by_url = {node["url"]: hierarchy["nodes"][root_of(hierarchy, node_id)]["title"]
+                   for node_id, node in hierarchy["nodes"].items()}
+    for issue in data:
+        issue["epic_name"] = epic_by_url.get(issue["issue_url"], issue["epic_name"])
+        issue["project"] = project_label(project_url)
+    return data, hierarchy_rows(hierarchy), True
+
+def collect_release_report(run, release_name):
+    # Every project is fetched in its own worker, results are merged into one report
+    results = run.for_each(run.project_urls, lambda url: collect_release_rows(run, url, release_name))
+    if not any(matched for _, _, matched in results):
+        raise Exception("Matching sprints not found or sprint field missing")
+    data = []
+    hierarchy = []
+    for rows, tree_rows, _ in results:
+        data = merge_issues_by_url(data, rows)
+        hierarchy.extend(tree_rows)
+    users = run.users({issue["assignee"] for issue in data})
+    for issue in data:
+        issue["team"] = determine_team(issue["issue_name"], issue["assignee"], users)
+        issue["assignee"] = display_name(users, issue["assignee"])
+    return data, hierarchy
+
+def build_release_report(run, release_name):
+    data, hierarchy = collect_release_report(run, release_name)
+    return data, render_release_report(data, release_name, run.now, hierarchy,
+                                       run.budget.banner_html((SUBISSUES_STAGE,)))
+
+def run_release_report(run, release_name, options):
+    data, hierarchy = collect_release_report(run, release_name)
+    digest = dataset_hash(data + hierarchy)
+    shard_by = getattr(options, "shard_by", None)
+    manifest_key = f"release_{release_name}" + (f"_by_{shard_by}" if shard_by else "")
+    previous = unchanged_output(options.manifest, manifest_key, digest)
+    if previous:
+        print(f"Release {release_name} data unchanged since {previous}, report not regenerated")
+        return None
+
+    filename = f"report_release_{release_name}_{run.now.strftime('%Y%m%d_%H%M%S')}.html"
+    partial_banner = run.budget.banner_html((SUBISSUES_STAGE,))
+    if shard_by:
+        shards = write_sharded_release_report(filename, data, release_name, run.now, shard_by, hierarchy,
+                                              partial_banner)
+        print(f"Report written to {filename} with {len(shards)} {shard_by} shard(s)")
+    else:
+        write_report(filename, render_release_report(data, release_name, run.now, hierarchy, partial_banner))
+        print(f"Report written to {filename}")
+    export_dataset(data, os.path.splitext(filename)[0], options.export)
+    if options.delta_dir:
+        run_delta_stage(options.delta_dir, f"release_{release_name}", f"Release Report - {release_name}", data,
+                        key_fields=("issue_url",),
+                        tracked_fields=("issue_name", "assignee", "type", "priority", "status", "estimate",
+                                        "time_spent", "sprint", "parent_name"),
+                        label_field="issue_name", url_field="issue_url")
+    record_output(options.manifest, manifest_key, digest, filename)
+    return filename
@@ -0,0 +1,139 @@
+import numpy as np
+
+DIMENSIONS = ("team", "assignee", "status", "priority", "type", "sprint", "parent_name", "epic_name")
+MEASURES = ("estimate", "time_spent")
+STATS = ("sum", "count", "min", "max")
+
+
+def to_columns(rows, dimensions=DIMENSIONS, measures=MEASURES):
+    """
+    Turn a list of issue dicts into columns: dimensions become object arrays of strings,
+    measures become float arrays where an empty value ("" or None) is NaN.
+    Dimensions missing from the rows are skipped.
+    """
+    columns = {}
+    present = set()
+    for row in rows:
+        present.update(row.keys())
+    for dim in dimensions:
+        if dim in present:
+            columns[dim] = np.array([str(row.get(dim) or "") for row in rows], dtype=object)
+    for measure in measures:
+        if measure in present:
+            columns[measure] = np.array(
+                [np.nan if row.get(measure) in (None, "") else float(row[measure]) for row in rows],
+                dtype=float
+            )
+    return columns
+
+
+def group_by(columns, keys, measures=MEASURES):
+    """
+    Aggregate measures over any combination of dimension columns.
+    Each key column is factorized once, the codes are combined into a single group id and
+    all statistics are computed with one sort and reduceat/bincount passes, no per-row loop.
+    Returns a list of dicts: the key values, "count" (rows) and <measure>_<stat> for every STATS entry.
+    Empty measure values are ignored by sum/min/max and not counted in <measure>_count.
+    """
+    keys = list(keys)
+    measures = [m for m in measures if m in columns]
+    size = len(next(iter(columns.values()))) if columns else 0
+    if size == 0:
+        return []
+
+    uniques = []
+    codes = []
+    for key in keys:
+        values, inverse = np.unique(columns[key], return_inverse=True)
+        uniques.append(values)
+        codes.append(inverse.ravel())
+    if keys:
+        combined = np.ravel_multi_index(codes, [len(u) for u in uniques])
+    else:
+        combined = np.zeros(size, dtype=np.int64)
+    group_ids, group_index = np.unique(combined, return_inverse=True)
+    group_index = group_index.ravel()
+    group_count = len(group_ids)
+
+    order = np.argsort(group_index, kind="stable")
+    starts = np.searchsorted(group_index[order], np.arange(group_count))
+    result = {"count": np.bincount(group_index, minlength=group_count)}
+    for measure in measures:
+        values = columns[measure]
+        filled = ~np.isnan(values)
+        sums = np.bincount(group_index, weights=np.where(filled, values, 0.0), minlength=group_count)
+        result[f"{measure}_sum"] = sums
+        result[f"{measure}_count"] = np.bincount(group_index, weights=filled, minlength=group_count).astype(int)
+        with np.errstate(invalid="ignore"):
+            result[f"{measure}_min"] = np.fmin.reduceat(values[order], starts)
+            result[f"{measure}_max"] = np.fmax.reduceat(values[order], starts)
+
+    key_codes = np.unravel_index(group_ids, [len(u) for u in uniques]) if keys else []
+    summary = []
+    for g in range(group_count):
+        row = {key: uniques[i][key_codes[i][g]] for i, key in enumerate(keys)}
+        row["count"] = int(result["count"][g])
+        for measure in measures:
+            for stat in STATS:
+                value = result[f"{measure}_{stat}"][g]
+                row[f"{measure}_{stat}"] = None if np.isnan(value) else value.item()
+        summary.append(row)
+    return summary
+
+
+def format_number(value):
+    if value is None:
+        return ""
+    return str(int(value)) if value == int(value) else f"{value:.1f}"
+
+
+def group_by_totals(summary, measures=MEASURES):
+    """
+    Combine already aggregated groups into a single total row.
+    """
+    total = {"count": sum(r["count"] for r in summary)}
+    for measure in measures:
+        sums = [r[f"{measure}_sum"] for r in summary if r.get(f"{measure}_sum") is not None]
+        mins = [r[f"{measure}_min"] for r in summary if r.get(f"{measure}_min") is not None]
+        maxs = [r[f"{measure}_max"] for r in summary if r.get(f"{measure}_max") is not None]
+        total[f"{measure}_sum"] = sum(sums) if sums else None
+        total[f"{measure}_count"] = sum(r.get(f"{measure}_count", 0) for r in summary)
+        total[f"{measure}_min"] = min(mins) if mins else None
+        total[f"{measure}_max"] = max(maxs) if maxs else None
+    return total
+
+
+def render_summary_table(title, summary, keys, measures=MEASURES, table_id=None):
+    """
+    Render a group_by result as an HTML summary table with a total row.
+    """
+    measures = [m for m in measures if summary and f"{m}_sum" in summary[0]]
+    headers = [k.replace("_", " ").capitalize() for k in keys] + ["Items"]
+    for measure in measures:
+        label = measure.replace("_", " ").capitalize()
+        headers += [f"{label} sum", f"{label} count", f"{label} min", f"{label} max"]
+
+    id_attr = f" id='{table_id}'" if table_id else ""
+    lines = [
+        f"  <h2>{title}</h2>",
+        f"  <table class='summary-table'{id_attr}>",
+        "    <thead>",
+        "      <tr>" + "".join(f"<th>{h}</th>" for h in headers) + "</tr>",
+        "    </thead>",
+        "    <tbody>",
+    ]
+    for row in sorted(summary, key=lambda r: tuple(r[k] for k in keys)):
+        cells = [f"<td>{row[k] or 'Empty'}</td>" for k in keys]
+        cells.append(f"<td class='numeric'>{row['count']}</td>")
+        for measure in measures:
+            cells += [f"<td class='numeric'>{format_number(row[f'{measure}_{stat}'])}</td>" for stat in STATS]
+        lines.append("      <tr>" + "".join(cells) + "</tr>")
+
+    total = group_by_totals(summary, measures)
+    cells = [f"<td>{'Total' if i == 0 else ''}</td>" for i in range(len(keys))]
+    cells.append(f"<td class='numeric'>{total['count']}</td>")
+    for measure in measures:
+        cells += [f"<td class='numeric'>{format_number(total[f'{measure}_{stat}'])}</td>" for stat in STATS]
+    lines.append("      <tr style='font-weight:bold;'>" + "".join(cells) + "</tr>")
+    lines += ["    </tbody>", "  </table>", ""]
+    return "\n".join(lines)
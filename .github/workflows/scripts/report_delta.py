@@ -0,0 +1,154 @@
+import datetime
+import hashlib
+import html
+import json
+import os
+
+
+def row_key(row, key_fields):
+    return "|".join(str(row.get(k) or "") for k in key_fields)
+
+
+def row_hash(row, fields):
+    """
+    Stable content hash of the tracked fields of a row.
+    """
+    payload = json.dumps([row.get(f) for f in fields], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _plain(value):
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def state_path(state_dir, name):
+    return os.path.join(state_dir, f"{name}.jsonl")
+
+
+def load_dataset(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_dataset(path, rows):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps({k: _plain(v) for k, v in row.items()}, ensure_ascii=False, default=str))
+            f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def diff_datasets(previous, current, key_fields, tracked_fields):
+    """
+    Compare two datasets keyed by key_fields (usually the issue/PR URL).
+    Rows are first compared by a hash of tracked_fields, field-level changes are only
+    computed for rows whose hash differs.
+    Returns {"added": [...], "removed": [...], "changed": [{"row": ..., "changes": [(field, before, after)]}]}.
+    """
+    current = [{k: _plain(v) for k, v in row.items()} for row in current]
+    prev_by_key = {row_key(r, key_fields): r for r in previous}
+    curr_by_key = {row_key(r, key_fields): r for r in current}
+    prev_hashes = {k: row_hash(r, tracked_fields) for k, r in prev_by_key.items()}
+
+    added = [r for k, r in curr_by_key.items() if k not in prev_by_key]
+    removed = [r for k, r in prev_by_key.items() if k not in curr_by_key]
+    changed = []
+    for key, row in curr_by_key.items():
+        if key not in prev_hashes or prev_hashes[key] == row_hash(row, tracked_fields):
+            continue
+        before_row = prev_by_key[key]
+        changes = [
+            (field, before_row.get(field), row.get(field))
+            for field in tracked_fields
+            if before_row.get(field) != row.get(field)
+        ]
+        changed.append({"row": row, "changes": changes})
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def _format_value(value):
+    if value in (None, ""):
+        return "<i>empty</i>"
+    if isinstance(value, list):
+        return "<br/>".join(html.escape(" ".join(map(str, v)) if isinstance(v, list) else str(v)) for v in value)
+    return html.escape(str(value))
+
+
+def _format_change(before, after):
+    if isinstance(before, list) and isinstance(after, list):
+        before_items = [json.dumps(v, sort_keys=True) for v in before]
+        after_items = [json.dumps(v, sort_keys=True) for v in after]
+        lines = [f"+ {_format_value([v])}" for v, s in zip(after, after_items) if s not in before_items]
+        lines += [f"&minus; {_format_value([v])}" for v, s in zip(before, before_items) if s not in after_items]
+        return "<br/>".join(lines)
+    return f"{_format_value(before)} &rarr; {_format_value(after)}"
+
+
+def generate_delta_report(name, title, delta, label_field, url_field):
+    """
+    Write a small HTML page with only what changed since the previous run.
+    """
+    timestamp_display = datetime.datetime.now().strftime("%Y.%m.%d %H:%M:%S")
+    timestamp_filename = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"report_delta_{name}_{timestamp_filename}.html"
+
+    def link(row):
+        label = html.escape(str(row.get(label_field) or row.get(url_field) or ""))
+        return f"<a href='{row.get(url_field, '')}' target='_blank'>{label}</a>"
+
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(f"""
+<html>
+<head>
+  <meta charset='utf-8'>
+  <title>{title} - changes - {timestamp_display}</title>
+  <style>
+    body {{ font-family: sans-serif; }}
+    table {{ border-collapse: collapse; width: 100%; }}
+    th, td {{ border: 1px solid #ccc; padding: 4px; text-align: left; vertical-align: top; }}
+    th {{ background-color: #f2f2f2; }}
+    h2 {{ margin-top: 40px; }}
+  </style>
+</head>
+<body>
+  <h1>{title} - changes since previous run - {timestamp_display}</h1>
+  <p>{len(delta["changed"])} changed, {len(delta["added"])} added, {len(delta["removed"])} removed</p>
+""")
+        f.write("  <h2>Changed</h2>\n  <table>\n    <tr><th>Item</th><th>Field</th><th>Change</th></tr>\n")
+        for entry in delta["changed"]:
+            changes = entry["changes"]
+            for i, (field, before, after) in enumerate(changes):
+                item_cell = f"<td rowspan='{len(changes)}'>{link(entry['row'])}</td>" if i == 0 else ""
+                f.write(f"    <tr>{item_cell}<td>{field}</td><td>{_format_change(before, after)}</td></tr>\n")
+        f.write("  </table>\n")
+        for section in ("added", "removed"):
+            f.write(f"  <h2>{section.capitalize()}</h2>\n  <ul>\n")
+            for row in delta[section]:
+                f.write(f"    <li>{link(row)}</li>\n")
+            f.write("  </ul>\n")
+        f.write("</body>\n</html>\n")
+    print(f"Delta report written to {filename}")
+    return filename
+
+
+def run_delta_stage(state_dir, name, title, rows, key_fields, tracked_fields, label_field, url_field):
+    """
+    Diff rows against the dataset stored by the previous run, write the delta report
+    and store rows as the new baseline. Returns the delta, or None on the first run.
+    """
+    path = state_path(state_dir, name)
+    previous = load_dataset(path)
+    delta = None
+    if previous is None:
+        print(f"No previous dataset at {path}, delta report skipped")
+    else:
+        delta = diff_datasets(previous, rows, key_fields, tracked_fields)
+        generate_delta_report(name, title, delta, label_field, url_field)
+    save_dataset(path, rows)
+    return delta
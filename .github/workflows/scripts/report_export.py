@@ -0,0 +1,107 @@
+import argparse
+import csv
+import json
+import numbers
+
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+
+
+def write_report(filename, content):
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def parse_export_formats(value):
+    """
+    Parse a comma-separated list of export formats (e.g. "jsonl,csv").
+    Used as an argparse type.
+    """
+    formats = [v.strip().lower() for v in value.split(",") if v.strip()]
+    unknown = [v for v in formats if v not in EXPORT_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"Unknown export format(s): {', '.join(unknown)}; expected {', '.join(EXPORT_FORMATS)}"
+        )
+    return formats
+
+
+def _plain(value):
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def normalize_rows(rows):
+    """
+    Make rows safe for typed formats: tuples become lists and columns that only hold
+    numbers (plus "" placeholders used by the HTML reports) get None instead of "".
+    """
+    rows = [{k: _plain(v) for k, v in row.items()} for row in rows]
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    for col in columns:
+        values = [row.get(col) for row in rows]
+        filled = [v for v in values if v not in (None, "")]
+        if filled and all(isinstance(v, numbers.Number) and not isinstance(v, bool) for v in filled):
+            for row in rows:
+                if row.get(col) == "":
+                    row[col] = None
+    return rows, columns
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return "; ".join(json.dumps(v, ensure_ascii=False) if isinstance(v, list) else str(v) for v in value)
+    return value
+
+
+def write_jsonl(rows, filename):
+    with open(filename, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write("\n")
+
+
+def write_csv(rows, columns, filename):
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: _csv_value(v) for k, v in row.items()})
+
+
+def write_parquet(rows, columns, filename):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Parquet export requires pyarrow (pip install pyarrow)")
+    table = pa.Table.from_pylist(rows) if rows else pa.table({c: [] for c in columns})
+    pq.write_table(table, filename)
+
+
+def export_dataset(rows, basename, formats):
+    """
+    Write the already-fetched rows to <basename>.<format> for every requested format.
+    Returns the list of written file names.
+    """
+    if not formats:
+        return []
+    rows, columns = normalize_rows(rows)
+    written = []
+    for fmt in formats:
+        filename = f"{basename}.{fmt}"
+        if fmt == "jsonl":
+            write_jsonl(rows, filename)
+        elif fmt == "csv":
+            write_csv(rows, columns, filename)
+        elif fmt == "parquet":
+            write_parquet(rows, columns, filename)
+        print(f"Data exported to {filename}")
+        written.append(filename)
+    return written
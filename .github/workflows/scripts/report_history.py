@@ -0,0 +1,189 @@
+import datetime
+import os
+import re
+
+import numpy as np
+
+HISTORY_DIR = "report-history"
+SNAPSHOT_COLUMNS = ("url", "name", "assignee", "team", "type", "priority", "status", "sprint")
+SNAPSHOT_MEASURES = ("estimate", "time_spent")
+DONE_STATUSES = ("Done",)
+DAILY_RETENTION_DAYS = 60
+WEEKLY_RETENTION_DAYS = 365
+
+SNAPSHOT_FILE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.npz$")
+
+
+def _report_dir(store_dir, report):
+    return os.path.join(store_dir, report)
+
+
+def list_snapshots(store_dir, report):
+    """
+    Return (date, path) pairs for all snapshots of a report, oldest first.
+    """
+    path = _report_dir(store_dir, report)
+    if not os.path.isdir(path):
+        return []
+    snapshots = []
+    for name in os.listdir(path):
+        match = SNAPSHOT_FILE_RE.match(name)
+        if match:
+            day = datetime.date.fromisoformat(match.group(1))
+            snapshots.append((day, os.path.join(path, name)))
+    return sorted(snapshots)
+
+
+def append_snapshot(store_dir, report, rows, day=None):
+    """
+    Store today's normalized items as one compressed columnar file <store>/<report>/<YYYY-MM-DD>.npz.
+    Items are de-duplicated by URL (reports list multi-assignee issues once per assignee),
+    a rerun on the same day replaces that day's snapshot.
+    """
+    day = day or datetime.date.today()
+    unique = {}
+    for row in rows:
+        unique.setdefault(row.get("url") or row.get("issue_url"), row)
+    items = [dict(row, url=url) for url, row in unique.items() if url]
+
+    columns = {}
+    for col in SNAPSHOT_COLUMNS:
+        columns[col] = np.array([str(row.get(col) or row.get(f"issue_{col}") or "") for row in items], dtype=str)
+    for measure in SNAPSHOT_MEASURES:
+        columns[measure] = np.array(
+            [np.nan if row.get(measure) in (None, "") else float(row[measure]) for row in items],
+            dtype=float
+        )
+
+    path = _report_dir(store_dir, report)
+    os.makedirs(path, exist_ok=True)
+    filename = os.path.join(path, f"{day.isoformat()}.npz")
+    tmp_filename = filename + ".tmp.npz"
+    np.savez_compressed(tmp_filename, **columns)
+    os.replace(tmp_filename, filename)
+    print(f"History snapshot written to {filename} ({len(items)} items)")
+    return filename
+
+
+def compact_history(store_dir, report, daily_days=DAILY_RETENTION_DAYS, weekly_days=WEEKLY_RETENTION_DAYS, today=None):
+    """
+    Retention-based compaction: keep every snapshot for daily_days, then only the last snapshot
+    of each ISO week up to weekly_days, and drop anything older.
+    Returns the list of removed files.
+    """
+    today = today or datetime.date.today()
+    removed = []
+    kept_weeks = set()
+    for day, path in reversed(list_snapshots(store_dir, report)):
+        age = (today - day).days
+        if age <= daily_days:
+            continue
+        week = day.isocalendar()[:2]
+        if age <= weekly_days and week not in kept_weeks:
+            kept_weeks.add(week)
+            continue
+        os.remove(path)
+        removed.append(path)
+    if removed:
+        print(f"History compaction removed {len(removed)} snapshot(s) of '{report}'")
+    return removed
+
+
+def load_history(store_dir, report):
+    """
+    Load all snapshots into one set of columns with an extra "day" (datetime64[D]) column.
+    """
+    snapshots = list_snapshots(store_dir, report)
+    parts = {col: [] for col in SNAPSHOT_COLUMNS + SNAPSHOT_MEASURES + ("day",)}
+    for day, path in snapshots:
+        with np.load(path) as snap:
+            size = len(snap["url"])
+            for col in SNAPSHOT_COLUMNS + SNAPSHOT_MEASURES:
+                if col in snap:
+                    parts[col].append(snap[col])
+                elif col in SNAPSHOT_MEASURES:
+                    parts[col].append(np.full(size, np.nan))
+                else:
+                    parts[col].append(np.full(size, "", dtype=str))
+            parts["day"].append(np.full(size, np.datetime64(day, "D")))
+    if not snapshots:
+        return {col: np.array([]) for col in parts}
+    return {col: np.concatenate(values) for col, values in parts.items()}
+
+
+def sprint_progress(history, sprint=None):
+    """
+    Burndown, scope creep and velocity computed from the stored columns, no API calls.
+
+    burndown: per snapshot day of the sprint - items, scope (estimate sum), done and remaining estimate,
+              items/estimate added after the sprint's first snapshot.
+    velocity: per sprint - done estimate and items as of the last snapshot of that sprint.
+    """
+    if len(history["url"]) == 0:
+        return {"sprint": sprint, "burndown": [], "velocity": []}
+
+    estimate = np.nan_to_num(history["estimate"])
+    done = np.isin(history["status"], DONE_STATUSES)
+    sprints, sprint_code = np.unique(history["sprint"], return_inverse=True)
+    days, day_code = np.unique(history["day"], return_inverse=True)
+    sprint_code = sprint_code.ravel()
+    day_code = day_code.ravel()
+
+    # Velocity: done work at the last snapshot of each sprint
+    last_day = np.full(len(sprints), -1)
+    np.maximum.at(last_day, sprint_code, day_code)
+    at_end = day_code == last_day[sprint_code]
+    velocity_done = np.bincount(sprint_code, weights=estimate * (at_end & done), minlength=len(sprints))
+    velocity_items = np.bincount(sprint_code, weights=at_end & done, minlength=len(sprints))
+    velocity_scope = np.bincount(sprint_code, weights=estimate * at_end, minlength=len(sprints))
+    last_dates = days[last_day]
+
+    if sprint is None:
+        sprint = sprints[np.argmax(last_day)]
+    velocity = [
+        {
+            "sprint": str(sprints[i]),
+            "last_snapshot": str(last_dates[i]),
+            "scope": float(velocity_scope[i]),
+            "done": float(velocity_done[i]),
+            "done_items": int(velocity_items[i]),
+        }
+        for i in np.argsort(last_dates, kind="stable")
+    ]
+
+    # Burndown and scope creep of the selected sprint
+    in_sprint = history["sprint"] == sprint
+    sel_day = day_code[in_sprint]
+    sel_estimate = estimate[in_sprint]
+    sel_done = done[in_sprint]
+    sel_url = history["url"][in_sprint]
+    if len(sel_day) == 0:
+        return {"sprint": sprint, "burndown": [], "velocity": velocity}
+
+    first_day = sel_day.min()
+    urls, url_code = np.unique(sel_url, return_inverse=True)
+    url_code = url_code.ravel()
+    first_seen = np.full(len(urls), len(days))
+    np.minimum.at(first_seen, url_code, sel_day)
+    added = first_seen[url_code] > first_day
+
+    n = len(days)
+    items = np.bincount(sel_day, minlength=n)
+    scope = np.bincount(sel_day, weights=sel_estimate, minlength=n)
+    done_estimate = np.bincount(sel_day, weights=sel_estimate * sel_done, minlength=n)
+    added_items = np.bincount(sel_day, weights=added, minlength=n)
+    added_estimate = np.bincount(sel_day, weights=sel_estimate * added, minlength=n)
+
+    burndown = [
+        {
+            "day": str(days[d]),
+            "items": int(items[d]),
+            "scope": float(scope[d]),
+            "done": float(done_estimate[d]),
+            "remaining": float(scope[d] - done_estimate[d]),
+            "added_items": int(added_items[d]),
+            "added_estimate": float(added_estimate[d]),
+        }
+        for d in np.unique(sel_day)
+    ]
+    return {"sprint": str(sprint), "burndown": burndown, "velocity": velocity}
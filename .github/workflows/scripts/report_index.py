@@ -0,0 +1,294 @@
+import datetime
+import json
+import os
+import re
+from urllib.parse import quote
+
+import numpy as np
+from jinja2 import Template
+
+from report_delta import load_dataset
+from report_export import write_report
+from report_history import list_snapshots
+
+INDEX_FILE = "index.html"
+SHARD_DIR = "search-index"
+# report_<name>_<YYYYmmdd_HHMMSS>.html, as written by every report of reports_cli
+REPORT_FILE_RE = re.compile(r"^report_(?P<name>.+)_(?P<stamp>\d{8}_\d{6})\.html$")
+TOKEN_RE = re.compile(r"\w+")
+
+
+def find_reports(reports_dir):
+    """
+    Stored report files, newest first: {"file", "name", "day", "dataset"}; dataset is the
+    path of the report's jsonl export if it was exported.
+    """
+    reports = []
+    for name in os.listdir(reports_dir) if os.path.isdir(reports_dir) else []:
+        match = REPORT_FILE_RE.match(name)
+        if not match:
+            continue
+        path = os.path.join(reports_dir, name)
+        dataset = os.path.splitext(path)[0] + ".jsonl"
+        reports.append({
+            "file": path,
+            "name": match.group("name"),
+            "day": datetime.datetime.strptime(match.group("stamp"), "%Y%m%d_%H%M%S").date(),
+            "dataset": dataset if os.path.exists(dataset) else None,
+        })
+    return sorted(reports, key=lambda report: (report["day"], report["file"]), reverse=True)
+
+
+def row_entry(row):
+    """
+    (url, title, people, status) of a report or snapshot row, whatever report it comes from.
+    """
+    url = row.get("url") or row.get("html_url") or row.get("issue_url") or ""
+    title = row.get("title") or row.get("name") or row.get("issue_name") or ""
+    people = [p for p in (row.get("assignee"), row.get("user")) if p and p not in ("Empty", "Unassigned")]
+    return url, str(title), ", ".join(dict.fromkeys(people)), str(row.get("status") or "")
+
+
+def history_rows(history_dir):
+    """
+    (day, row) pairs of every stored snapshot of every report in the history store.
+    """
+    if not history_dir or not os.path.isdir(history_dir):
+        return
+    for report in sorted(os.listdir(history_dir)):
+        for day, path in list_snapshots(history_dir, report):
+            with np.load(path) as snap:
+                columns = {col: snap[col] for col in snap.files}
+            for i in range(len(columns.get("url", []))):
+                yield day, {col: values[i].item() for col, values in columns.items()}
+
+
+def collect_documents(reports, history_dir):
+    """
+    Search documents grouped by month. A document is one state of one issue or PR
+    (url, title, people, status) with the first and last day it was seen that month
+    and the newest report it appears in, so consecutive days in the same state collapse into one.
+    """
+    months = {}
+
+    def add(day, row, report_file=""):
+        url, title, people, status = row_entry(row)
+        if not url and not title:
+            return
+        docs = months.setdefault(day.strftime("%Y-%m"), {})
+        doc = docs.get((url, title, people, status))
+        if doc is None:
+            docs[(url, title, people, status)] = doc = {"first": day, "last": day, "report": report_file}
+        doc["first"] = min(doc["first"], day)
+        if day >= doc["last"]:
+            doc["last"] = day
+            doc["report"] = report_file or doc["report"]
+
+    for day, row in history_rows(history_dir):
+        add(day, row)
+    for report in reports:
+        for row in load_dataset(report["dataset"]) if report["dataset"] else []:
+            add(report["day"], row, report["file"])
+    return months
+
+
+def build_shard(month, docs, output_dir):
+    """
+    One month of the index: the documents as compact arrays plus an inverted index
+    from every lower-cased word of title, people, status and issue/PR number to document positions.
+    """
+    entries = sorted(docs.items(), key=lambda entry: (entry[1]["last"], entry[0][1]), reverse=True)
+    rows = []
+    terms = {}
+    for position, ((url, title, people, status), doc) in enumerate(entries):
+        report = quote(os.path.relpath(doc["report"], output_dir)) if doc["report"] else ""
+        rows.append(["PR" if "/pull/" in url else "Issue", title, people, status, url,
+                     doc["first"].isoformat(), doc["last"].isoformat(), report])
+        number = url.rstrip("/").rsplit("/", 1)[-1] if url else ""
+        for term in set(TOKEN_RE.findall(f"{title} {people} {status} {number}".lower())):
+            terms.setdefault(term, []).append(position)
+    return {"month": month, "docs": rows, "terms": dict(sorted(terms.items()))}
+
+
+def write_report_index(reports_dir=".", history_dir=None, output_dir=None):
+    """
+    Static index page over all stored reports and history snapshots with a client-side search.
+    The inverted index is prebuilt and sharded by month into script files next to the page;
+    the page loads only the shards a search needs, so it works from disk or any static host.
+    Returns the path of the index page.
+    """
+    output_dir = output_dir or reports_dir
+    shard_dir = os.path.join(output_dir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    reports = find_reports(reports_dir)
+    months = collect_documents(reports, history_dir)
+
+    shards = []
+    for month in sorted(months, reverse=True):
+        shard = build_shard(month, months[month], output_dir)
+        filename = f"{month}.js"
+        with open(os.path.join(shard_dir, filename), "w", encoding="utf-8") as f:
+            f.write(f"window.reportIndex.add({json.dumps(shard, ensure_ascii=False, separators=(',', ':'))});\n")
+        shards.append({"month": month, "file": f"{SHARD_DIR}/{filename}", "docs": len(shard["docs"])})
+    # Shards of months that no longer have any data
+    for name in os.listdir(shard_dir):
+        if name.endswith(".js") and name[:-3] not in months:
+            os.remove(os.path.join(shard_dir, name))
+
+    report_months = {}
+    for report in reports:
+        report_months.setdefault(report["day"].strftime("%Y-%m"), []).append({
+            "name": report["name"],
+            "day": report["day"].isoformat(),
+            "href": quote(os.path.relpath(report["file"], output_dir)),
+        })
+    path = os.path.join(output_dir, INDEX_FILE)
+    write_report(path, Template(INDEX_TEMPLATE).render(
+        shards=shards, report_months=report_months,
+        generated=datetime.datetime.now().strftime("%Y.%m.%d %H:%M:%S")))
+    print(f"Report index written to {path} ({len(reports)} reports, "
+          f"{sum(shard['docs'] for shard in shards)} documents in {len(shards)} monthly shards)")
+    return path
+
+
+INDEX_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Report Index</title>
+    <style>
+        body { font-family: sans-serif; margin: 20px; }
+        table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }
+        th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        #query { width: 400px; padding: 4px; }
+        #month { margin-left: 10px; padding: 4px; }
+        #status { margin: 10px 0; color: #666; }
+        details { margin: 4px 0; }
+    </style>
+</head>
+<body>
+    <h1>Report Index</h1>
+    <div>Generated {{ generated }}</div>
+
+    <h2>Search</h2>
+    <input id="query" type="search" placeholder="Title, assignee, status or number, e.g. login review">
+    <select id="month">
+        <option value="">All months</option>
+        {% for shard in shards %}<option value="{{ shard.month }}">{{ shard.month }} ({{ shard.docs }})</option>
+        {% endfor %}
+    </select>
+    <div id="status"></div>
+    <table id="results" style="display: none;">
+        <thead>
+            <tr><th>Type</th><th>Title</th><th>People</th><th>Status</th><th>Seen</th><th>Report</th></tr>
+        </thead>
+        <tbody></tbody>
+    </table>
+
+    <h2>Reports</h2>
+    {% for month, reports in report_months.items() %}
+    <details {% if loop.first %}open{% endif %}>
+        <summary>{{ month }} ({{ reports | length }})</summary>
+        <ul>
+            {% for report in reports %}<li>{{ report.day }} <a href="{{ report.href }}">{{ report.name }}</a></li>
+            {% endfor %}
+        </ul>
+    </details>
+    {% endfor %}
+
+    <script>
+        const SHARDS = {{ shards | tojson }};
+        const MAX_RESULTS = 500;
+        const loaded = {};
+        const waiting = {};
+
+        window.reportIndex = {
+            add(shard) {
+                shard.keys = Object.keys(shard.terms).sort();
+                loaded[shard.month] = shard;
+                (waiting[shard.month] || []).forEach(resolve => resolve(shard));
+            }
+        };
+
+        function loadShard(entry) {
+            if (loaded[entry.month]) return Promise.resolve(loaded[entry.month]);
+            return new Promise(resolve => {
+                const first = !waiting[entry.month];
+                waiting[entry.month] = (waiting[entry.month] || []).concat([resolve]);
+                if (first) {
+                    const script = document.createElement("script");
+                    script.src = entry.file;
+                    document.head.appendChild(script);
+                }
+            });
+        }
+
+        // Documents containing a word that starts with prefix: a binary search in the sorted terms
+        function prefixMatches(shard, prefix) {
+            let lo = 0, hi = shard.keys.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (shard.keys[mid] < prefix) lo = mid + 1; else hi = mid;
+            }
+            const docs = new Set();
+            for (let i = lo; i < shard.keys.length && shard.keys[i].startsWith(prefix); i++) {
+                shard.terms[shard.keys[i]].forEach(doc => docs.add(doc));
+            }
+            return docs;
+        }
+
+        // Escapes quotes too, the result is also used inside href="..."
+        const HTML_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"};
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"']/g, char => HTML_ESCAPES[char]);
+        }
+
+        async function search() {
+            const words = (document.getElementById("query").value.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || []);
+            const month = document.getElementById("month").value;
+            const table = document.getElementById("results");
+            const status = document.getElementById("status");
+            if (!words.length) {
+                table.style.display = "none";
+                status.textContent = "";
+                return;
+            }
+            const entries = SHARDS.filter(entry => !month || entry.month === month);
+            status.textContent = "Loading " + entries.length + " month(s)...";
+            const shards = await Promise.all(entries.map(loadShard));
+            const results = [];
+            for (const shard of shards) {
+                let docs = null;
+                for (const word of words) {
+                    const matches = prefixMatches(shard, word);
+                    docs = docs === null ? matches : new Set([...docs].filter(doc => matches.has(doc)));
+                    if (!docs.size) break;
+                }
+                docs.forEach(doc => results.push(shard.docs[doc]));
+            }
+            results.sort((a, b) => b[6].localeCompare(a[6]) || b[5].localeCompare(a[5]));
+            table.querySelector("tbody").innerHTML = results.slice(0, MAX_RESULTS).map(doc => {
+                const [type, title, people, state, url, first, last, report] = doc;
+                const link = url ? `<a href="${escapeHtml(url)}">${escapeHtml(title)}</a>` : escapeHtml(title);
+                const seen = escapeHtml(first === last ? first : `${first} .. ${last}`);
+                const reportLink = report ? `<a href="${escapeHtml(report)}">report</a>` : "history";
+                return `<tr><td>${escapeHtml(type)}</td><td>${link}</td><td>${escapeHtml(people)}</td>` +
+                    `<td>${escapeHtml(state)}</td><td>${seen}</td><td>${reportLink}</td></tr>`;
+            }).join("");
+            table.style.display = results.length ? "" : "none";
+            status.textContent = results.length > MAX_RESULTS
+                ? `${results.length} matches, showing the newest ${MAX_RESULTS}` : `${results.length} match(es)`;
+        }
+
+        let timer = null;
+        document.getElementById("query").addEventListener("input", () => {
+            clearTimeout(timer);
+            timer = setTimeout(search, 150);
+        });
+        document.getElementById("month").addEventListener("change", search);
+    </script>
+</body>
+</html>
+"""
@@ -0,0 +1,85 @@
+import datetime
+import hashlib
+import json
+import os
+
+MAX_FILES_PER_REPORT = 50
+
+
+def _plain(value):
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def dataset_hash(rows, ignore=()):
+    """
+    Content hash of a normalized dataset, independent of row and key order.
+    Fields in ignore (values derived from the clock, like a PR's age) do not count.
+    """
+    lines = sorted(
+        json.dumps({k: _plain(v) for k, v in row.items() if k not in ignore},
+                   sort_keys=True, default=str, ensure_ascii=False)
+        for row in rows
+    )
+    digest = hashlib.blake2b(digest_size=20)
+    for line in lines:
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {"reports": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def unchanged_output(manifest_path, report, digest):
+    """
+    File generated earlier from the very same dataset, or None if the report must be rendered.
+    """
+    if not manifest_path:
+        return None
+    entry = load_manifest(manifest_path)["reports"].get(report) or {}
+    if entry.get("latest") != digest:
+        return None
+    return entry["files"].get(digest)
+
+
+def record_output(manifest_path, report, digest, filename):
+    """
+    Remember which file holds the dataset with this hash; the last one recorded is "latest".
+    """
+    if not manifest_path:
+        return
+    manifest = load_manifest(manifest_path)
+    entry = manifest["reports"].setdefault(report, {"latest": None, "files": {}})
+    entry["latest"] = digest
+    entry["files"].pop(digest, None)
+    entry["files"][digest] = filename
+    while len(entry["files"]) > MAX_FILES_PER_REPORT:
+        entry["files"].pop(next(iter(entry["files"])))
+    entry["updated_at"] = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    save_manifest(manifest_path, manifest)
+
+
+def set_github_output(name, value):
+    """
+    Expose a step output when running inside GitHub Actions.
+    """
+    output_file = os.environ.get("GITHUB_OUTPUT")
+    if output_file:
+        with open(output_file, "a", encoding="utf-8") as f:
+            f.write(f"{name}={value}\n")
@@ -0,0 +1,156 @@
+import datetime
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from github_api import extract_org_and_number, log
+from project_items import (
+    PROJECT_URL, fetch_project_schema, fetch_project_items, find_release_epics, match_release_sprints
+)
+from issue_hierarchy import build_hierarchy
+from run_budget import RunBudget
+from status_history import status_times
+from user_directory import resolve_users
+import pr_report
+
+REPORTS = ("sprint", "release", "prs")
+
+
+class ReportRun:
+    """
+    One run of one or more reports, modelled as a small DAG of memoized stages:
+
+        schema(project) -> items(project) -> epics(project, release) -> hierarchy(project, release)
+                                          -> status_times(project, sprint)
+        repositories(org, topic) -> prs(org, topic)
+        items, hierarchy, prs of the run's reports -> users
+
+    Every stage runs at most once per run and its result is shared by all renderers,
+    so "all" mode costs one project scan instead of one per report. Stages are thread-safe:
+    independent sources (projects, org/topic pairs) are fetched by concurrent workers that
+    share the process-wide rate budget of github_api.
+
+    With a local item store (kept current by the webhook receiver) schema, items and prs
+    of every source already in the store are read from it instead of the API.
+
+    reports names the reports of the run (sprint, release, prs) and releases the releases of
+    the release report: the users stage collects the people of all of them and resolves them
+    in one lookup.
+
+    The run budget bounds the optional enrichment stages (sub-issue expansion, status
+    history); once its deadline has passed they are skipped and the reports say so.
+    """
+
+    def __init__(self, project_urls=(PROJECT_URL,), org_topics=((pr_report.ORG_NAME, pr_report.TOPIC_FILTER),),
+                 now=None, store=None, checkpoints=None, budget=None, status_history=None,
+                 reports=REPORTS, releases=()):
+        self.project_urls = list(project_urls)
+        self.org_topics = list(org_topics)
+        self.now = now or datetime.datetime.now()
+        self.store = store
+        self.checkpoints = checkpoints
+        self.budget = budget or RunBudget()
+        self.status_history = status_history
+        self.reports = set(reports)
+        self.releases = list(releases)
+        self.results = {}
+        self.lock = threading.Lock()
+
+    def _stage(self, key, compute):
+        with self.lock:
+            future = self.results.get(key)
+            owner = future is None
+            if owner:
+                future = self.results[key] = Future()
+        if owner:
+            log(f"Running stage {key}")
+            try:
+                future.set_result(compute())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def for_each(self, sources, work):
+        """
+        Run work(source) for every source in its own worker and return the results in order.
+        """
+        sources = list(sources)
+        if len(sources) == 1:
+            return [work(sources[0])]
+        with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+            return list(pool.map(work, sources))
+
+    def schema(self, project_url):
+        def compute():
+            stored = self.store.schema(project_url) if self.store else None
+            return stored or fetch_project_schema(*extract_org_and_number(project_url))
+        return self._stage(("schema", project_url), compute)
+
+    def items(self, project_url):
+        def compute():
+            if self.store and self.store.schema(project_url):
+                return self.store.items(project_url)
+            return fetch_project_items(self.schema(project_url), checkpoints=self.checkpoints)
+        return self._stage(("items", project_url), compute)
+
+    def epics(self, project_url, release_name):
+        return self._stage(("epics", project_url, release_name),
+                           lambda: find_release_epics(self.items(project_url), release_name))
+
+    def hierarchy(self, project_url, release_name):
+        return self._stage(("hierarchy", project_url, release_name),
+                           lambda: build_hierarchy(self.epics(project_url, release_name), self.schema(project_url),
+                                                   budget=self.budget))
+
+    def status_times(self, project_url, sprint_id):
+        """
+        Time in status of the items of one sprint; {} without a status history cache.
+        """
+        def compute():
+            if self.status_history is None:
+                return {}
+            items = [item for item in self.items(project_url) if sprint_id in item["iteration_ids"]]
+            return status_times(items, self.schema(project_url)["project_id"], self.status_history, self.budget)
+        return self._stage(("status_times", project_url, sprint_id), compute)
+
+    def logins(self):
+        """
+        Everyone who can appear in a report of this run: item and sub-issue assignees, PR authors and assignees.
+        """
+        logins = set()
+        if self.reports & {"sprint", "release"}:
+            for project_url in self.project_urls:
+                for item in self.items(project_url):
+                    logins.update(item["assignees"])
+        if "release" in self.reports:
+            for project_url in self.project_urls:
+                for release_name in self.releases:
+                    if not match_release_sprints(self.schema(project_url), release_name):
+                        continue
+                    for node in self.hierarchy(project_url, release_name)["nodes"].values():
+                        logins.update(node.get("assignees") or [])
+        if "prs" in self.reports:
+            for org, topic in self.org_topics:
+                for prs in self.prs(org, topic).values():
+                    logins.update(login for pr in prs for login in (pr["user"], pr["assignee"]))
+        return logins
+
+    def users(self, logins=()):
+        """
+        User directory of the run, resolved once for all its reports. Logins the run did not
+        anticipate are resolved on top (from the cache when possible).
+        """
+        directory = self._stage(("users",), lambda: resolve_users(self.logins(), log=log))
+        unexpected = set(logins) - set(directory)
+        if unexpected:
+            directory = dict(directory, **resolve_users(unexpected, log=log))
+        return directory
+
+    def repositories(self, org, topic):
+        return self._stage(("repositories", org, topic), lambda: pr_report.get_repositories_with_topic(org, topic))
+
+    def prs(self, org, topic):
+        def compute():
+            if self.store and self.store.has_prs(org, topic):
+                return self.store.prs(org, topic)
+            return {repo: pr_report.get_pull_requests(repo) for repo in self.repositories(org, topic)}
+        return self._stage(("prs", org, topic), compute)
@@ -0,0 +1,192 @@
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from github_api import log
+from pr_report import build_pr_report
+from release_report import build_release_report
+from report_pipeline import ReportRun
+from sprint_report import build_sprint_report
+from sprint_report_v1 import build_sprint_report_v1
+from webhook_server import WEBHOOK_SECRET_ENV, apply_event, reconcile, verify_signature
+
+REFRESH_INTERVAL = 900
+# Webhook deliveries come in bursts (one edit touches several fields), refresh once per burst
+REFRESH_DEBOUNCE = 5
+
+
+def page_etag(body):
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class ReportCache:
+    """
+    Rendered reports kept in memory. A single background thread refreshes them: every
+    refresh_interval seconds, shortly after a webhook event, or when a request finds
+    them stale. Requests are always answered from the last successful refresh and never
+    wait on the GitHub API (stale-while-revalidate).
+    """
+
+    def __init__(self, project_urls, org_topics, releases, attention_rules, store=None,
+                 refresh_interval=REFRESH_INTERVAL):
+        self.project_urls = project_urls
+        self.org_topics = org_topics
+        self.releases = list(releases)
+        self.attention_rules = attention_rules
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.pages = {}
+        self.refreshed_at = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stop = threading.Event()
+
+    def builders(self):
+        builders = {
+            "/sprint": lambda run: build_sprint_report(run)[2],
+            "/sprint-v1": lambda run: build_sprint_report_v1(run)[2],
+            "/prs": lambda run: build_pr_report(run, self.attention_rules, datetime.datetime.utcnow())[1],
+        }
+        for release_name in self.releases:
+            builders[f"/release/{release_name}"] = \
+                lambda run, release_name=release_name: build_release_report(run, release_name)[1]
+        return builders
+
+    def refresh(self, reconcile_store=False):
+        """
+        Fetch everything once into a fresh run and re-render every report from it. A report
+        that fails keeps its previous page, the others are still updated. With an item store
+        the data comes from the store; scheduled refreshes reconcile the store first.
+        """
+        started = time.monotonic()
+        if self.store and (reconcile_store or self.refreshed_at is None and self.store_incomplete()):
+            reconcile(self.store, self.project_urls, self.org_topics)
+        run = ReportRun(self.project_urls, self.org_topics, store=self.store, releases=self.releases)
+        pages = {}
+        for path, build in self.builders().items():
+            try:
+                body = build(run).encode("utf-8")
+                pages[path] = {"body": body, "etag": page_etag(body), "generated_at": datetime.datetime.utcnow()}
+            except Exception as e:
+                print(f"❌ Refresh of {path} failed: {e}")
+        with self.lock:
+            self.pages.update(pages)
+            self.refreshed_at = time.monotonic()
+        print(f"Reports refreshed: {len(pages)} page(s) in {time.monotonic() - started:.1f}s")
+
+    def store_incomplete(self):
+        return any(self.store.schema(url) is None for url in self.project_urls) or \
+            any(not self.store.has_prs(org, topic) for org, topic in self.org_topics)
+
+    def request_refresh(self):
+        self.wake.set()
+
+    def is_stale(self):
+        return self.refreshed_at is None or time.monotonic() - self.refreshed_at > self.refresh_interval
+
+    def get(self, path):
+        with self.lock:
+            page = self.pages.get(path)
+        if self.is_stale():
+            self.request_refresh()
+        return page
+
+    def refresh_loop(self):
+        while not self.stop.is_set():
+            woken = self.wake.wait(self.refresh_interval)
+            if self.stop.is_set():
+                break
+            if woken:
+                self.stop.wait(REFRESH_DEBOUNCE)
+            self.wake.clear()
+            try:
+                self.refresh(reconcile_store=not woken)
+            except Exception as e:
+                print(f"❌ Refresh failed: {e}")
+
+
+def make_handler(cache, secret=None):
+    class ReportHandler(BaseHTTPRequestHandler):
+        def send_body(self, status, body, content_type, headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def send_json(self, status, body):
+            self.send_body(status, json.dumps(body).encode("utf-8"), "application/json")
+
+        def do_GET(self):
+            path = unquote(self.path.split("?", 1)[0]).rstrip("/") or "/"
+            if path == "/healthz":
+                self.send_json(200, {"status": "ok", "stale": cache.is_stale()})
+                return
+            if path == "/":
+                self.send_json(200, {"reports": sorted(cache.pages)})
+                return
+            page = cache.get(path)
+            if not page:
+                self.send_json(404, {"error": f"unknown report {path}", "reports": sorted(cache.pages)})
+                return
+            headers = {
+                "ETag": page["etag"],
+                "Last-Modified": page["generated_at"].strftime("%a, %d %b %Y %H:%M:%S GMT"),
+                "Cache-Control": f"max-age={cache.refresh_interval}, stale-while-revalidate={cache.refresh_interval}",
+            }
+            if page["etag"] in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                self.send_body(304, b"", "text/html; charset=utf-8", headers)
+                return
+            self.send_body(200, page["body"], "text/html; charset=utf-8", headers)
+
+        do_HEAD = do_GET
+
+        def do_POST(self):
+            if self.path != "/webhook" or not secret:
+                self.send_json(404, {"error": "not found"})
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if not verify_signature(secret, body, self.headers.get("X-Hub-Signature-256")):
+                self.send_json(401, {"error": "bad signature"})
+                return
+            event = self.headers.get("X-GitHub-Event", "")
+            result = "refresh scheduled"
+            if cache.store:
+                try:
+                    result = apply_event(cache.store, event, json.loads(body), cache.org_topics)
+                except Exception as e:
+                    print(f"❌ Delivery ({event}) failed: {e}")
+            cache.request_refresh()
+            self.send_json(202, {"result": result})
+
+        def log_message(self, format, *args):
+            log(format % args)
+
+    return ReportHandler
+
+
+def run_report_server(cache, host, port):
+    # The first refresh happens before listening, so no request ever finds an empty cache
+    cache.refresh()
+    refresher = threading.Thread(target=cache.refresh_loop, daemon=True)
+    refresher.start()
+
+    secret = os.environ.get(WEBHOOK_SECRET_ENV)
+    server = ThreadingHTTPServer((host, port), make_handler(cache, secret))
+    print(f"Serving reports on {host}:{port}" + (", webhooks on /webhook" if secret else ""))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cache.stop.set()
+        cache.wake.set()
+        server.server_close()
@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import sys
+
+from github_api import memoized_queries, set_verbose
+from item_store import ITEM_STORE_FILE, ItemStore
+from burndown_report import run_burndown_report
+from cost_estimate import run_estimate
+from cycle_time_report import WINDOW_DAYS, run_cycle_time_report
+from pr_history import BACKFILL_DAYS, PR_HISTORY_FILE
+from pr_report import ORG_NAME, TOPIC_FILTER, run_pr_report
+from pr_rules import DEFAULT_RULES_FILE, load_rules
+from project_items import PROJECT_URL
+from release_report import SHARD_FIELDS, run_release_report
+from report_export import parse_export_formats
+from report_history import HISTORY_DIR
+from report_index import write_report_index
+from report_manifest import set_github_output
+from report_pipeline import ReportRun
+from report_server import REFRESH_INTERVAL, ReportCache, run_report_server
+from run_budget import RUN_DEADLINE, RunBudget
+from scan_checkpoint import CheckpointStore
+from sprint_report import run_sprint_report
+from sprint_report_v1 import run_sprint_report_v1
+from status_history import STATUS_HISTORY_FILE, StatusHistoryCache
+from webhook_server import RECONCILE_INTERVAL, run_webhook_receiver
+
+# Reports built by every command, so the run can resolve the people of all of them at once
+COMMAND_REPORTS = {
+    "sprint": ("sprint",),
+    "sprint-v1": ("sprint",),
+    "release": ("release",),
+    "prs": ("prs",),
+    "all": ("sprint", "release", "prs"),
+}
+
+def parse_org_topic(value):
+    org, sep, topic = value.partition(":")
+    if not sep or not org or not topic:
+        raise argparse.ArgumentTypeError(f"Expected ORG:TOPIC, got '{value}'")
+    return org, topic
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    common.add_argument("--export", type=parse_export_formats, default=[],
+                        help="Also export the dataset, comma-separated: jsonl,csv,parquet")
+    common.add_argument("--delta-dir",
+                        help="Keep the previous dataset here and write a report of what changed since then")
+    common.add_argument("--history-dir", help="Append a dated snapshot of the sprint items to this history store")
+    common.add_argument("--manifest",
+                        help="Output manifest (dataset hash -> report file); unchanged reports are not regenerated")
+    common.add_argument("--resume", action="store_true",
+                        help="Continue the project scans of a failed run from their last saved page")
+    common.add_argument("--deadline", type=float, default=RUN_DEADLINE, metavar="SECONDS",
+                        help="Run deadline; optional enrichment still pending after it is skipped and the "
+                             "reports are marked partial (default: $REPORT_DEADLINE_SECONDS, none)")
+    common.add_argument("--estimate", action="store_true",
+                        help="Only print the expected requests, rate limit points and time of this run")
+    common.add_argument("--store", help="Read items and PRs from this local item store (see the webhook command)")
+
+    sources = argparse.ArgumentParser(add_help=False)
+    sources.add_argument("--project", action="append", dest="projects",
+                         help=f"GitHub project URL, repeatable (default: {PROJECT_URL})")
+
+    sprint_args = argparse.ArgumentParser(add_help=False)
+    sprint_args.add_argument("--status-history", default=STATUS_HISTORY_FILE,
+                             help="Cache of the status change history of sprint items (SQLite); "
+                                  "an empty value turns the time-in-status columns off")
+
+    release_args = argparse.ArgumentParser(add_help=False)
+    release_args.add_argument("--release", action="append", dest="releases",
+                              help="Release name (example: 26.2), repeatable; defaults to $RELEASE_NAME")
+    release_args.add_argument("--shard-by", choices=sorted(SHARD_FIELDS),
+                              help="Split the release report into one page per team or assignee, "
+                                   "opened from a landing page with the totals")
+
+    org_topics = argparse.ArgumentParser(add_help=False)
+    org_topics.add_argument("--org-topic", action="append", dest="org_topics", type=parse_org_topic,
+                            help=f"ORG:TOPIC of repositories to scan for PRs, repeatable "
+                                 f"(default: {ORG_NAME}:{TOPIC_FILTER})")
+
+    rules_args = argparse.ArgumentParser(add_help=False, parents=[org_topics])
+    rules_args.add_argument("--rules", default=DEFAULT_RULES_FILE, help="Declarative attention rules file (JSON)")
+
+    parser = argparse.ArgumentParser(description="APIHUB sprint, release and pull request reports")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("sprint", parents=[common, sources, sprint_args], help="Current sprint report")
+    commands.add_parser("sprint-v1", parents=[common, sources], help="Current sprint report (first version)")
+    commands.add_parser("release", parents=[common, sources, release_args], help="Release report")
+    commands.add_parser("prs", parents=[common, sources, rules_args], help="Open pull requests report")
+    commands.add_parser("all", parents=[common, sources, sprint_args, release_args, rules_args],
+                        help="Sprint, release and pull request reports sharing one project scan")
+    cycle_time = commands.add_parser("cycle-time", parents=[common, org_topics],
+                                     help="Review and merge times of closed PRs from an incrementally synced history")
+    cycle_time.add_argument("--pr-history", default=PR_HISTORY_FILE, help="Local closed-PR history (SQLite)")
+    cycle_time.add_argument("--backfill-days", type=int, default=BACKFILL_DAYS,
+                            help="How far back the first sync of a repository goes")
+    cycle_time.add_argument("--window-days", type=int, default=WINDOW_DAYS,
+                            help="Report PRs closed within this many days")
+
+    webhook = commands.add_parser("webhook", parents=[sources, org_topics],
+                                  help="Keep the local item store current from GitHub webhook deliveries")
+    webhook.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    webhook.add_argument("--store", default=ITEM_STORE_FILE, help="Local item store (SQLite)")
+    webhook.add_argument("--host", default="0.0.0.0", help="Listen address")
+    webhook.add_argument("--port", type=int, default=8080, help="Listen port")
+    webhook.add_argument("--reconcile-interval", type=int, default=RECONCILE_INTERVAL,
+                         help="Seconds between full reconciliation sweeps")
+    webhook.add_argument("--record", help="Save every verified delivery to this directory")
+    webhook.add_argument("--replay", nargs="+", help="Apply recorded deliveries (files or directories) and exit")
+
+    serve = commands.add_parser("serve", parents=[sources, release_args, rules_args],
+                                help="Serve the reports over HTTP from an in-memory cache refreshed in the background")
+    serve.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    serve.add_argument("--store", help="Build the reports from this local item store, updated by /webhook deliveries")
+    serve.add_argument("--host", default="0.0.0.0", help="Listen address")
+    serve.add_argument("--port", type=int, default=8080, help="Listen port")
+    serve.add_argument("--refresh-interval", type=int, default=REFRESH_INTERVAL,
+                       help="Seconds between background refreshes (also the max-age of served reports)")
+
+    burndown = commands.add_parser("burndown", help="Burndown and velocity from the local history store")
+    burndown.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    burndown.add_argument("--history-dir", default=HISTORY_DIR, help="History store directory")
+    burndown.add_argument("--report", default="sprint", help="Report name inside the history store (sprint, sprint-v1)")
+    burndown.add_argument("--sprint", help="Sprint title (default: sprint of the latest snapshot)")
+
+    index = commands.add_parser("index", help="Static searchable index over stored reports and history snapshots")
+    index.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    index.add_argument("--reports-dir", default=".", help="Directory with the report_*.html files and their exports")
+    index.add_argument("--history-dir", help="History store whose snapshots are indexed as well")
+    index.add_argument("--output", help="Directory of the index page and its search shards (default: --reports-dir)")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    set_verbose(options.verbose)
+
+    if options.command == "burndown":
+        run = ReportRun()
+        run_burndown_report(run.now, options.history_dir, options.report, options.sprint)
+        return
+    if options.command == "index":
+        write_report_index(options.reports_dir, options.history_dir, options.output)
+        return
+
+    project_urls = getattr(options, "projects", None) or [PROJECT_URL]
+    org_topics = getattr(options, "org_topics", None) or [(ORG_NAME, TOPIC_FILTER)]
+    store = ItemStore(options.store) if options.store else None
+
+    if options.command == "webhook":
+        run_webhook_receiver(store, options, project_urls, org_topics)
+        return
+
+    checkpoints = CheckpointStore(resume=getattr(options, "resume", False))
+    budget = RunBudget(getattr(options, "deadline", None))
+    status_history = None
+    if getattr(options, "status_history", None) and not getattr(options, "estimate", False):
+        status_history = StatusHistoryCache(options.status_history)
+    releases = getattr(options, "releases", None) or [r for r in [os.environ.get("RELEASE_NAME")] if r]
+    run = ReportRun(project_urls=project_urls, org_topics=org_topics, store=store, checkpoints=checkpoints,
+                    budget=budget, status_history=status_history,
+                    reports=COMMAND_REPORTS.get(options.command, ()), releases=releases)
+
+    if options.command == "release" and not releases:
+        parser.error("release name is required: --release or $RELEASE_NAME")
+    # Compile rules before any API call so a broken rules file fails fast
+    attention_rules = load_rules(options.rules) if options.command in ("prs", "all", "serve") else None
+
+    if getattr(options, "estimate", False):
+        run_estimate(options.command, project_urls, org_topics, releases)
+        return
+
+    if options.command == "serve":
+        cache = ReportCache(project_urls, org_topics, releases, attention_rules, store=store,
+                            refresh_interval=options.refresh_interval)
+        run_report_server(cache, options.host, options.port)
+        return
+
+    written = []
+    with memoized_queries() as memo:
+        if options.command == "sprint-v1":
+            written.append(run_sprint_report_v1(run, options))
+        if options.command in ("sprint", "all"):
+            written.append(run_sprint_report(run, options))
+        if options.command in ("release", "all"):
+            for release_name in releases:
+                written.append(run_release_report(run, release_name, options))
+        if options.command in ("prs", "all"):
+            written.append(run_pr_report(run, attention_rules, options))
+        if options.command == "cycle-time":
+            written.append(run_cycle_time_report(run, options))
+    set_github_output("changed", "true" if any(written) else "false")
+    set_github_output("partial", "true" if budget.is_partial() else "false")
+    print(f"Run metrics: {json.dumps(dict(budget.metrics(), queries=memo.metrics()))}")
+    checkpoints.clear()
+    if status_history:
+        status_history.close()
+    if options.command == "all" and options.history_dir:
+        run_burndown_report(run.now, options.history_dir)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
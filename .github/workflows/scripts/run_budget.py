@@ -0,0 +1,83 @@
+import html
+import os
+import threading
+import time
+
+import requests
+
+from github_api import log, timeout_cap
+
+RUN_DEADLINE = os.environ.get("REPORT_DEADLINE_SECONDS")
+
+
+class RunBudget:
+    """
+    Time budget of one run. Required stages always run (the report cannot exist without
+    them) and are only bounded by the per-request timeout. Optional enrichment runs
+    through optional(): once the deadline has passed it is skipped, and while it runs its
+    requests cannot outlive the deadline. Skips are counted per stage so the reports can
+    say what is missing.
+    """
+
+    def __init__(self, seconds=None):
+        self.started = time.monotonic()
+        self.deadline = self.started + float(seconds) if seconds else None
+        self.lock = threading.Lock()
+        self.completed = {}
+        self.skipped = {}
+
+    def remaining(self):
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def _count(self, counters, stage):
+        with self.lock:
+            counters[stage] = counters.get(stage, 0) + 1
+
+    def optional(self, stage, compute, fallback=None):
+        if self.expired():
+            self._count(self.skipped, stage)
+            return fallback
+        try:
+            if self.deadline is None:
+                result = compute()
+            else:
+                with timeout_cap(self.remaining()):
+                    result = compute()
+        except requests.Timeout as e:
+            log(f"Optional stage '{stage}' timed out: {e}")
+            self._count(self.skipped, stage)
+            return fallback
+        self._count(self.completed, stage)
+        return result
+
+    def is_partial(self, stages=None):
+        return any(stage in self.skipped for stage in (stages or self.skipped))
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "elapsed_seconds": round(time.monotonic() - self.started, 1),
+                "deadline_seconds": None if self.deadline is None else round(self.deadline - self.started, 1),
+                "completed": dict(self.completed),
+                "skipped": dict(self.skipped),
+            }
+
+    def banner_html(self, stages=None):
+        """
+        Visible warning for a report built without some of its optional data, or "".
+        """
+        stages = [stage for stage in (stages or list(self.skipped)) if stage in self.skipped]
+        if not stages:
+            return ""
+        items = "".join(
+            f"<li>{html.escape(stage)}: {self.skipped[stage]} skipped, {self.completed.get(stage, 0)} completed</li>"
+            for stage in stages
+        )
+        return (
+            "<div style='background:#fff3cd;border:1px solid #ffa000;padding:8px 16px;margin:10px 0;'>"
+            "<strong>&#x26A0; Partial report:</strong> the run deadline was reached, "
+            f"optional data is missing.<ul>{items}</ul></div>"
+        )
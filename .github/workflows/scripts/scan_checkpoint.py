@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from github_api import log
+
+CHECKPOINT_DIR = os.environ.get("REPORT_CHECKPOINT_DIR", ".report-cache/checkpoints")
+# Older checkpoints describe a project that has moved on too far to be worth resuming
+CHECKPOINT_MAX_AGE = int(os.environ.get("REPORT_CHECKPOINT_MAX_AGE", str(6 * 3600)))
+
+
+def schema_fingerprint(schema):
+    """
+    Items normalized with a different schema (renamed options, new iterations) must not be reused.
+    """
+    payload = json.dumps(schema, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ScanCheckpoint:
+    """
+    Append-only checkpoint of one paginated scan: a header line (stage, schema fingerprint,
+    creation time) followed by one line per fetched page with its end cursor and its
+    normalized items. Appending keeps the cost per page constant however long the scan is.
+    """
+
+    def __init__(self, path, stage, fingerprint, resume=False, max_age=CHECKPOINT_MAX_AGE):
+        self.path = path
+        self.stage = stage
+        self.fingerprint = fingerprint
+        self.resume = resume
+        self.max_age = max_age
+
+    def load(self):
+        """
+        Progress of an earlier run of the same scan: {"page", "after", "scanned", "done"},
+        or None if there is nothing usable to resume from. A page the earlier run did not finish
+        writing is cut off the file, so the pages appended from here on start on a line of their own.
+        """
+        if not self.resume or not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        try:
+            header = json.loads(lines[0])
+        except (IndexError, ValueError):
+            return None
+        if not lines[0].endswith(b"\n"):
+            return None
+        if header.get("stage") != self.stage or header.get("fingerprint") != self.fingerprint:
+            log(f"Discarding checkpoint {self.path}: project schema changed")
+            return None
+        if time.time() - header.get("created_at", 0) > self.max_age:
+            log(f"Discarding checkpoint {self.path}: older than {self.max_age}s")
+            return None
+        state = {"page": 0, "after": None, "scanned": [], "done": False}
+        complete = len(lines[0])
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line) if line.endswith(b"\n") else None
+            except ValueError:
+                entry = None
+            if entry is None:
+                # The run died while writing this page, it is fetched again
+                with open(self.path, "r+b") as f:
+                    f.truncate(complete)
+                break
+            complete += len(line)
+            state["page"] = entry["page"]
+            state["after"] = entry["after"]
+            state["done"] = entry["done"]
+            state["scanned"].extend((item_id, item) for item_id, item in entry["items"])
+        return state
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"stage": self.stage, "fingerprint": self.fingerprint, "created_at": time.time()}))
+            f.write("\n")
+
+    def append(self, page, after, scanned, done):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"page": page, "after": after, "done": done, "items": scanned}, ensure_ascii=False))
+            f.write("\n")
+
+
+class CheckpointStore:
+    """
+    Checkpoints of all scans of one run, one file per scan. resume=True picks up
+    where a failed run stopped; otherwise every scan starts over (and is checkpointed again).
+    """
+
+    def __init__(self, directory=CHECKPOINT_DIR, resume=False):
+        self.directory = directory
+        self.resume = resume
+
+    def for_scan(self, stage, schema, query_filter=None):
+        key = hashlib.blake2b(f"{schema['project_id']}|{query_filter or ''}".encode("utf-8"),
+                              digest_size=8).hexdigest()
+        return ScanCheckpoint(os.path.join(self.directory, f"{stage}-{key}.jsonl"), stage,
+                              schema_fingerprint(schema), resume=self.resume)
+
+    def clear(self):
+        """
+        Called once the whole run succeeded, nothing is left to resume.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,292 @@
+import html
+import io
+import json
+import os
+
+from project_items import find_current_sprint, project_label
+from report_aggregate import to_columns, group_by, format_number, render_summary_table
+from report_delta import run_delta_stage
+from report_export import export_dataset, write_report
+from report_history import append_snapshot, compact_history
+from report_manifest import dataset_hash, record_output, unchanged_output
+from status_history import NO_STATUS, STATUS_HISTORY_STAGE
+from user_directory import display_name, determine_team
+
+# Derived from the clock: they grow every day without any change of the items. The hash leaves
+# them out; the page recomputes them from status_since and closed_status_days when it is opened,
+# so a report that is not regenerated still shows current values.
+STATUS_TIME_FIELDS = ("days_in_status", "time_in_status")
+
+STATUS_TIME_SCRIPT = """
+  <script>
+    // Time in status as of now, from the last status change and the periods before it
+    function formatDays(days) {
+      var rounded = Math.round(days * 10) / 10;
+      return rounded === Math.floor(rounded) ? String(rounded) : rounded.toFixed(1);
+    }
+    document.querySelectorAll('td[data-status-since]').forEach(function(cell) {
+      var breakdown = cell.nextElementSibling;
+      var current = (Date.now() - Date.parse(cell.getAttribute('data-status-since'))) / 86400000;
+      var days = JSON.parse(breakdown.getAttribute('data-closed-days'));
+      var status = breakdown.getAttribute('data-status');
+      days[status] = (days[status] || 0) + current;
+      cell.textContent = formatDays(current);
+      breakdown.textContent = Object.keys(days)
+        .sort(function(a, b) { return days[b] - days[a]; })
+        .map(function(name) { return name + ' ' + formatDays(days[name]) + 'd'; })
+        .join(', ');
+    });
+  </script>
+"""
+
+def format_status_days(status_days):
+    """
+    "In Progress 3.5d, In Review 1d": days per status, longest first.
+    """
+    return ", ".join(f"{status} {format_number(round(days, 1))}d"
+                     for status, days in sorted(status_days.items(), key=lambda entry: -entry[1]))
+
+def build_sprint_rows(items, sprint_id, status_times=None):
+    """
+    One row per assignee of every issue in the sprint, unassigned last.
+    status_times (see status_history.status_times) adds the time in status of every item.
+    """
+    status_times = status_times or {}
+    issues = []
+    for item in items:
+        if sprint_id not in item["iteration_ids"]:
+            continue
+        times = status_times.get(item.get("item_id")) or {}
+        days_in_status = times.get("days_in_status")
+        for a in item["assignees"] or ["Unassigned"]:
+            issues.append({
+                "assignee": a,
+                "name": item["title"],
+                "type": item["type"] or "Empty",
+                "priority": item["priority"],
+                "status": item["status"],
+                "url": item["url"],
+                "estimate": item["estimate"],
+                "time_spent": item["time_spent"],
+                "days_in_status": None if days_in_status is None else round(days_in_status, 1),
+                "time_in_status": format_status_days(times.get("status_days") or {}),
+                "status_since": times.get("status_since", ""),
+                "closed_status_days": times.get("closed_status_days") or {},
+            })
+    return sorted(issues, key=lambda x: (x["assignee"] == "Unassigned", x["assignee"]))
+
+def render_sprint_report(data, sprint_name, users, now, partial_banner=""):
+    timestamp_display = now.strftime("%Y.%m.%d %H:%M:%S")
+
+    columns = to_columns(data)
+    team_totals = group_by(columns, ["team"])
+    show_project = len({issue.get("project") for issue in data}) > 1
+    project_header = "\n        <th>Project &#x25B2;&#x25BC;</th>" if show_project else ""
+
+    with io.StringIO() as f:
+        f.write(f"""
+<html>
+<head>
+  <meta charset='utf-8'>
+  <title>GitHub Sprint Report - {sprint_name} - {timestamp_display}</title>
+  <style>
+    body {{ font-family: sans-serif; }}
+    table {{ border-collapse: collapse; width: 100%; }}
+    th, td {{ border: 1px solid #ccc; padding: 4px; text-align: left; }}
+    th {{ background-color: #f2f2f2; cursor: pointer; }}
+    tr:hover {{ background-color: #f1f1f1; }}
+    .numeric {{ text-align: right; mso-number-format:'\\@'; }}
+    h2 {{ margin-top: 40px; }}
+    .summary-table {{ width: auto; }}
+    .summary-table td, .summary-table th {{ padding: 6px 16px; }}
+  </style>
+  <script src='https://cdnjs.cloudflare.com/ajax/libs/tablesort/5.2.1/tablesort.min.js'></script>
+  <script src='https://code.jquery.com/jquery-3.6.0.min.js'></script>
+</head>
+<body>
+  <h1>Sprint Report - {sprint_name} - {timestamp_display}</h1>
+  {partial_banner}
+  <input type='text' id='filterInput' placeholder='Filter table...' style='margin-bottom:10px;width:300px;padding:5px;'>
+  <table id='reportTable'>
+    <thead>
+      <tr>
+        <th>Assignee &#x25B2;&#x25BC;</th>
+        <th>Name &#x25B2;&#x25BC;</th>
+        <th>Team &#x25B2;&#x25BC;</th>
+        <th>Type &#x25B2;&#x25BC;</th>
+        <th>Priority &#x25B2;&#x25BC;</th>
+        <th>Status &#x25B2;&#x25BC;</th>
+        <th>Days in Status &#x25B2;&#x25BC;</th>
+        <th>Time in Statuses</th>
+        <th>Estimate, md &#x25B2;&#x25BC;</th>
+        <th>Time Spent, md &#x25B2;&#x25BC;</th>
+        <th>URL</th>{project_header}
+      </tr>
+    </thead>
+    <tbody>
+""")
+
+        assignee_colors = {}
+        color_palette = ["#f0f8ff", "#f5f5dc", "#f0fff0", "#fffaf0", "#fdf5e6", "#f5fffa", "#fffff0", "#f0ffff"]
+
+        for issue in data:
+            assignee = issue['assignee']
+            assignee_display = display_name(users, assignee)
+            if assignee not in assignee_colors:
+                assignee_colors[assignee] = color_palette[len(assignee_colors) % len(color_palette)]
+            color = assignee_colors[assignee]
+
+            team = issue['team']
+
+            estimate_display = f"\u200B{issue['estimate']}" if issue['estimate'] not in (None, "") else ""
+            time_spent_display = f"\u200B{issue['time_spent']}" if issue['time_spent'] not in (None, "") else ""
+
+            f.write(f"      <tr style='background-color:{color};'>")
+            f.write(f"        <td>{assignee_display}</td>")
+            f.write(f"        <td>{issue['name']}</td>")
+            f.write(f"        <td>{team}</td>")
+            f.write(f"        <td>{issue['type']}</td>")
+            f.write(f"        <td>{issue['priority']}</td>")
+            f.write(f"        <td>{issue['status']}</td>")
+            if issue.get('status_since'):
+                closed_days = html.escape(json.dumps(issue['closed_status_days']), quote=True)
+                current_status = html.escape(issue["status"] or NO_STATUS, quote=True)
+                f.write(f"        <td class='numeric' data-status-since='{issue['status_since']}'>"
+                        f"{format_number(issue.get('days_in_status'))}</td>")
+                f.write(f"        <td data-closed-days='{closed_days}' data-status='{current_status}'>"
+                        f"{issue.get('time_in_status', '')}</td>")
+            else:
+                f.write("        <td class='numeric'></td>")
+                f.write("        <td></td>")
+            estimate_missing = issue['type'] in ("Task", "Feature") and issue['estimate'] in (None, "")
+            estimate_style = " style='background-color:#ffcccc;'" if estimate_missing else ""
+            f.write(f"        <td class='numeric'{estimate_style}>{estimate_display}</td>")
+            f.write(f"        <td class='numeric'>{time_spent_display}</td>")
+            f.write(f"        <td><a href='{issue['url']}' target='_blank'>Link</a></td>")
+            if show_project:
+                f.write(f"        <td>{issue['project']}</td>")
+            f.write("      </tr>")
+
+        f.write("""
+    </tbody>
+  </table>
+""")
+
+        f.write("""
+  <h2>Team Summary</h2>
+  <table class='summary-table' id='summaryTable'>
+    <thead>
+      <tr>
+        <th>Team</th>
+        <th>Estimate sum</th>
+        <th>Time Spent sum</th>
+        <th>Delta</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+        total_estimate = 0
+        total_time_spent = 0
+        for t in sorted(team_totals, key=lambda r: r["team"]):
+            delta = t["estimate_sum"] - t["time_spent_sum"]
+            total_estimate += t["estimate_sum"]
+            total_time_spent += t["time_spent_sum"]
+            est_str = format_number(t["estimate_sum"])
+            ts_str = format_number(t["time_spent_sum"])
+            delta_str = format_number(delta)
+            f.write(f"      <tr><td>{t['team']}</td><td class='numeric'>{est_str}</td><td class='numeric'>{ts_str}</td><td class='numeric'>{delta_str}</td></tr>\n")
+
+        total_delta = total_estimate - total_time_spent
+        te_str = format_number(total_estimate)
+        tts_str = format_number(total_time_spent)
+        td_str = format_number(total_delta)
+        f.write(f"      <tr style='font-weight:bold;'><td>Sum by all teams</td><td class='numeric'>{te_str}</td><td class='numeric'>{tts_str}</td><td class='numeric'>{td_str}</td></tr>\n")
+
+        f.write("""
+    </tbody>
+  </table>
+""")
+        f.write(STATUS_TIME_SCRIPT)
+        f.write(render_summary_table("Assignee Summary", group_by(columns, ["assignee"]), ["assignee"]))
+        f.write(render_summary_table("Status Summary", group_by(columns, ["status"]), ["status"]))
+        f.write(render_summary_table("Team / Status Summary", group_by(columns, ["team", "status"]), ["team", "status"]))
+
+        f.write("""
+  <script>
+    $(document).ready(function() {{
+      $('table').each(function() {{ new Tablesort(this); }});
+      $('#filterInput').on('keyup', function() {{
+        var value = $(this).val().toLowerCase();
+        $('#reportTable tbody tr').each(function() {{
+          var row = $(this);
+          row.toggle(row.text().toLowerCase().indexOf(value) > -1);
+        }});
+      }});
+    }});
+  </script>
+</body>
+</html>
+""")
+        return f.getvalue()
+
+def collect_sprint_rows(run, project_url):
+    sprint_id, sprint_name = find_current_sprint(run.schema(project_url))
+    rows = build_sprint_rows(run.items(project_url), sprint_id, run.status_times(project_url, sprint_id))
+    for row in rows:
+        row["project"] = project_label(project_url)
+    return sprint_name, rows
+
+def collect_sprints(run):
+    """
+    Current sprint rows of every configured project, each project fetched in its own worker.
+    An issue that sits in several projects is listed once per assignee.
+    """
+    results = run.for_each(run.project_urls, lambda url: collect_sprint_rows(run, url))
+    sprint_name = " + ".join(dict.fromkeys(name for name, _ in results))
+    data = []
+    seen = set()
+    for _, rows in results:
+        for row in rows:
+            if (row["url"], row["assignee"]) not in seen:
+                seen.add((row["url"], row["assignee"]))
+                data.append(row)
+    return sprint_name, sorted(data, key=lambda x: (x["assignee"] == "Unassigned", x["assignee"]))
+
+def collect_sprint_report(run):
+    sprint_name, data = collect_sprints(run)
+    users = run.users({issue["assignee"] for issue in data})
+    for issue in data:
+        issue["team"] = determine_team(issue["name"], issue["assignee"], users)
+    return sprint_name, data, users
+
+def build_sprint_report(run):
+    sprint_name, data, users = collect_sprint_report(run)
+    return sprint_name, data, render_sprint_report(data, sprint_name, users, run.now,
+                                                   run.budget.banner_html((STATUS_HISTORY_STAGE,)))
+
+def run_sprint_report(run, options):
+    sprint_name, data, users = collect_sprint_report(run)
+    snapshot = [dict(issue, sprint=sprint_name) for issue in data]
+    if options.history_dir:
+        append_snapshot(options.history_dir, "sprint", snapshot)
+        compact_history(options.history_dir, "sprint")
+
+    # Time in status grows every day; the report is regenerated when anything else changes
+    digest = dataset_hash(snapshot, ignore=STATUS_TIME_FIELDS)
+    previous = unchanged_output(options.manifest, "sprint", digest)
+    if previous:
+        print(f"Sprint data unchanged since {previous}, report not regenerated")
+        return None
+
+    filename = f"report_sprint_{sprint_name}_{run.now.strftime('%Y%m%d_%H%M%S')}.html"
+    write_report(filename, render_sprint_report(data, sprint_name, users, run.now,
+                                                run.budget.banner_html((STATUS_HISTORY_STAGE,))))
+    print(f"Report written to {filename}")
+    export_dataset(data, os.path.splitext(filename)[0], options.export)
+    if options.delta_dir:
+        run_delta_stage(options.delta_dir, "sprint", f"Sprint Report - {sprint_name}", data,
+                        key_fields=("url", "assignee"),
+                        tracked_fields=("name", "team", "type", "priority", "status", "estimate", "time_spent"),
+                        label_field="name", url_field="url")
+    record_output(options.manifest, "sprint", digest, filename)
+    return filename
@@ -0,0 +1,132 @@
+import io
+import os
+
+from report_export import export_dataset, write_report
+from report_history import append_snapshot, compact_history
+from report_manifest import dataset_hash, record_output, unchanged_output
+from sprint_report import collect_sprints
+from user_directory import display_name
+
+STATUSES_TO_SHOW_BY_DEFAULT = ["In Progress", "In Review", "In Test"]
+
+def render_sprint_report_v1(data, sprint_name, users, now):
+    timestamp_display = now.strftime("%Y.%m.%d %H:%M:%S")
+    statuses_js = ', '.join([f'\"{s.lower()}\"' for s in STATUSES_TO_SHOW_BY_DEFAULT])
+
+    with io.StringIO() as f:
+        f.write(f"""
+<html>
+<head>
+  <meta charset='utf-8'>
+  <title>GitHub Sprint Report - {sprint_name} - {timestamp_display}</title>
+  <style>
+    body {{ font-family: sans-serif; }}
+    table {{ border-collapse: collapse; width: 100%; }}
+    th, td {{ border: 1px solid #ccc; padding: 4px; text-align: left; }}
+    th {{ background-color: #f2f2f2; cursor: pointer; }}
+    tr:hover {{ background-color: #f1f1f1; }}
+    .numeric {{ text-align: right; }}
+  </style>
+  <script src='https://cdnjs.cloudflare.com/ajax/libs/tablesort/5.2.1/tablesort.min.js'></script>
+  <script src='https://code.jquery.com/jquery-3.6.0.min.js'></script>
+</head>
+<body>
+  <h1>Sprint Report - {sprint_name} - {timestamp_display}</h1>
+  <input type='text' id='filterInput' placeholder='Filter table...' style='margin-bottom:10px;width:300px;padding:5px;'>
+  <button id='showAllButton' style='margin-left:10px;padding:5px;'>Show all</button>
+  <table id='reportTable'>
+    <thead>
+      <tr>
+        <th>Assignee &#x25B2;&#x25BC;</th>
+        <th>Name &#x25B2;&#x25BC;</th>
+        <th>Type &#x25B2;&#x25BC;</th>
+        <th>Priority &#x25B2;&#x25BC;</th>
+        <th>Status &#x25B2;&#x25BC;</th>
+        <th>Estimate, md &#x25B2;&#x25BC;</th>
+        <th>Time Spent, md &#x25B2;&#x25BC;</th>
+        <th>URL</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+
+        assignee_colors = {}
+        color_palette = ["#f0f8ff", "#f5f5dc", "#f0fff0", "#fffaf0", "#fdf5e6", "#f5fffa", "#fffff0", "#f0ffff"]
+
+        for issue in data:
+            assignee = issue['assignee']
+            assignee_display = display_name(users, assignee)
+            if assignee not in assignee_colors:
+                assignee_colors[assignee] = color_palette[len(assignee_colors) % len(color_palette)]
+            color = assignee_colors[assignee]
+
+            estimate_display = issue['estimate'] if issue['estimate'] is not None else ""
+            time_spent_display = issue['time_spent'] if issue['time_spent'] is not None else ""
+
+            f.write(f"      <tr style='background-color:{color};'>")
+            f.write(f"        <td>{assignee_display}</td>")
+            f.write(f"        <td>{issue['name']}</td>")
+            f.write(f"        <td>{issue['type']}</td>")
+            f.write(f"        <td>{issue['priority']}</td>")
+            f.write(f"        <td>{issue['status']}</td>")
+            f.write(f"        <td class='numeric'>{estimate_display}</td>")
+            f.write(f"        <td class='numeric'>{time_spent_display}</td>")
+            f.write(f"        <td><a href='{issue['url']}' target='_blank'>Link</a></td>")
+            f.write("      </tr>")
+
+        f.write(f"""
+    </tbody>
+  </table>
+  <script>
+    const statusesToShow = new Set([{statuses_js}]);
+    $(document).ready(function() {{
+      $('table').each(function() {{ new Tablesort(this); }});
+      function filterTable() {{
+        var value = $('#filterInput').val().toLowerCase();
+        var showAll = $('#showAllButton').data('showAll') === true;
+        $('table tbody tr').each(function() {{
+          var row = $(this);
+          var statusText = row.find('td:nth-child(5)').text().toLowerCase();
+          var matchesStatus = showAll || statusesToShow.has(statusText);
+          var matchesSearch = row.text().toLowerCase().indexOf(value) > -1;
+          row.toggle(matchesStatus && matchesSearch);
+        }});
+      }}
+      $('#filterInput').on('keyup', filterTable);
+      $('#showAllButton').on('click', function() {{
+        $(this).data('showAll', true);
+        filterTable();
+      }});
+      filterTable();
+    }});
+  </script>
+</body>
+</html>
+""")
+        return f.getvalue()
+
+def build_sprint_report_v1(run):
+    sprint_name, data = collect_sprints(run)
+    users = run.users({issue["assignee"] for issue in data})
+    return sprint_name, data, render_sprint_report_v1(data, sprint_name, users, run.now)
+
+def run_sprint_report_v1(run, options):
+    sprint_name, data = collect_sprints(run)
+    snapshot = [dict(issue, sprint=sprint_name) for issue in data]
+    if options.history_dir:
+        append_snapshot(options.history_dir, "sprint-v1", snapshot)
+        compact_history(options.history_dir, "sprint-v1")
+
+    digest = dataset_hash(snapshot)
+    previous = unchanged_output(options.manifest, "sprint-v1", digest)
+    if previous:
+        print(f"Sprint data unchanged since {previous}, report not regenerated")
+        return None
+
+    users = run.users({issue["assignee"] for issue in data})
+    filename = f"report_sprint_{sprint_name}_{run.now.strftime('%Y%m%d_%H%M%S')}.html"
+    write_report(filename, render_sprint_report_v1(data, sprint_name, users, run.now))
+    print(f"Report written to {filename}")
+    export_dataset(data, os.path.splitext(filename)[0], options.export)
+    record_output(options.manifest, "sprint-v1", digest, filename)
+    return filename
@@ -0,0 +1,198 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from github_api import log, run_query
+
+STATUS_HISTORY_FILE = os.environ.get("REPORT_STATUS_HISTORY", ".report-cache/status-history.sqlite")
+# Issues per aliased timeline query
+ITEMS_PER_HISTORY_QUERY = 20
+HISTORY_WORKERS = 4
+# The timeline only feeds the time-in-status columns, the sprint report can be built without it
+STATUS_HISTORY_STAGE = "status history"
+NO_STATUS = "No Status"
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS status_history (
+    item_id TEXT PRIMARY KEY,
+    updated_at TEXT NOT NULL,
+    events TEXT NOT NULL
+);
+"""
+
+# When the issue was added to a project and every status change since, newest last
+STATUS_EVENTS_FRAGMENT = """
+fragment StatusEvents on Issue {
+  timelineItems(last: 100, itemTypes: [ADDED_TO_PROJECT_V2_EVENT, PROJECT_V2_ITEM_STATUS_CHANGED_EVENT]) {
+    nodes {
+      __typename
+      ... on AddedToProjectV2Event {
+        createdAt
+        project {
+          id
+        }
+      }
+      ... on ProjectV2ItemStatusChangedEvent {
+        createdAt
+        previousStatus
+        status
+        project {
+          id
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def status_history_query(count):
+    """
+    Query with one aliased node per issue: i0 .. i<count-1>, issue ids in $id0 .. $id<count-1>.
+    """
+    params = ", ".join(f"$id{i}: ID!" for i in range(count))
+    fields = "\n".join(f"  i{i}: node(id: $id{i}) {{ ...StatusEvents }}" for i in range(count))
+    return f"query({params}) {{\n{fields}\n}}\n" + STATUS_EVENTS_FRAGMENT
+
+
+def parse_status_events(node, project_id):
+    """
+    Events of one issue in one project, oldest first: {"at", "from", "to"}; "from" and "to"
+    are None for the event that added the issue to the project.
+    """
+    events = []
+    for event in ((node or {}).get("timelineItems") or {}).get("nodes", []):
+        if (event.get("project") or {}).get("id") != project_id or not event.get("createdAt"):
+            continue
+        if event["__typename"] == "ProjectV2ItemStatusChangedEvent":
+            events.append({"at": event["createdAt"], "from": event.get("previousStatus") or NO_STATUS,
+                           "to": event.get("status") or NO_STATUS})
+        else:
+            events.append({"at": event["createdAt"], "from": None, "to": None})
+    return sorted(events, key=lambda event: event["at"])
+
+
+def _parse_time(value):
+    return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+
+
+def status_periods(events):
+    """
+    Days spent in every status up to the last status change, and the time of that last change
+    (the start of the current period, None without events). Time before the first event is unknown
+    and not counted. Both only change when a new event arrives.
+    """
+    days = {}
+    since = None
+    for event in events:
+        at = _parse_time(event["at"])
+        if since is not None and event["from"] is not None:
+            days[event["from"]] = days.get(event["from"], 0.0) + (at - since).total_seconds() / 86400
+        since = at
+    return days, since
+
+
+def status_durations(events, current_status, now):
+    """
+    Days spent in every status, and the days in the current one: the periods closed by the
+    events plus the current period, which runs until now in the item's current status.
+    """
+    days, since = status_periods(events)
+    if since is None:
+        return {}, None
+    current = (now - since).total_seconds() / 86400
+    status = current_status or NO_STATUS
+    days[status] = days.get(status, 0.0) + current
+    return days, current
+
+
+class StatusHistoryCache:
+    """
+    Status events of project items keyed by item id and the item's updatedAt: a status change
+    updates the item, so a cached timeline stays valid until the item changes again.
+    """
+
+    def __init__(self, path=STATUS_HISTORY_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA_SQL)
+
+    def close(self):
+        self.db.close()
+
+    def get(self, item_id, updated_at):
+        with self.lock:
+            row = self.db.execute("SELECT updated_at, events FROM status_history WHERE item_id = ?",
+                                  (item_id,)).fetchone()
+        return json.loads(row[1]) if row and row[0] == updated_at else None
+
+    def save(self, entries):
+        """
+        entries: (item_id, updated_at, events) tuples.
+        """
+        with self.lock, self.db:
+            self.db.executemany("INSERT OR REPLACE INTO status_history VALUES (?, ?, ?)",
+                                [(item_id, updated_at, json.dumps(events)) for item_id, updated_at, events in entries])
+
+
+def fetch_status_events(items, project_id):
+    """
+    Status events of one chunk of items in a single aliased query. Returns {item_id: events}.
+    """
+    variables = {f"id{i}": item["id"] for i, item in enumerate(items)}
+    data = run_query(status_history_query(len(items)), variables)["data"]
+    return {item["item_id"]: parse_status_events(data.get(f"i{i}"), project_id) for i, item in enumerate(items)}
+
+
+def status_times(items, project_id, cache, budget=None, now=None, workers=HISTORY_WORKERS):
+    """
+    Time in status of every item:
+    {item_id: {"days_in_status", "status_days", "status_since", "closed_status_days"}}.
+    Only items whose updatedAt differs from the cached one are fetched, ITEMS_PER_HISTORY_QUERY
+    per request. Past the deadline of the run budget the remaining chunks are skipped and
+    their items are left out.
+    """
+    now = now or datetime.datetime.utcnow()
+    events = {}
+    missing = []
+    for item in items:
+        cached = cache.get(item["item_id"], item.get("updated_at")) if item.get("updated_at") else None
+        if cached is None:
+            missing.append(item)
+        else:
+            events[item["item_id"]] = cached
+    chunks = [missing[start:start + ITEMS_PER_HISTORY_QUERY]
+              for start in range(0, len(missing), ITEMS_PER_HISTORY_QUERY)]
+
+    def fetch(chunk):
+        if budget is None:
+            return fetch_status_events(chunk, project_id)
+        return budget.optional(STATUS_HISTORY_STAGE, lambda: fetch_status_events(chunk, project_id), fallback={})
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for chunk, fetched in zip(chunks, pool.map(fetch, chunks)):
+            events.update(fetched)
+            cache.save([(item["item_id"], item["updated_at"], fetched[item["item_id"]])
+                        for item in chunk if item.get("updated_at") and item["item_id"] in fetched])
+    log(f"Status history: {len(items) - len(missing)} item(s) cached, {len(missing)} fetched "
+        f"in {len(chunks)} request(s)")
+
+    times = {}
+    for item in items:
+        if item["item_id"] not in events:
+            continue
+        closed_days, since = status_periods(events[item["item_id"]])
+        status_days, current = status_durations(events[item["item_id"]], item.get("status"), now)
+        times[item["item_id"]] = {
+            "days_in_status": current,
+            "status_days": status_days,
+            # The clock-independent part, from which the report recomputes the above when it is opened
+            "status_since": since.strftime("%Y-%m-%dT%H:%M:%SZ") if since else "",
+            "closed_status_days": {status: round(days, 3) for status, days in closed_days.items()},
+        }
+    return times
@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive_paging import AdaptivePageSize  # noqa: E402
+
+
+def pager():
+    return AdaptivePageSize(start=50, minimum=10, maximum=100, target_seconds=4, target_bytes=10 ** 9,
+                            target_cost=10 ** 6)
+
+
+def test_fast_pages_grow_at_most_twofold_up_to_the_maximum():
+    page = pager()
+    assert page.observe(50, seconds=0.1, size_bytes=1000) == 100
+    assert page.observe(100, seconds=0.1, size_bytes=1000) == 100
+
+
+def test_slow_pages_shrink_towards_the_latency_target():
+    page = pager()
+    # 0.2s per item: 20 items take the 4s target
+    assert page.observe(50, seconds=10, size_bytes=1000) == 20
+    assert page.observe(20, seconds=100, size_bytes=1000) == 10
+
+
+def test_cost_and_size_targets_bound_the_page():
+    page = AdaptivePageSize(start=50, minimum=10, maximum=100, target_seconds=60, target_bytes=30_000,
+                            target_cost=10 ** 6)
+    assert page.observe(50, seconds=1, size_bytes=50_000) == 30
+    page = AdaptivePageSize(start=50, minimum=10, maximum=100, target_seconds=60, target_bytes=10 ** 9,
+                            target_cost=5)
+    assert page.observe(50, seconds=1, size_bytes=1000, cost=10) == 25
+
+
+def test_after_a_resource_limit_growth_bisects_below_the_failing_size():
+    page = pager()
+    assert page.shrink() and page.size == 25
+    assert page.ceiling == 49
+    sizes = [page.observe(page.size, seconds=0.01, size_bytes=100) for _ in range(6)]
+    assert sizes[0] == 37
+    assert max(sizes) == 49
+    assert page.shrink() and page.size == 24
+
+
+def test_shrink_stops_at_the_minimum():
+    page = AdaptivePageSize(start=12, minimum=10, maximum=100)
+    assert page.shrink() and page.size == 10
+    assert not page.shrink()
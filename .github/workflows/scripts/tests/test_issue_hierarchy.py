@@ -0,0 +1,51 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import issue_hierarchy  # noqa: E402
+from issue_hierarchy import build_hierarchy, descendants, rollup_hierarchy, root_of  # noqa: E402
+
+
+def issue(issue_id, status="Todo", estimate=None, time_spent=None, children=0):
+    return {"id": issue_id, "status": status, "estimate": estimate, "time_spent": time_spent,
+            "sub_issue_total": children}
+
+
+# epic -> story (-> task1, task2), bug; task2 also lists the epic as its child (a cycle)
+TREE = {
+    "epic": [issue("story", "In Progress", 3, 1, children=2), issue("bug", "Done", 1, 1)],
+    "story": [issue("task1", "Done", 2, 2), issue("task2", estimate="", children=1)],
+    "task2": [issue("epic")],
+}
+
+
+def test_trees_are_walked_to_any_depth_once_per_issue(monkeypatch):
+    fetched = []
+
+    def fetch_subissues(parent, schema):
+        fetched.append(parent["id"])
+        return TREE.get(parent["id"], [])
+
+    monkeypatch.setattr(issue_hierarchy, "fetch_subissues", fetch_subissues)
+    hierarchy = build_hierarchy([issue("epic", children=2)], schema={})
+
+    # Issues without sub-issues are not queried
+    assert sorted(fetched) == ["epic", "story", "task2"]
+    assert [(node["id"], depth) for node, depth in descendants(hierarchy)] == [
+        ("story", 1), ("task1", 2), ("task2", 2), ("bug", 1)]
+    assert root_of(hierarchy, "task2") == "epic"
+
+    rollups = rollup_hierarchy(hierarchy)
+    assert rollups["story"] == {"issues": 3, "estimate": 5, "time_spent": 3,
+                                "status_counts": {"In Progress": 1, "Done": 1, "Todo": 1}}
+    assert rollups["epic"]["issues"] == 5
+    assert (rollups["epic"]["estimate"], rollups["epic"]["time_spent"]) == (6, 4)
+    assert rollups["epic"]["status_counts"] == {"Todo": 2, "In Progress": 1, "Done": 2}
+
+
+def test_depth_limit_keeps_deeper_issues_as_leaves(monkeypatch):
+    monkeypatch.setattr(issue_hierarchy, "fetch_subissues", lambda parent, schema: TREE.get(parent["id"], []))
+    hierarchy = build_hierarchy([issue("epic", children=2)], schema={}, max_depth=1)
+    assert sorted(hierarchy["nodes"]) == ["bug", "epic", "story"]
+    assert rollup_hierarchy(hierarchy)["story"]["issues"] == 1
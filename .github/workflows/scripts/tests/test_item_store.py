@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from item_store import ItemStore  # noqa: E402
+
+SCHEMA = {"project_id": "P1"}
+URL = "https://github.com/orgs/o/projects/1"
+
+
+def item(item_id, updated_at, status):
+    return {"item_id": item_id, "id": f"issue-{item_id}", "updated_at": updated_at, "status": status}
+
+
+def test_reconcile_keeps_rows_updated_after_the_scan(tmp_path):
+    store = ItemStore(str(tmp_path / "items.sqlite"))
+    store.reconcile_project(URL, SCHEMA, [item("a", "2026-01-01T00:00:00Z", "Todo"),
+                                          item("b", "2026-01-01T00:00:00Z", "Todo")])
+    # Webhook updates while the next scan is running: one edit, one newly added item
+    store.upsert_item(URL, item("a", "2026-01-02T10:00:00Z", "Done"))
+    store.upsert_item(URL, item("c", "2026-01-02T10:00:00Z", "Todo"))
+
+    store.reconcile_project(URL, SCHEMA, [item("a", "2026-01-01T00:00:00Z", "Todo")],
+                            started_at="2026-01-02T09:00:00Z")
+
+    rows = {row["item_id"]: row["status"] for row in store.items(URL)}
+    assert rows == {"a": "Done", "c": "Todo"}
+    store.close()
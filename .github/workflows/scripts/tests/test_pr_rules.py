@@ -0,0 +1,63 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pr_rules import apply_attention_rules, compile_rules, load_rules, rules_legend  # noqa: E402
+
+NOW = datetime.datetime(2026, 3, 20, 12, 0, 0)
+
+
+def pr(**fields):
+    return dict({"title": "feat: x", "created_at": "2026-03-19T12:00:00Z", "issues": [("u", "#1")],
+                 "projects": ["APIHUB"]}, **fields)
+
+
+def reasons(prs, rules):
+    return [p["attention_reasons"] for p in apply_attention_rules(prs, rules, now=NOW)]
+
+
+def test_rules_from_the_shipped_file():
+    rules = load_rules()
+    prs = [
+        pr(),
+        pr(created_at="2026-03-01T12:00:00Z"),
+        pr(title="chore: bump", issues=[], projects=[]),
+        pr(title="feat: y", issues=[], projects=[]),
+        pr(review_decision="APPROVED", approved_at="2026-03-15T12:00:00Z"),
+    ]
+    result = dict(zip(("fresh", "old", "chore", "untracked", "approved"), reasons(prs, rules)))
+    assert result["fresh"] == []
+    assert result["old"] == ["PR open for more than 10 days"]
+    assert result["chore"] == ["No linked issues and not assigned to any GitHub Project"]
+    assert len(result["untracked"]) == 2
+    assert len(result["approved"]) == 1 and "Approved" in result["approved"][0]
+    assert apply_attention_rules([pr()], rules, now=NOW)[0]["age_days"] == 1
+
+
+def test_text_conditions_ignore_case():
+    rules = compile_rules([{"id": "wip", "description": "Work in progress",
+                            "when": [{"field": "title", "op": "startswith", "value": "WIP"}]}])
+    assert reasons([pr(title="wip: draft"), pr(title="feat: done")], rules) == [["Work in progress"], []]
+
+
+@pytest.mark.parametrize("rule, message", [
+    ({"id": "r", "description": "d", "when": [{"field": "nope", "op": "eq", "value": 1}]}, "unknown field"),
+    ({"id": "r", "description": "d", "when": [{"field": "age_days", "op": "between", "value": 1}]},
+     "unknown operator"),
+    ({"id": "r", "description": "d", "when": []}, "has no conditions"),
+    ({"id": "r", "when": [{"field": "age_days", "op": "gt", "value": 1}]}, "'description' must be"),
+])
+def test_broken_rules_are_rejected_by_name(rule, message):
+    with pytest.raises(Exception, match=message) as error:
+        compile_rules([rule])
+    assert "'r'" in str(error.value)
+
+
+def test_legend_keeps_file_order():
+    legend = rules_legend(load_rules())
+    assert legend[0]["id"] == "open_more_than_10_days"
+    assert all(entry["description"] for entry in legend)
@@ -0,0 +1,52 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from github_api import QueryMemo  # noqa: E402
+
+
+class Response:
+    def __init__(self, status_code=200, content=b'{"data": {}}'):
+        self.status_code = status_code
+        self.content = content
+
+
+def test_concurrent_identical_requests_share_one_call():
+    memo = QueryMemo()
+    release = threading.Event()
+    calls = []
+
+    def send():
+        calls.append(1)
+        release.wait(5)
+        return Response()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(memo.get, "key", send) for _ in range(4)]
+        while memo.metrics()["coalesced"] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        responses = [future.result() for future in futures]
+    assert len(calls) == 1
+    assert all(response is responses[0] for response in responses)
+    assert memo.get("key", send) is responses[0]
+    assert memo.metrics() == {"hits": 1, "coalesced": 3, "misses": 1}
+
+
+def test_failed_responses_are_not_kept():
+    def connection_reset():
+        raise ConnectionError("reset")
+
+    memo = QueryMemo()
+    assert memo.get("key", lambda: Response(content=b'{"errors": []}')).content == b'{"errors": []}'
+    assert memo.get("key", lambda: Response(status_code=502)).status_code == 502
+    with pytest.raises(ConnectionError):
+        memo.get("key", connection_reset)
+    assert memo.get("key", Response).status_code == 200
+    assert memo.get("key", lambda: Response(status_code=500)).status_code == 200
+    assert memo.metrics() == {"hits": 1, "coalesced": 0, "misses": 4}
@@ -0,0 +1,132 @@
+"""
+Parity of the report modules with the standalone scripts they replaced. The expected rows
+were produced by the scripts as they were before the move (get_issues_by_assignee of the
+v2 sprint report, get_issues_for_sprints of the release report, get_attention_reasons of the
+PR report) from the same project items and PRs.
+"""
+import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pr_rules import apply_attention_rules, load_rules  # noqa: E402
+from project_items import normalize_item  # noqa: E402
+from release_report import build_release_rows  # noqa: E402
+from sprint_report import build_sprint_rows  # noqa: E402
+from user_directory import ASSIGNEE_OVERRIDES, determine_team, display_name  # noqa: E402
+
+SCHEMA = {
+    "field_options": {"Status": {"st1": "In Progress", "st2": "Done"}, "Priority": {"p1": "High"}},
+    "numeric_fields": {"estimate": "F_EST", "time_spent": "F_TIME"},
+}
+
+
+def select(field, option):
+    return {"__typename": "ProjectV2ItemFieldSingleSelectValue", "optionId": option, "field": {"name": field}}
+
+
+def number(field_id, value):
+    return {"__typename": "ProjectV2ItemFieldNumberValue", "number": value, "field": {"id": field_id, "name": "x"}}
+
+
+def iteration(iteration_id):
+    return {"__typename": "ProjectV2ItemFieldIterationValue", "iterationId": iteration_id}
+
+
+def issue(title, url, assignees=(), issue_type=None, parent=None, fields=()):
+    return {
+        "content": {"title": title, "url": url, "issueType": {"name": issue_type} if issue_type else None,
+                    "parent": parent, "assignees": {"nodes": [{"login": login} for login in assignees]}},
+        "fieldValues": {"nodes": list(fields)},
+    }
+
+
+ITEMS = [
+    issue("[BE] Paging", "https://github.com/o/r/issues/1", ["karpov-aleksandr", "b41ex"], "Task",
+          {"title": "Epic", "url": "https://github.com/o/r/issues/9"},
+          [iteration("S1"), select("Status", "st1"), select("Priority", "p1"), number("F_EST", 3),
+           number("F_TIME", 1.5)]),
+    issue("Unassigned work", "https://github.com/o/r/issues/2", fields=[iteration("S1")]),
+    issue("Next sprint bug", "https://github.com/o/r/issues/3", ["b41ex"], "Bug",
+          fields=[iteration("S2"), select("Status", "st2"), number("F_EST", 2)]),
+    {"content": None, "fieldValues": {"nodes": [iteration("S1")]}},
+    issue("Unknown option", "https://github.com/o/r/issues/4", ["someone"],
+          fields=[iteration("S1"), select("Status", "gone"), select("Size", "s1")]),
+    issue("Outside the release", "https://github.com/o/r/issues/5", ["b41ex"], fields=[iteration("S9")]),
+]
+
+OLD_SPRINT_ROWS = [
+    {"assignee": "b41ex", "name": "[BE] Paging", "type": "Task", "priority": "High", "status": "In Progress",
+     "url": "https://github.com/o/r/issues/1", "estimate": 3, "time_spent": 1.5},
+    {"assignee": "karpov-aleksandr", "name": "[BE] Paging", "type": "Task", "priority": "High",
+     "status": "In Progress", "url": "https://github.com/o/r/issues/1", "estimate": 3, "time_spent": 1.5},
+    {"assignee": "someone", "name": "Unknown option", "type": "Empty", "priority": "Empty", "status": "gone",
+     "url": "https://github.com/o/r/issues/4", "estimate": "", "time_spent": ""},
+    {"assignee": "Unassigned", "name": "Unassigned work", "type": "Empty", "priority": "Empty", "status": "Empty",
+     "url": "https://github.com/o/r/issues/2", "estimate": "", "time_spent": ""},
+]
+OLD_SPRINT_TEAMS = ["BE", "BE", "Not Defined", "Not Defined"]
+
+OLD_RELEASE_ROWS = [
+    {"assignee": "Aleksandr V. Karpov (karpov-aleksandr)", "issue_name": "[BE] Paging",
+     "issue_url": "https://github.com/o/r/issues/1", "type": "Task", "priority": "High", "status": "In Progress",
+     "sprint": "26.4 Sprint 1", "parent_name": "Epic", "parent_url": "https://github.com/o/r/issues/9",
+     "estimate": 3, "time_spent": 1.5},
+    {"assignee": "Unassigned", "issue_name": "Unassigned work", "issue_url": "https://github.com/o/r/issues/2",
+     "type": "Empty", "priority": "Empty", "status": "Empty", "sprint": "26.4 Sprint 1", "parent_name": "",
+     "parent_url": "", "estimate": "", "time_spent": ""},
+    {"assignee": "Alexey Bochencev (b41ex)", "issue_name": "Next sprint bug",
+     "issue_url": "https://github.com/o/r/issues/3", "type": "Bug", "priority": "Empty", "status": "Done",
+     "sprint": "26.4 Sprint 2", "parent_name": "", "parent_url": "", "estimate": 2, "time_spent": ""},
+    {"assignee": "someone", "issue_name": "Unknown option", "issue_url": "https://github.com/o/r/issues/4",
+     "type": "Empty", "priority": "Empty", "status": "gone", "sprint": "26.4 Sprint 1", "parent_name": "",
+     "parent_url": "", "estimate": "", "time_spent": ""},
+]
+
+
+def normalized_items():
+    return [item for item in (normalize_item(node, SCHEMA) for node in ITEMS) if item]
+
+
+def test_sprint_rows_match_the_old_sprint_script():
+    rows = build_sprint_rows(normalized_items(), "S1")
+    assert [{key: row[key] for key in OLD_SPRINT_ROWS[0]} for row in rows] == OLD_SPRINT_ROWS
+    assert [determine_team(row["name"], row["assignee"], ASSIGNEE_OVERRIDES) for row in rows] == OLD_SPRINT_TEAMS
+
+
+def test_release_rows_match_the_old_release_script():
+    rows = build_release_rows(normalized_items(), {"S1": "26.4 Sprint 1", "S2": "26.4 Sprint 2"})
+    for row in rows:
+        row["assignee"] = display_name(ASSIGNEE_OVERRIDES, row["assignee"])
+    assert [{key: row[key] for key in OLD_RELEASE_ROWS[0]} for row in rows] == OLD_RELEASE_ROWS
+
+
+OPEN_LONG = "PR open for more than 10 days"
+NOT_EXEMPT = "No linked issues and title does not start with 'chore', 'doc', or 'tech'"
+NO_PROJECT = "No linked issues and not assigned to any GitHub Project"
+
+
+def test_attention_reasons_match_the_old_pr_script():
+    now = datetime.datetime(2026, 3, 20, 12, 0, 0)
+
+    def pr(title, age_days, issues=(), projects=()):
+        created = now - datetime.timedelta(days=age_days, hours=1)
+        return {"title": title, "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"), "issues": list(issues),
+                "projects": list(projects)}
+
+    prs = [
+        pr("feat: x", 2, issues=[("u", "#1")]),
+        pr("Fix: y", 11, projects=["P"]),
+        pr("Docs: z", 10),
+        pr("TECH debt", 30),
+        pr("refactor", 0),
+    ]
+    reasons = [p["attention_reasons"] for p in apply_attention_rules(prs, load_rules(), now=now)]
+    assert reasons == [
+        [],
+        [OPEN_LONG, NOT_EXEMPT],
+        [NO_PROJECT],
+        [OPEN_LONG, NO_PROJECT],
+        [NOT_EXEMPT, NO_PROJECT],
+    ]
@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from release_report import shard_hierarchy, shard_rows  # noqa: E402
+
+
+def test_shard_suffixes_are_unique_when_slugs_collide():
+    rows = [{"assignee": "x!"}, {"assignee": "x-2"}, {"assignee": "x?"}, {"assignee": "x"}]
+    shards = shard_rows(rows, "assignee")
+    suffixes = [suffix for _, suffix, _ in shards]
+    assert len(set(suffixes)) == len(rows)
+    assert {value for value, _, _ in shards} == {"x!", "x-2", "x?", "x"}
+
+
+def test_shard_without_value_goes_to_empty():
+    shards = shard_rows([{"assignee": ""}, {"assignee": "Bob"}], "assignee")
+    assert [(value, suffix) for value, suffix, _ in shards] == [("Bob", "bob"), ("Empty", "empty")]
+
+
+def test_shard_hierarchy_keeps_the_trees_of_the_shard_epics():
+    hierarchy = [
+        {"issue_name": "Epic A", "issue_url": "a", "depth": 0},
+        {"issue_name": "Story A1", "issue_url": "a1", "depth": 1},
+        {"issue_name": "Epic B", "issue_url": "b", "depth": 0},
+        {"issue_name": "Story B1", "issue_url": "b1", "depth": 1},
+    ]
+    rows = [{"epic_name": "Epic B", "issue_url": "b2"}]
+    assert [row["issue_url"] for row in shard_hierarchy(hierarchy, rows)] == ["b", "b1"]
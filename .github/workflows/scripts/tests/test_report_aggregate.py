@@ -0,0 +1,44 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_aggregate import group_by, group_by_totals, to_columns  # noqa: E402
+
+ROWS = [
+    {"team": "BE", "status": "Done", "estimate": 2, "time_spent": 1.5},
+    {"team": "BE", "status": "Done", "estimate": "", "time_spent": 3},
+    {"team": "FE", "status": "Todo", "estimate": 5, "time_spent": None},
+    {"team": "BE", "status": "Todo", "estimate": 1, "time_spent": 0},
+]
+
+
+def by_key(summary, *keys):
+    return {tuple(row[key] for key in keys): row for row in summary}
+
+
+def test_group_by_matches_a_per_row_aggregation():
+    summary = by_key(group_by(to_columns(ROWS), ["team", "status"]), "team", "status")
+    assert set(summary) == {("BE", "Done"), ("FE", "Todo"), ("BE", "Todo")}
+    be_done = summary[("BE", "Done")]
+    assert be_done["count"] == 2
+    # The empty estimate is not a zero: it is left out of sum, min, max and estimate_count
+    assert (be_done["estimate_sum"], be_done["estimate_count"]) == (2.0, 1)
+    assert (be_done["estimate_min"], be_done["estimate_max"]) == (2.0, 2.0)
+    assert (be_done["time_spent_sum"], be_done["time_spent_min"], be_done["time_spent_max"]) == (4.5, 1.5, 3.0)
+    fe_todo = summary[("FE", "Todo")]
+    assert (fe_todo["time_spent_sum"], fe_todo["time_spent_count"]) == (0.0, 0)
+    assert fe_todo["time_spent_min"] is None and fe_todo["time_spent_max"] is None
+
+
+def test_group_by_without_keys_is_the_total():
+    columns = to_columns(ROWS)
+    (total,) = group_by(columns, [])
+    combined = group_by_totals(group_by(columns, ["team"]))
+    assert total["count"] == combined["count"] == 4
+    for stat in ("sum", "count", "min", "max"):
+        assert total[f"estimate_{stat}"] == combined[f"estimate_{stat}"]
+
+
+def test_group_by_of_no_rows():
+    assert group_by(to_columns([]), ["team"]) == []
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_delta import diff_datasets, run_delta_stage  # noqa: E402
+
+TRACKED = ("status", "assignee", "issues")
+
+
+def test_diff_reports_added_removed_and_changed_fields():
+    previous = [
+        {"url": "u1", "status": "Todo", "assignee": "a", "issues": []},
+        {"url": "u2", "status": "Done", "assignee": "b", "issues": []},
+        {"url": "u3", "status": "Todo", "assignee": "c", "issues": []},
+    ]
+    current = [
+        {"url": "u1", "status": "In Progress", "assignee": "a", "issues": [], "age": 5},
+        {"url": "u3", "status": "Todo", "assignee": "c", "issues": []},
+        {"url": "u4", "status": "Todo", "assignee": "d", "issues": []},
+    ]
+    delta = diff_datasets(previous, current, ("url",), TRACKED)
+    assert [row["url"] for row in delta["added"]] == ["u4"]
+    assert [row["url"] for row in delta["removed"]] == ["u2"]
+    # An untracked field (age) never makes a row changed
+    assert [(entry["row"]["url"], entry["changes"]) for entry in delta["changed"]] == [
+        ("u1", [("status", "Todo", "In Progress")])]
+
+
+def test_stored_baseline_matches_tuples_of_the_next_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rows = [{"url": "u1", "status": "Todo", "assignee": "a", "issues": [("https://x/1", "#1")]}]
+    args = ("state", "prs", "PRs", rows, ("url",), TRACKED, "url", "url")
+    assert run_delta_stage(*args) is None
+    delta = run_delta_stage(*args)
+    assert delta == {"added": [], "removed": [], "changed": []}
+    assert len([name for name in os.listdir(tmp_path) if name.startswith("report_delta_prs_")]) == 1
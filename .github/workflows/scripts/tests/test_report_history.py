@@ -0,0 +1,61 @@
+import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_history import (  # noqa: E402
+    append_snapshot, compact_history, list_snapshots, load_history, sprint_progress
+)
+
+TODAY = datetime.date(2026, 6, 30)
+
+
+def item(url, status="Todo", estimate=1, sprint="Sprint 1"):
+    return {"url": url, "status": status, "estimate": estimate, "sprint": sprint}
+
+
+def test_compaction_keeps_daily_then_weekly_snapshots(tmp_path):
+    store = str(tmp_path)
+    for age in range(0, 400):
+        day = TODAY - datetime.timedelta(days=age)
+        os.makedirs(os.path.join(store, "sprint"), exist_ok=True)
+        open(os.path.join(store, "sprint", f"{day.isoformat()}.npz"), "w").close()
+
+    compact_history(store, "sprint", daily_days=60, weekly_days=365, today=TODAY)
+
+    days = [day for day, _ in list_snapshots(store, "sprint")]
+    ages = [(TODAY - day).days for day in days]
+    assert all(age <= 365 for age in ages)
+    assert [age for age in ages if age <= 60] == list(range(60, -1, -1))
+    weekly = [day for day in days if (TODAY - day).days > 60]
+    weeks = [day.isocalendar()[:2] for day in weekly]
+    # One snapshot per ISO week, the last one of the week
+    assert len(weeks) == len(set(weeks))
+    assert all(day.isoweekday() == 7 or (TODAY - day).days == 61 for day in weekly)
+
+
+def test_rerun_on_the_same_day_replaces_the_snapshot(tmp_path):
+    store = str(tmp_path)
+    append_snapshot(store, "sprint", [item("u1")], day=TODAY)
+    append_snapshot(store, "sprint", [item("u1"), item("u2"), item("u2")], day=TODAY)
+    history = load_history(store, "sprint")
+    assert sorted(history["url"]) == ["u1", "u2"]
+
+
+def test_burndown_and_velocity_from_snapshots(tmp_path):
+    store = str(tmp_path)
+    day1, day2 = TODAY - datetime.timedelta(days=1), TODAY
+    append_snapshot(store, "sprint", [item("u1", estimate=2), item("u2", estimate=3)], day=day1)
+    append_snapshot(store, "sprint", [item("u1", "Done", 2), item("u2", estimate=3), item("u3", estimate=1)],
+                    day=day2)
+
+    progress = sprint_progress(load_history(store, "sprint"))
+
+    assert progress["sprint"] == "Sprint 1"
+    first, second = progress["burndown"]
+    assert (first["scope"], first["done"], first["added_items"]) == (5.0, 0.0, 0)
+    assert (second["scope"], second["done"], second["remaining"]) == (6.0, 2.0, 4.0)
+    assert (second["added_items"], second["added_estimate"]) == (1, 1.0)
+    assert progress["velocity"] == [{"sprint": "Sprint 1", "last_snapshot": day2.isoformat(), "scope": 6.0,
+                                     "done": 2.0, "done_items": 1}]
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_manifest import dataset_hash, record_output, unchanged_output  # noqa: E402
+
+
+def test_hash_ignores_row_and_key_order():
+    rows = [{"title": "a", "estimate": 1}, {"title": "b", "estimate": 2}]
+    shuffled = [{"estimate": 2, "title": "b"}, {"estimate": 1, "title": "a"}]
+    assert dataset_hash(rows) == dataset_hash(shuffled)
+    assert dataset_hash(rows) != dataset_hash([{"title": "a", "estimate": 1}, {"title": "b", "estimate": 3}])
+
+
+def test_hash_treats_numpy_values_like_plain_ones():
+    assert dataset_hash([{"estimate": np.float64(1.5), "issues": (1, 2)}]) == \
+        dataset_hash([{"estimate": 1.5, "issues": [1, 2]}])
+
+
+def test_ignored_fields_do_not_count():
+    assert dataset_hash([{"number": 1, "age": 3}], ignore=("age",)) == \
+        dataset_hash([{"number": 1, "age": 4}], ignore=("age",))
+
+
+def test_only_the_latest_dataset_is_unchanged(tmp_path):
+    manifest = str(tmp_path / "manifest.json")
+    assert unchanged_output(manifest, "sprint", "h1") is None
+    record_output(manifest, "sprint", "h1", "report_1.html")
+    assert unchanged_output(manifest, "sprint", "h1") == "report_1.html"
+    record_output(manifest, "sprint", "h2", "report_2.html")
+    assert unchanged_output(manifest, "sprint", "h1") is None
+    assert unchanged_output(manifest, "release", "h2") is None
+    assert unchanged_output(None, "sprint", "h2") is None
@@ -0,0 +1,24 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scan_checkpoint import ScanCheckpoint  # noqa: E402
+
+
+def test_resume_cuts_off_a_partly_written_page(tmp_path):
+    path = str(tmp_path / "items.jsonl")
+    first = ScanCheckpoint(path, "items", "f1")
+    first.start()
+    first.append(1, "c1", [["i1", {"title": "one"}]], False)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"page": 2, "after": "c2", "do')
+
+    resumed = ScanCheckpoint(path, "items", "f1", resume=True)
+    state = resumed.load()
+    assert (state["page"], state["after"], state["done"]) == (1, "c1", False)
+    resumed.append(2, "c2", [["i2", {"title": "two"}]], True)
+
+    state = ScanCheckpoint(path, "items", "f1", resume=True).load()
+    assert (state["page"], state["done"]) == (2, True)
+    assert [item_id for item_id, _ in state["scanned"]] == ["i1", "i2"]
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from token_pool import TokenExhaustedError, TokenPool  # noqa: E402
+
+
+def test_requests_go_to_the_token_with_most_headroom():
+    pool = TokenPool(["a", "b"], limit=100, reserve=0)
+    pool.record("a", "graphql", 10, time.time() + 3600)
+    assert [pool.acquire("graphql") for _ in range(3)] == ["b", "b", "b"]
+    # Budgets are per resource
+    assert pool.acquire("core") == "a"
+
+
+def test_ties_spread_the_load_over_all_tokens():
+    pool = TokenPool(["a", "b", "c"], limit=100, reserve=0)
+    assert sorted(pool.acquire("graphql") for _ in range(6)) == ["a", "a", "b", "b", "c", "c"]
+
+
+def test_budget_from_response_headers():
+    pool = TokenPool(["a", "b"], limit=100, reserve=0)
+    exhausted = pool.update("a", "core", {"X-RateLimit-Remaining": "0", "X-RateLimit-Resource": "graphql",
+                                          "X-RateLimit-Reset": str(int(time.time()) + 60)})
+    assert exhausted
+    assert pool.acquire("graphql") == "b"
+    assert not pool.update("a", "graphql", {})
+
+
+def test_exhausted_pool_raises_until_the_reset():
+    pool = TokenPool(["a", "b"], limit=100, reserve=5)
+    pool.record("a", "graphql", 5, time.time() + 3600)
+    pool.record("b", "graphql", 3, time.time() + 3600)
+    with pytest.raises(TokenExhaustedError):
+        pool.acquire("graphql")
+    pool.record("b", "graphql", 3, time.time() - 1)
+    assert pool.acquire("graphql") == "b"
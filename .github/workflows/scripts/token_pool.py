@@ -0,0 +1,92 @@
+import os
+import re
+import threading
+import time
+
+# GitHub's hourly primary limit per token, assumed until a response reports the real numbers
+DEFAULT_LIMIT = 5000
+# Headroom left unused on every token, so a token is abandoned before requests start failing
+RESERVE = int(os.environ.get("GITHUB_TOKEN_RESERVE", "50"))
+
+
+class TokenExhaustedError(Exception):
+    """
+    Every token of the pool is out of budget for this resource until its reset time.
+    """
+
+
+def load_tokens():
+    """
+    GITHUB_TOKENS (comma or whitespace separated PATs / app installation tokens), else GITHUB_TOKEN.
+    """
+    tokens = [token for token in re.split(r"[\s,]+", os.environ.get("GITHUB_TOKENS", "")) if token]
+    if not tokens and os.environ.get("GITHUB_TOKEN"):
+        tokens = [os.environ["GITHUB_TOKEN"]]
+    return tokens or [None]
+
+
+def mask(token):
+    return f"...{token[-4:]}" if token else "anonymous"
+
+
+class TokenPool:
+    """
+    Several tokens used as one budget. The remaining budget of every token and resource
+    (graphql, core, search) is tracked from the X-RateLimit-* headers of its responses;
+    each request goes to the token with the most headroom, so the load spreads evenly
+    and a token that runs out is simply no longer picked until its reset time.
+    """
+
+    def __init__(self, tokens, limit=DEFAULT_LIMIT, reserve=RESERVE):
+        self.tokens = list(tokens)
+        self.limit = limit
+        self.reserve = reserve
+        self.lock = threading.Lock()
+        # (token, resource) -> {"remaining", "reset"}
+        self.budgets = {}
+
+    def _budget(self, token, resource, now):
+        budget = self.budgets.setdefault((token, resource), {"remaining": self.limit, "reset": 0})
+        if budget["reset"] and budget["reset"] <= now:
+            budget.update(remaining=self.limit, reset=0)
+        return budget
+
+    def acquire(self, resource):
+        """
+        Token for the next request on resource; its budget is reserved right away so that
+        concurrent workers do not all pick the same token.
+        """
+        with self.lock:
+            now = time.time()
+            budgets = [(self._budget(token, resource, now), token) for token in self.tokens]
+            available = [(budget["remaining"], -i, token) for i, (budget, token) in enumerate(budgets)
+                         if budget["remaining"] > self.reserve or len(self.tokens) == 1]
+            if not available:
+                reset = min(budget["reset"] for budget, _ in budgets)
+                raise TokenExhaustedError(
+                    f"All {len(self.tokens)} GitHub tokens are out of {resource} budget until "
+                    f"{time.strftime('%H:%M:%S', time.localtime(reset))}")
+            _, _, token = max(available)
+            self._budget(token, resource, now)["remaining"] -= 1
+            return token
+
+    def update(self, token, resource, headers):
+        """
+        Record the budget reported by a response. Returns True if the token is now exhausted.
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return False
+        return self.record(token, headers.get("X-RateLimit-Resource") or resource,
+                           int(remaining), int(headers.get("X-RateLimit-Reset") or 0))
+
+    def record(self, token, resource, remaining, reset):
+        with self.lock:
+            budget = self.budgets.setdefault((token, resource), {"remaining": self.limit, "reset": 0})
+            budget.update(remaining=remaining, reset=reset)
+            return remaining <= 0
+
+    def status(self):
+        with self.lock:
+            return {f"{mask(token)} {resource}": budget["remaining"]
+                    for (token, resource), budget in sorted(self.budgets.items(), key=lambda entry: entry[0][1])}
@@ -0,0 +1,135 @@
+import json
+import os
+import time
+
+from github_api import post_graphql
+
+USER_CACHE_FILE = os.environ.get("GITHUB_USER_CACHE", os.path.join(".report-cache", "github-users.json"))
+USER_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# A failed lookup is not retried before this, so an outage costs one request per hour, not one per report
+USER_LOOKUP_RETRY_SECONDS = 3600
+NOT_A_USER = ("Unassigned", "Empty", "TODO", "")
+
+# Static overrides: a name or team here always wins over what GitHub returns
+ASSIGNEE_OVERRIDES = {
+    "alagishev": {"name": "Aleksandr Agishev", "team": "BE"},
+    "b41ex": {"name": "Alexey Bochencev", "team": "FE"},
+    "iurii-golovinskii": {"name": "Iurii Golovinskii", "team": "FE"},
+    "makeev-pavel": {"name": "Pavel Makeev", "team": "FE"},
+    "JayLim2": {"name": "Sergei Komarov", "team": "FE"},
+    "viacheslav-lunev": {"name": "Viacheslav Lunev", "team": "BE"},
+    "karpov-aleksandr": {"name": "Aleksandr V. Karpov", "team": "BE"},
+    "CountRedClaw": {"name": "Ilia Borsuk", "team": None},
+    "AndreiChek": {"name": "Andrei Chekalin", "team": None},
+    "Roman-cod": {"name": "Roman Babenko", "team": None},
+    "raa1618033": {"name": "Alexey Rodionov", "team": None},
+    "tiutiunnyk-ivan": {"name": "Ivan Tiutiunnyk", "team": None},
+    "Maryna-Ko": {"name": "Maryna Kovalenko", "team": None},
+    "ArtemNalesnikovskyi": {"name": "Artem Nalesnikovskyi", "team": None},
+    "iugaidiana": {"name": "Diana Iugai", "team": None},
+    "vOrigins": {"name": "Vladyslav Novikov", "team": "FE"},
+    "tanabebr": {"name": "Felipe Tanabe", "team": None},
+    "zloiadil": {"name": "Adil Bektursunov", "team": None},
+    "nilesh25890": {"name": "Nilesh Ashokrao Shinde", "team": None},
+    "oommenmathewpanicker": {"name": "Oommen Mathew Panicker", "team": None},
+    "nagarajrarchak": {"name": "Nagaraj Raghavendra Archak", "team": None},
+    "sujithn-nc": {"name": "Sujith N", "team": "BE"},
+    "TODO": {"name": "TODO", "team": None},
+    "divy-netcracker": {"name": "Divy Tripathy", "team": None},
+}
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def fetch_users(logins):
+    """
+    Fetch display names of all given logins with one aliased GraphQL query.
+    Logins GitHub cannot resolve come back with name None; other errors raise.
+    """
+    logins = list(logins)
+    if not logins:
+        return {}
+    params = ", ".join(f"$l{i}: String!" for i in range(len(logins)))
+    fields = "\n".join(f"  u{i}: user(login: $l{i}) {{ login name }}" for i in range(len(logins)))
+    query = f"query({params}) {{\n{fields}\n}}"
+    variables = {f"l{i}": login for i, login in enumerate(logins)}
+    response = post_graphql(query, variables)
+    if response.status_code != 200:
+        raise Exception(f"Query failed: {response.text}")
+    payload = response.json()
+    errors = [e for e in payload.get("errors") or [] if e.get("type") != "NOT_FOUND"]
+    if errors:
+        msgs = "; ".join(err.get("message", str(err)) for err in errors)
+        raise Exception(f"GraphQL errors: {msgs}")
+    data = payload.get("data") or {}
+    return {login: (data.get(f"u{i}") or {}).get("name") or None for i, login in enumerate(logins)}
+
+
+def resolve_users(logins, cache_path=USER_CACHE_FILE, ttl=USER_CACHE_TTL_SECONDS, log=None,
+                  retry=USER_LOOKUP_RETRY_SECONDS):
+    """
+    Resolve logins to {"name": ..., "team": ...}.
+    Overrides win, then the on-disk cache (entries younger than ttl); whatever is left is
+    fetched in a single request. Logins GitHub does not know are cached like any other.
+    A failed lookup is logged and the logins are shown raw - it never fails the report;
+    the failure is cached as well and the logins are not looked up again for retry seconds.
+    """
+    now = time.time()
+    cache = _load_cache(cache_path)
+    wanted = sorted({login for login in logins if login not in NOT_A_USER and not login.endswith("[bot]")})
+    missing = [
+        login for login in wanted
+        if login not in ASSIGNEE_OVERRIDES
+        and now - cache.get(login, {}).get("fetched_at", 0) > ttl
+        and now >= cache.get(login, {}).get("retry_after", 0)
+    ]
+    if missing:
+        try:
+            fetched = fetch_users(missing)
+            for login, name in fetched.items():
+                cache[login] = {"name": name, "fetched_at": now}
+            if log:
+                log(f"Resolved {len(fetched)} GitHub user(s) in one request")
+        except Exception as e:
+            print(f"[Warning] GitHub user lookup failed, showing raw logins: {e}")
+            # A stale name is still better than none; keep it and only postpone the next attempt
+            for login in missing:
+                cache[login] = dict(cache.get(login) or {"name": None}, retry_after=now + retry)
+        _save_cache(cache_path, cache)
+
+    users = {}
+    for login in set(logins):
+        override = ASSIGNEE_OVERRIDES.get(login, {})
+        name = override.get("name") or (cache.get(login) or {}).get("name")
+        users[login] = {"name": name, "team": override.get("team")}
+    return users
+
+
+def determine_team(issue_name, assignee_login, users):
+    if "[FE]" in issue_name:
+        return "FE"
+    if "[BE]" in issue_name:
+        return "BE"
+    info = users.get(assignee_login)
+    if info and info.get("team"):
+        return info["team"]
+    return "Not Defined"
+
+
+def display_name(users, login):
+    name = (users.get(login) or {}).get("name")
+    return f"{name} ({login})" if name and login not in NOT_A_USER else login
@@ -0,0 +1,229 @@
+import datetime
+import glob
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from github_api import log
+from pr_report import to_pr_details
+from project_items import fetch_project_item
+from report_pipeline import ReportRun
+
+WEBHOOK_SECRET_ENV = "GITHUB_WEBHOOK_SECRET"
+RECONCILE_INTERVAL = 3600
+
+
+def verify_signature(secret, body, signature):
+    """
+    Check the X-Hub-Signature-256 header: "sha256=" + HMAC-SHA256 of the raw body.
+    """
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def apply_projects_v2_item(store, payload, org_topics):
+    item = payload["projects_v2_item"]
+    project_url = store.project_url(item.get("project_node_id"))
+    if not project_url:
+        return "ignored: project is not tracked"
+    if payload.get("action") in ("deleted", "archived"):
+        store.delete_item(item["node_id"])
+        return f"removed item {item['node_id']}"
+    if item.get("content_type") != "Issue":
+        return f"ignored: {item.get('content_type')} item"
+    # The payload only names the changed field, so the item is re-read in full
+    normalized = fetch_project_item(item["node_id"], store.schema(project_url))
+    if not normalized:
+        store.delete_item(item["node_id"])
+        return f"removed item {item['node_id']}"
+    store.upsert_item(project_url, normalized)
+    return f"updated item {item['node_id']}"
+
+
+def apply_issues(store, payload, org_topics):
+    issue = payload["issue"]
+    if payload.get("action") in ("deleted", "transferred"):
+        removed = store.delete_content(issue["node_id"])
+        return f"removed {removed} item(s) of {issue['html_url']}"
+    rows = store.items_by_content(issue["node_id"])
+    for project_url, row in rows:
+        row.update({
+            "title": issue["title"],
+            "url": issue["html_url"],
+            "assignees": [a["login"] for a in issue.get("assignees") or []],
+            "labels": [label["name"] for label in issue.get("labels") or []],
+            "milestone": (issue.get("milestone") or {}).get("title", ""),
+        })
+        if issue.get("type"):
+            row["type"] = issue["type"].get("name")
+        store.upsert_item(project_url, row)
+    return f"updated {len(rows)} item(s) of {issue['html_url']}"
+
+
+def apply_sub_issues(store, payload, org_topics):
+    parent = payload["parent_issue"]
+    sub_issue = payload["sub_issue"]
+    added = payload.get("action") in ("sub_issue_added", "parent_issue_added")
+    rows = store.items_by_content(sub_issue["node_id"])
+    for project_url, row in rows:
+        row["parent_name"] = parent["title"] if added else ""
+        row["parent_url"] = parent["html_url"] if added else ""
+        store.upsert_item(project_url, row)
+    return f"updated parent of {len(rows)} item(s) of {sub_issue['html_url']}"
+
+
+def apply_pull_request(store, payload, org_topics):
+    pr = payload["pull_request"]
+    repository = payload["repository"]
+    repo = repository["full_name"]
+    if not store.tracks_repository(repo):
+        matches = [(org, topic) for org, topic in org_topics
+                   if repository["owner"]["login"] == org and topic in (repository.get("topics") or [])]
+        if not matches:
+            return f"ignored: repository {repo} is not tracked"
+        for org, topic in matches:
+            store.add_repository(org, topic, repo)
+    if payload.get("action") == "closed" or pr.get("state") == "closed":
+        store.delete_pr(repo, pr["number"])
+        return f"removed PR {pr['html_url']}"
+    store.upsert_pr(to_pr_details(repo, pr))
+    return f"updated PR {pr['html_url']}"
+
+
+EVENT_HANDLERS = {
+    "projects_v2_item": apply_projects_v2_item,
+    "issues": apply_issues,
+    "sub_issues": apply_sub_issues,
+    "pull_request": apply_pull_request,
+}
+
+
+def apply_event(store, event, payload, org_topics):
+    if event == "ping":
+        return "pong"
+    handler = EVENT_HANDLERS.get(event)
+    if not handler:
+        return f"ignored: {event} event"
+    return handler(store, payload, org_topics)
+
+
+def reconcile(store, project_urls, org_topics):
+    """
+    Full sweep: rescan every project and org/topic pair and replace their rows in the store,
+    fixing whatever drift missed or out-of-order deliveries left behind.
+    """
+    started_at = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    run = ReportRun(project_urls, org_topics)
+    run.for_each(run.project_urls,
+                 lambda url: store.reconcile_project(url, run.schema(url), run.items(url), started_at))
+    run.for_each(run.org_topics, lambda org_topic: store.reconcile_prs(*org_topic, run.prs(*org_topic)))
+    print(f"Store reconciled: {len(run.project_urls)} project(s), {len(run.org_topics)} org/topic pair(s)")
+
+
+def reconcile_periodically(store, project_urls, org_topics, interval, stop):
+    while not stop.wait(interval):
+        try:
+            reconcile(store, project_urls, org_topics)
+        except Exception as e:
+            print(f"❌ Reconciliation failed: {e}")
+
+
+def record_delivery(record_dir, delivery, event, payload):
+    os.makedirs(record_dir, exist_ok=True)
+    path = os.path.join(record_dir, f"{int(time.time() * 1000)}-{delivery or 'delivery'}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"event": event, "payload": payload}, f, ensure_ascii=False)
+
+
+def replay_deliveries(store, paths, org_topics):
+    """
+    Apply recorded deliveries ({"event": ..., "payload": ...} files) in file name order.
+    """
+    files = sorted(f for p in paths for f in (glob.glob(os.path.join(p, "*.json")) if os.path.isdir(p) else [p]))
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            delivery = json.load(f)
+        print(f"{os.path.basename(path)}: {apply_event(store, delivery['event'], delivery['payload'], org_topics)}")
+    print(f"Replayed {len(files)} deliveries")
+
+
+def make_handler(store, secret, org_topics, record_dir=None):
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def send_json(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path != "/healthz":
+                self.send_json(404, {"error": "not found"})
+                return
+            self.send_json(200, {"status": "ok"})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if not verify_signature(secret, body, self.headers.get("X-Hub-Signature-256")):
+                self.send_json(401, {"error": "bad signature"})
+                return
+            event = self.headers.get("X-GitHub-Event", "")
+            delivery = self.headers.get("X-GitHub-Delivery", "")
+            try:
+                payload = json.loads(body)
+                if record_dir:
+                    record_delivery(record_dir, delivery, event, payload)
+                result = apply_event(store, event, payload, org_topics)
+            except Exception as e:
+                print(f"❌ Delivery {delivery} ({event}) failed: {e}")
+                self.send_json(500, {"error": str(e)})
+                return
+            log(f"Delivery {delivery} ({event}): {result}")
+            self.send_json(202, {"result": result})
+
+        def log_message(self, format, *args):
+            log(format % args)
+
+    return WebhookHandler
+
+
+def run_webhook_receiver(store, options, project_urls, org_topics):
+    secret = os.environ.get(WEBHOOK_SECRET_ENV)
+    if not secret and not options.replay:
+        raise Exception(f"{WEBHOOK_SECRET_ENV} is required to verify webhook signatures")
+
+    if options.replay:
+        # Replayed deliveries only patch rows, so every source needs one full scan first
+        if any(store.schema(url) is None for url in project_urls) or \
+                any(not store.has_prs(org, topic) for org, topic in org_topics):
+            reconcile(store, project_urls, org_topics)
+        replay_deliveries(store, options.replay, org_topics)
+        return
+
+    # Always a full sweep on start: deliveries missed while the receiver was down are lost
+    reconcile(store, project_urls, org_topics)
+
+    stop = threading.Event()
+    sweeper = threading.Thread(
+        target=reconcile_periodically,
+        args=(store, project_urls, org_topics, options.reconcile_interval, stop),
+        daemon=True,
+    )
+    sweeper.start()
+
+    server = ThreadingHTTPServer((options.host, options.port), make_handler(store, secret, org_topics, options.record))
+    print(f"Listening for GitHub webhooks on {options.host}:{options.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()